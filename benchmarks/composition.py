@@ -0,0 +1,62 @@
+"""
+Measure how long composing a frame takes as the component tree grows, when a
+single label changed since the previous frame compared to when every
+component did. Rows of ten inline labels are stacked in a division.
+
+    PYTHONPATH=src python benchmarks/composition.py
+"""
+
+from time import perf_counter
+
+from tui.compositor import Compositor
+from tui.components.division import Division
+from tui.components.label import Label
+
+SIZES = (10, 100, 1000)  # labels in the tree
+COLUMNS = 10  # labels in a row
+FRAMES = 200
+
+
+def build_tree(labels: int) -> tuple[Division, list[Label]]:
+    """Build a division holding the given amount of labels"""
+    rows = labels // COLUMNS
+    root = Division(style=f"rows={rows}, columns={COLUMNS * 8}")
+    leaves = []
+    for _ in range(rows):
+        row = Division(style=f"rows=1, columns={COLUMNS * 8}, display=inline")
+        root.append_child(row)
+        for column in range(COLUMNS):
+            leaves.append(Label(str(column), style="rows=1, columns=8"))
+            row.append_child(leaves[-1])
+
+    return root, leaves
+
+
+def compose_time(root: Division, changed: list[Label]) -> float:
+    """Get the mean time in seconds it takes to compose root after the
+    changed labels were marked dirty"""
+    Compositor.compose(root, [], [])
+    total = 0.0
+    for _ in range(FRAMES):
+        for label in changed:
+            label.mark_dirty()
+
+        start = perf_counter()
+        Compositor.compose(root, [], [])
+        total += perf_counter() - start
+
+    return total / FRAMES
+
+
+def main() -> None:
+    """Print the cost of a frame for each tree size"""
+    print(f"{'labels':>8} {'one dirty ms':>14} {'all dirty ms':>14}")
+    for size in SIZES:
+        root, leaves = build_tree(size)
+        one = compose_time(root, [leaves[len(leaves) // 2]])
+        every = compose_time(root, leaves)
+        print(f"{size:>8} {one * 1000:14.3f} {every * 1000:14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Measure the memory a frame allocates when a tree of 500 labels is composed,
+once when a single label changed since the previous frame and once when
+every label did. Allocations are traced with tracemalloc, so the timings it
+prints are slower than without it.
+
+The areas of the tree are also copied the way the compositor copies them
+(copy-on-write snapshots) and with copy.deepcopy, the way it copied them
+before snapshots, to compare the two on their own. The frames of an earlier
+compositor are measured by running this script with PYTHONPATH pointing at
+the src directory of a checkout of that version.
+
+    PYTHONPATH=src python benchmarks/composition_allocations.py
+"""
+
+import copy
+import tracemalloc
+from time import perf_counter
+from typing import Callable
+
+from tui.area import Area
+from tui.component import Component
+from tui.compositor import Compositor
+from tui.components.division import Division
+from tui.components.label import Label
+
+LABELS = 500
+COLUMNS = 10  # labels in a row
+FRAMES = 50
+
+
+def build_tree() -> tuple[Division, list[Label]]:
+    """Build a division holding rows of inline labels"""
+    rows = LABELS // COLUMNS
+    root = Division(style=f"rows={rows}, columns={COLUMNS * 8}")
+    leaves = []
+    for _ in range(rows):
+        row = Division(style=f"rows=1, columns={COLUMNS * 8}, display=inline")
+        root.append_child(row)
+        for column in range(COLUMNS):
+            leaves.append(Label(str(column), style="rows=1, columns=8"))
+            row.append_child(leaves[-1])
+
+    return root, leaves
+
+
+def allocations(root: Division, changed: list[Label]) -> tuple[
+        float, float, float]:
+    """Compose frames after marking the changed labels dirty. Return how
+    many KiB a frame allocates at its peak and retains (the frame and the
+    cached areas of the components) on average, and its mean time in ms."""
+    Compositor.compose(root, [], [])
+    peak = retained = duration = 0.0
+    for _ in range(FRAMES):
+        for label in changed:
+            label.mark_dirty()
+
+        tracemalloc.start()
+        start = perf_counter()
+        # keep the frame, so it's counted as retained
+        frame = Compositor.compose(root, [], [])
+        duration += perf_counter() - start
+        current, frame_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del frame
+
+        peak += frame_peak
+        retained += current
+
+    return (peak / FRAMES / 1024, retained / FRAMES / 1024,
+            duration / FRAMES * 1000)
+
+
+def tree_areas(root: Component) -> list[Area]:
+    """Get the areas of a component and its descendants"""
+    areas = [root.area]
+    for child in root.children:
+        areas.extend(tree_areas(child))
+
+    return areas
+
+
+def copy_allocations(areas: list[Area],
+                     copy_area: Callable[[Area], Area]) -> tuple[
+        float, float]:
+    """Copy every area once per frame. Return how many KiB the copies of a
+    frame allocate at their peak on average, and their mean time in ms."""
+    peak = duration = 0.0
+    for _ in range(FRAMES):
+        tracemalloc.start()
+        start = perf_counter()
+        copies = [copy_area(area) for area in areas]
+        duration += perf_counter() - start
+        peak += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del copies
+
+    return peak / FRAMES / 1024, duration / FRAMES * 1000
+
+
+def main() -> None:
+    """Print the allocations of a frame and of copying the tree's areas"""
+    root, leaves = build_tree()
+    print(f"components: {len(leaves) + len(root.children) + 1}")
+    print(f"{'dirty':8} {'peak KiB':>10} {'retained KiB':>14} {'ms':>8}")
+    for name, changed in (("one", [leaves[len(leaves) // 2]]),
+                          ("all", leaves)):
+        peak, retained, duration = allocations(root, changed)
+        print(f"{name:8} {peak:10.1f} {retained:14.1f} {duration:8.2f}")
+
+    # versions from before snapshots only have their frames measured
+    if not hasattr(Area, "snapshot"):
+        return
+
+    areas = tree_areas(root)
+    print()
+    print(f"{'copy':8} {'peak KiB':>10} {'ms':>8}")
+    for name, copy_area in (("deepcopy", copy.deepcopy),
+                            ("snapshot", Area.snapshot)):
+        peak, duration = copy_allocations(areas, copy_area)
+        print(f"{name:8} {peak:10.1f} {duration:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measure how many frames App.run composes and prints per second, end to end,
+using the headless terminal backend. No tty is needed. Every frame changes a
+counter, the colour of a label and scrolls a block of labels by a row, so
+the diff, the SGR (colour) output and the writes all have work to do.
+
+    PYTHONPATH=src python benchmarks/headless_frames.py
+"""
+
+from collections import deque
+import threading
+
+from tui.app import App
+from tui.components.label import Label
+from tui.headless_terminal import HeadlessTerminal
+
+ROWS = 40
+COLUMNS = 120
+SECONDS = 3
+# the labels which scroll by a row every frame
+SCROLLED = range(10, 30)
+COLOURS = ("red", "green", "yellow", "blue")
+
+
+def main() -> None:
+    """Run an app with a screen full of changing labels and print frame
+    statistics"""
+    terminal = HeadlessTerminal(rows=ROWS, columns=COLUMNS,
+                                keep_output=False)
+    # render as fast as possible
+    app = App(terminal=terminal, fps=1_000_000)
+    labels = []
+    for row in range(ROWS):
+        labels.append(Label(style=f"rows=1, columns={COLUMNS}",
+                            label_text=f"label {row}"))
+        app.root.append_child(labels[-1])
+
+    lines = deque((f"scrolled line {line:6}" for line in SCROLLED),
+                  maxlen=len(SCROLLED))
+    frame = 0
+
+    def change() -> None:
+        """Change the screen before the next frame"""
+        nonlocal frame
+        frame += 1
+        labels[0].text = f"frame {frame:8}"
+        labels[2].set_style("text_colour", COLOURS[frame % len(COLOURS)])
+        # a new line enters the block at the bottom, the others move up
+        lines.append(f"scrolled line {frame + len(SCROLLED):6}")
+        for row, line in zip(SCROLLED, lines):
+            labels[row].text = line
+
+    # runs once every loop iteration, before the frame is rendered
+    app.set_interval(change, 1e-6)
+    threading.Timer(SECONDS, app.stop).start()
+    app.run()
+
+    stats = terminal.stats
+    print(f"frames:          {stats.written}")
+    print(f"frames / second: {stats.written / SECONDS:10.1f}")
+    print(f"bytes / frame:   {stats.bytes_written / stats.written:10.1f}")
+
+    # where the time of a frame goes
+    profile = app.stats()
+    print(f"{'phase':16} {'p50 ms':>8} {'p99 ms':>8}")
+    for phase, timings in [*profile.phases.items(),
+                           ("total", profile.total)]:
+        print(f"{phase:16} {timings.p50 * 1000:8.3f} "
+              f"{timings.p99 * 1000:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
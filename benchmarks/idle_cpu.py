@@ -0,0 +1,92 @@
+"""
+Measure how much CPU an idle app uses, how often its main loop wakes up while
+idle and how quickly it wakes up when an event arrives, using the headless
+terminal backend. An app which renders every frame is compared to one which
+renders on demand, which sleeps until something changes.
+
+    PYTHONPATH=src python benchmarks/idle_cpu.py
+"""
+
+import threading
+from time import perf_counter, process_time, sleep
+
+from tui.app import App
+from tui.events.event_broker import EventBroker
+from tui.events.key_event import HotkeyEvent
+from tui.headless_terminal import HeadlessTerminal
+
+SECONDS = 3
+EVENTS = 100
+
+
+def measure(render_on_demand: bool) -> tuple[float, float, float, float]:
+    """Run an idle app, then send it events. Return its idle CPU usage, its
+    wakeups per second while idle and the median and maximum time it took
+    to take an event from the queue."""
+    app = App(terminal=HeadlessTerminal(rows=24, columns=80), fps=60,
+              render_on_demand=render_on_demand)
+
+    # note when each event is taken from the queue
+    sent: dict[int, float] = {}
+    latencies: list[float] = []
+    handle = EventBroker.handle
+
+    def timed_handle(event, **hooks) -> None:
+        latencies.append(perf_counter() - sent[id(event)])
+        handle(event=event, **hooks)
+
+    EventBroker.handle = timed_handle
+
+    # the loop handles the queued events once per wakeup
+    wake_ups = 0
+    handle_queued_events = app._handle_queued_events
+
+    def counting_handle_queued_events() -> None:
+        nonlocal wake_ups
+        wake_ups += 1
+        handle_queued_events()
+
+    app._handle_queued_events = counting_handle_queued_events
+
+    idle = []
+
+    def drive() -> None:
+        """Measure the idle app, then send events one by one"""
+        # let the first frame be rendered
+        sleep(0.1)
+        first_wake_ups = wake_ups
+        cpu_start, wall_start = process_time(), perf_counter()
+        sleep(SECONDS)
+        wall = perf_counter() - wall_start
+        idle.append(((process_time() - cpu_start) / wall,
+                     (wake_ups - first_wake_ups) / wall))
+
+        for _ in range(EVENTS):
+            event = HotkeyEvent("a")
+            sent[id(event)] = perf_counter()
+            app.event_queue.put(event)
+            sleep(0.01)
+
+        app.stop()
+
+    threading.Thread(target=drive, daemon=True).start()
+    app.run()
+    EventBroker.handle = handle
+
+    latencies.sort()
+    return (idle[0][0], idle[0][1], latencies[len(latencies) // 2],
+            latencies[-1])
+
+
+def main() -> None:
+    """Print the measurements of both kinds of apps"""
+    print(f"{'render':10} {'idle CPU %':>11} {'wakeups/s':>10} "
+          f"{'median us':>10} {'max us':>8}")
+    for name, render_on_demand in (("always", False), ("on demand", True)):
+        cpu, wake_ups, median, maximum = measure(render_on_demand)
+        print(f"{name:10} {cpu * 100:11.1f} {wake_ups:10.1f} "
+              f"{median * 1e6:10.0f} {maximum * 1e6:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
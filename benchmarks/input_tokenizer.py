@@ -0,0 +1,42 @@
+"""
+Measure how many MB/s of input the input tokenizer turns into events, for
+typed text, mouse reports and a mix of keys, mouse reports and escape
+sequences. The input is fed in chunks of the size App reads.
+
+    PYTHONPATH=src python benchmarks/input_tokenizer.py
+"""
+
+from time import perf_counter
+
+from tui.app import INPUT_CHUNK_SIZE
+from tui.events._input_tokenizer import InputTokenizer
+
+SIZE = 2_000_000  # bytes of input per stream
+
+STREAMS = {
+    "text": "the quick brown fox jumps over the lazy dög\r",
+    "mouse": "".join(f"\x1b[<35;{column};{column % 40 + 1}M"
+                     for column in range(1, 200)),
+    "mixed": "ab\x1b[A\x1b[<0;12;5M\x1b[1;5Cx\x1bOP\x7f\x1b[<35;3;4M",
+}
+
+
+def main() -> None:
+    """Tokenize each stream and print its throughput"""
+    for name, pattern in STREAMS.items():
+        data = pattern.encode() * (SIZE // len(pattern.encode()))
+        tokenizer = InputTokenizer()
+        events = 0
+
+        start = perf_counter()
+        for chunk in range(0, len(data), INPUT_CHUNK_SIZE):
+            events += len(tokenizer.feed(data[chunk:chunk
+                                              + INPUT_CHUNK_SIZE]))
+        elapsed = perf_counter() - start
+
+        print(f"{name:6} {len(data) / elapsed / 1e6:7.2f} MB/s "
+              f"{events / elapsed / 1e3:8.1f} k events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Measure the memory and CPU time each session costs when one process serves an
+app to 100 terminals. Every session gets a local pty, a clock which changes
+every second and an input which is typed into twice a second. The
+operators' side of the ptys is drained, as terminal emulators would.
+
+    PYTHONPATH=src python benchmarks/sessions.py
+"""
+
+import asyncio
+import os
+import pty
+import struct
+import termios
+from fcntl import ioctl
+from time import perf_counter, process_time, strftime
+
+from tui.app import App
+from tui.components.input import Input
+from tui.components.label import Label
+from tui.session_manager import SessionManager
+from tui.terminal import BaseTerminal, Terminal
+
+SESSIONS = 100
+ROWS = 24
+COLUMNS = 80
+SECONDS = 5
+KEYS_PER_SECOND = 2
+
+
+def resident_memory() -> int:
+    """Get the resident memory of the process in bytes"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def create_app(terminal: BaseTerminal) -> App:
+    """Build a monitoring pane with a clock and a focused input"""
+    app = App(terminal=terminal, fps=30, render_on_demand=True)
+    clock = Label(style="rows=1, columns=20", label_text=strftime("%X"))
+    app.root.append_child(clock)
+    for row in range(ROWS - 3):
+        app.root.append_child(Label(style=f"rows=1, columns={COLUMNS}",
+                                    label_text=f"metric {row}"))
+
+    text_input = Input(style=f"rows=1, columns={COLUMNS}")
+    app.root.append_child(text_input)
+    text_input._focus = True
+
+    def tick() -> None:
+        clock.text = strftime("%X")
+
+    app.set_interval(tick, 1)
+    return app
+
+
+def open_pty() -> tuple[int, int]:
+    """Open a pty of the benchmark's size, return its master and slave"""
+    master, slave = pty.openpty()
+    ioctl(slave, termios.TIOCSWINSZ,
+          struct.pack("HHHH", ROWS, COLUMNS, 0, 0))
+    return master, slave
+
+
+async def main() -> None:
+    """Serve the sessions for a while and print what they cost"""
+    loop = asyncio.get_running_loop()
+    manager = SessionManager(create_app)
+
+    memory = resident_memory()
+    masters = []
+    terminals = []
+    for _ in range(SESSIONS):
+        master, slave = open_pty()
+        masters.append(master)
+        terminals.append(Terminal(input_stream=slave, output_stream=slave,
+                                  repeat_chars=False))
+        manager.add(terminals[-1])
+        # discard the frames, as a terminal emulator would display them
+        loop.add_reader(master, os.read, master, 65536)
+    session_memory = (resident_memory() - memory) / SESSIONS
+
+    async def type_keys() -> None:
+        """Type into every session"""
+        while True:
+            for master in masters:
+                os.write(master, b"x" if perf_counter() % 2 < 1 else b"\x7f")
+            await asyncio.sleep(1 / KEYS_PER_SECOND)
+
+    serve = asyncio.create_task(manager.serve())
+    typing = asyncio.create_task(type_keys())
+    # let the first frames settle
+    await asyncio.sleep(1)
+
+    frames = sum(terminal.stats.written for terminal in terminals)
+    cpu = process_time()
+    start = perf_counter()
+    await asyncio.sleep(SECONDS)
+    cpu = (process_time() - cpu) / (perf_counter() - start)
+    frames = sum(terminal.stats.written for terminal in terminals) - frames
+
+    typing.cancel()
+    manager.stop()
+    await serve
+    for master in masters:
+        loop.remove_reader(master)
+        os.close(master)
+
+    print(f"sessions:              {SESSIONS}")
+    print(f"memory / session:      {session_memory / 1024:10.1f} KiB")
+    print(f"cpu / session:         {cpu / SESSIONS * 100:10.3f} %")
+    print(f"cpu, all sessions:     {cpu * 100:10.1f} %")
+    print(f"frames / second:       {frames / SECONDS:10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Measure how long it takes to set a terminal up for the app and to restore it,
+comparing the termios backend to spawning stty processes (the previous
+approach). A pseudo terminal is used, so the benchmark can run anywhere.
+
+    PYTHONPATH=src python benchmarks/startup.py
+"""
+
+from fcntl import ioctl
+import os
+import pty
+import struct
+import subprocess
+import termios
+import threading
+from time import perf_counter
+
+from tui.terminal import Terminal
+
+RUNS = 50
+
+
+def drain(master_fd: int) -> None:
+    """Discard everything written to the pseudo terminal"""
+    try:
+        while os.read(master_fd, 4096):
+            pass
+    except OSError:
+        pass
+
+
+def stty_startup(slave) -> None:
+    """Enable and disable input the way it was done with os.system - a shell
+    and an stty process for every setting"""
+    for command in ("stty -icanon", "stty -echo", "stty echo", "stty sane"):
+        subprocess.run(command, shell=True, stdin=slave, check=True)
+
+
+def termios_startup(slave) -> None:
+    """Enable and disable input with the termios backend"""
+    terminal = Terminal(input_stream=slave, output_stream=slave)
+    terminal.restore()
+
+
+def measure(startup, slave) -> float:
+    """Return the average time of a startup and shutdown in milliseconds"""
+    start = perf_counter()
+    for _ in range(RUNS):
+        startup(slave)
+
+    return (perf_counter() - start) / RUNS * 1000
+
+
+def main() -> None:
+    """Print the startup time of both approaches"""
+    master_fd, slave_fd = pty.openpty()
+    ioctl(slave_fd, termios.TIOCSWINSZ, struct.pack("HHHH", 24, 80, 0, 0))
+    threading.Thread(target=drain, args=(master_fd,), daemon=True).start()
+
+    with open(slave_fd, "r+b", buffering=0) as slave:
+        stty = measure(stty_startup, slave)
+        backend = measure(termios_startup, slave)
+
+    print(f"stty processes: {stty:8.3f} ms")
+    print(f"termios:        {backend:8.3f} ms")
+    print(f"speedup:        {stty / backend:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
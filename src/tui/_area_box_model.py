@@ -46,6 +46,18 @@ class BoxModel:
     # TODO: methods for updating margin and padding
     def __init__(self, info: AreaInfo) -> None:
         self.info = info
+        self._build()
+
+    def resize(self, rows: int, columns: int) -> None:
+        """Update the box model when the area is resized. A border isn't
+        kept and has to be set again."""
+        self.info.rows = rows
+        self.info.columns = columns
+        self._build()
+
+    def _build(self) -> None:
+        """Define the rectangles of the box model, without a border"""
+        info = self.info
 
         # Entire area
         self.area_rect: Rectangle = Rectangle(
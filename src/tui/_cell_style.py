@@ -0,0 +1,94 @@
+"""
+A cell style describes how a single cell of an area is drawn - its foreground
+and background colours. Cell styles are kept next to the chars of an area and
+the terminal renders them as SGR (Select Graphic Rendition) sequences, emitting
+only what changes between consecutive cells.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+import re
+
+import colorama as Colour
+
+# capture the parameters of an SGR sequence
+SGR_PARAMETERS = re.compile(r"\x1b\[([\d;]*)m")
+
+
+@dataclass(frozen=True)
+class CellStyle:
+    """Structure containing the SGR parameters of a cell's colours. An empty
+    string stands for the terminal's default colour. Instances should be
+    created with CellStyle.get, so equal styles are the same object and can
+    be compared by identity."""
+    foreground: str = ""
+    background: str = ""
+
+    @staticmethod
+    def get(foreground: str = "", background: str = "") -> CellStyle:
+        """Get the cell style with the given SGR parameters"""
+        # the cache is keyed by how arguments are passed, so they're always
+        # passed positionally
+        return _intern(foreground, background)
+
+    @staticmethod
+    @cache
+    def from_colours(foreground: str, background: str) -> CellStyle:
+        """Get the cell style for colours defined in a style. Colours can be
+        colorama codes (Fore.RED, Back.BLUE), colour names (red) or SGR
+        parameters (31)"""
+        return CellStyle.get(
+                foreground=_sgr_parameter(foreground, Colour.Fore),
+                background=_sgr_parameter(background, Colour.Back)
+            )
+
+    @staticmethod
+    @cache
+    def transition(prev: CellStyle, new: CellStyle) -> bytes:
+        """Return the encoded SGR sequence which changes the terminal's
+        colours from one cell style to another. Only the colours which differ
+        are included."""
+        parameters = []
+        if new.foreground != prev.foreground:
+            parameters.append(new.foreground or "39")
+        if new.background != prev.background:
+            parameters.append(new.background or "49")
+
+        if not parameters:
+            return b""
+
+        return f"\x1b[{';'.join(parameters)}m".encode()
+
+
+@cache
+def _intern(foreground: str, background: str) -> CellStyle:
+    """Return the only instance of a cell style"""
+    return CellStyle(foreground=foreground, background=background)
+
+
+def _sgr_parameter(colour: str, colours: object) -> str:
+    """Convert a colour to its SGR parameter"""
+    if not colour:
+        return ""
+
+    sgr = SGR_PARAMETERS.fullmatch(colour)
+    if sgr is not None:
+        return sgr.group(1)
+
+    if colour.isdigit():
+        return colour
+
+    named_colour = getattr(colours, colour.upper(), None)
+    if named_colour is None:
+        raise ValueError(f"Unknown colour '{colour}'")
+
+    return SGR_PARAMETERS.fullmatch(named_colour).group(1)
+
+
+# the terminal's default colours
+DEFAULT_CELL_STYLE = CellStyle.get()
+
+# the style of the cell under the mouse cursor and of the input caret
+CURSOR_CELL_STYLE = CellStyle.get(foreground="30", background="47")
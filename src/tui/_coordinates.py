@@ -3,11 +3,13 @@ This file provides an abstraction for coordinate based structures.
 Coordinates - basic 2d coordinates (row and column)
 RestrictedCoordinates - Coordinates that can't go out of a rectangular bound
 Rectangle - A pair of Coordinates defining a rectangle
+Region - A union of Rectangles
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Iterator, Optional
 
 
 class CoordinateError(ValueError):
@@ -141,6 +143,55 @@ class Rectangle:
                 (coordinates.column >= self.top_left.column and
                  coordinates.column <= self.bottom_right.column))
 
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Rectangle)
+                and self.top_left == other.top_left
+                and self.bottom_right == other.bottom_right)
+
+    def __repr__(self) -> str:
+        return f"Rectangle({self.top_left}, {self.bottom_right})"
+
+    def touches(self, other: Rectangle) -> bool:
+        """Check if two rectangles overlap or are adjacent to each other."""
+        return (self.top_left.row <= other.bottom_right.row + 1
+                and other.top_left.row <= self.bottom_right.row + 1
+                and self.top_left.column <= other.bottom_right.column + 1
+                and other.top_left.column <= self.bottom_right.column + 1)
+
+    def union(self, other: Rectangle) -> Rectangle:
+        """Create the smallest rectangle containing both rectangles."""
+        return Rectangle(
+                top_left=Coordinates(
+                        _row=min(self.top_left.row, other.top_left.row),
+                        _column=min(self.top_left.column,
+                                    other.top_left.column)
+                    ),
+                bottom_right=Coordinates(
+                        _row=max(self.bottom_right.row,
+                                 other.bottom_right.row),
+                        _column=max(self.bottom_right.column,
+                                    other.bottom_right.column)
+                    )
+            )
+
+    def intersection(self, other: Rectangle) -> Optional[Rectangle]:
+        """Create the rectangle both rectangles contain, None if they don't
+        overlap."""
+        top_left = Coordinates(
+                _row=max(self.top_left.row, other.top_left.row),
+                _column=max(self.top_left.column, other.top_left.column)
+            )
+        bottom_right = Coordinates(
+                _row=min(self.bottom_right.row, other.bottom_right.row),
+                _column=min(self.bottom_right.column,
+                            other.bottom_right.column)
+            )
+        if (top_left.row > bottom_right.row
+                or top_left.column > bottom_right.column):
+            return None
+
+        return Rectangle(top_left=top_left, bottom_right=bottom_right)
+
     def inner_rect(
             self,
             top_offset: int,
@@ -249,3 +300,37 @@ class Rectangle:
 
         self._top_right.column = new_coords.column
         self._bottom_left.row = new_coords.row
+
+
+class Region:
+    """Structure containing a union of rectangles. Rectangles which touch are
+    merged into the rectangle that bounds them, so the region always consists
+    of separate rectangles. Used for tracking the parts of the screen which
+    have changed."""
+    def __init__(self) -> None:
+        self._rects: list[Rectangle] = []
+
+    def add(self, rect: Rectangle) -> None:
+        """Add a rectangle to the region"""
+        index = 0
+        while index < len(self._rects):
+            if self._rects[index].touches(rect):
+                # the bounding rectangle may touch rectangles which were
+                # checked already, so start over
+                rect = rect.union(self._rects.pop(index))
+                index = 0
+            else:
+                index += 1
+
+        self._rects.append(rect)
+
+    @property
+    def rects(self) -> list[Rectangle]:
+        """Get the rectangles the region consists of"""
+        return list(self._rects)
+
+    def __iter__(self) -> Iterator[Rectangle]:
+        return iter(self._rects)
+
+    def __len__(self) -> int:
+        return len(self._rects)
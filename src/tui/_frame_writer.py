@@ -0,0 +1,122 @@
+"""
+The frame writer prints frames to a terminal on a dedicated thread, so a slow
+or blocked terminal doesn't stall event handling and composition. Frames are
+handed over through a mailbox which holds only the latest frame - a frame
+which wasn't written before a newer one arrived is dropped and its damage is
+carried over to the newer frame.
+"""
+
+from __future__ import annotations
+
+import threading
+from time import perf_counter
+from typing import Optional
+
+from tui._coordinates import Rectangle
+from tui.area import Area
+from tui.latency import LatencyHistogram
+from tui.terminal import BaseTerminal, merge_damage
+
+
+class FrameWriter:
+    """Prints the latest submitted frame to a terminal on its own thread"""
+
+    def __init__(
+            self,
+            terminal: BaseTerminal,
+            # records how long after the input they show was read frames
+            # were written
+            input_latency: Optional[LatencyHistogram] = None
+    ) -> None:
+        self.terminal = terminal
+        self.input_latency = input_latency
+        self.written = 0  # frames printed to the terminal
+        self.dropped = 0  # frames replaced by a newer one before printing
+
+        # the mailbox - the area and damage of the latest frame and when the
+        # earliest input it shows was read
+        self._frame: Optional[tuple[
+                Area, Optional[list[Rectangle]], Optional[float]
+            ]] = None
+        self._condition = threading.Condition()
+        # held while the terminal diffs and prints a frame, so its diff state
+        # isn't changed from another thread meanwhile
+        self._print_lock = threading.Lock()
+        self._closed = False
+        # an exception raised while printing, reraised on the next submit
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Start the writer thread"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Print the frame left in the mailbox and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def update_size(self) -> None:
+        """Let the terminal read its size again, once the frame it's printing
+        (if any) is written"""
+        with self._print_lock:
+            self.terminal.update_size()
+
+    def submit(
+            self,
+            area: Area,
+            # the rectangles of the area which could have changed since the
+            # previously submitted frame. None means the entire area
+            damage: Optional[list[Rectangle]] = None,
+            # when the earliest input the frame shows was read (perf_counter)
+            read_at: Optional[float] = None
+    ) -> None:
+        """Put a frame in the mailbox without waiting for it to be printed.
+        The area shouldn't be mutated afterwards."""
+        with self._condition:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+            if self._frame is not None:
+                # the unprinted frame is replaced, but its changes aren't
+                # on the screen yet
+                damage = merge_damage(self._frame[1], damage)
+                if self._frame[2] is not None:
+                    read_at = self._frame[2]
+                self.dropped += 1
+
+            self._frame = (area, damage, read_at)
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """Print frames from the mailbox until the writer is stopped"""
+        while True:
+            with self._condition:
+                while self._frame is None and not self._closed:
+                    self._condition.wait()
+
+                if self._frame is None:
+                    return
+
+                area, damage, read_at = self._frame
+                self._frame = None
+
+            try:
+                # the writer can afford to block on the terminal, newer
+                # frames are coalesced in the mailbox meanwhile
+                with self._print_lock:
+                    self.terminal.print(area, damage, wait=True)
+            except Exception as error:
+                with self._condition:
+                    self._error = error
+                return
+
+            with self._condition:
+                self.written += 1
+                if read_at is not None and self.input_latency is not None:
+                    self.input_latency.record(perf_counter() - read_at)
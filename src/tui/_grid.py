@@ -0,0 +1,25 @@
+"""
+Grids are the row-major lists of cells (chars or cell styles) areas and the
+virtual screen are made of. The helpers here change them in place, so other
+references to the grid and its rows stay valid.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def resize_grid(
+        grid: list[list[Any]],
+        rows: int,
+        columns: int,
+        blank: Any  # the value of the cells which are added
+) -> None:
+    """Change the size of a grid in place. Cells which fit in both sizes are
+    kept, new cells are blank."""
+    del grid[rows:]
+    for row in grid:
+        del row[columns:]
+        row.extend([blank] * (columns - len(row)))
+
+    grid.extend([blank] * columns for _ in range(rows - len(grid)))
@@ -19,7 +19,10 @@ class NodeList(Sequence):
     component list"""
     # TODO: insert_after/before index can be added
 
-    def __init__(self) -> None:
+    def __init__(self, owner: Optional[Component] = None) -> None:
+        # the component the nodes are children of. It becomes their parent
+        # and is marked dirty when the list changes
+        self._owner = owner
         self._nodes_list: list[Component] = []  # preserve order
         # components with no id aren't in the dict
         self._nodes_dict: dict[str, Component] = {}  # fast search by index
@@ -39,6 +42,9 @@ class NodeList(Sequence):
         if new_component.id is not None:
             self._nodes_dict[new_component.id] = new_component
 
+        self._detach(prev_component)
+        self._attach(new_component)
+
     def __contains__(self, component: Component) -> bool:
         return component in self._nodes_list
 
@@ -59,6 +65,8 @@ class NodeList(Sequence):
         if component.id is not None:
             self._nodes_dict[component.id] = component
 
+        self._attach(component)
+
     def pop(self, index: int) -> Component:
         """Remove component (search by id)"""
         component = self._nodes_list.pop(index)
@@ -66,6 +74,7 @@ class NodeList(Sequence):
         if component.id is not None:
             self._nodes_dict.pop(component.id)
 
+        self._detach(component)
         return component
 
     def remove(self, component: Component) -> None:
@@ -73,3 +82,21 @@ class NodeList(Sequence):
         self._nodes_list.remove(component)
         if component.id is not None:
             self._nodes_dict.pop(component.id)
+
+        self._detach(component)
+
+    def _attach(self, component: Component) -> None:
+        """Make the owner the parent of a component added to the list"""
+        if self._owner is None:
+            return
+
+        component._parent = self._owner
+        self._owner.mark_dirty()
+
+    def _detach(self, component: Component) -> None:
+        """Orphan a component removed from the list"""
+        if self._owner is None:
+            return
+
+        component._parent = None
+        self._owner.mark_dirty()
@@ -0,0 +1,42 @@
+"""
+The session state is what the components of an app share - their event
+listeners and the counter their default ids are taken from. It's looked up
+through a context variable, so a process which serves many sessions gives
+each of them its own state by running it in its own context. Apps which
+aren't ran by a session manager share the default state.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tui.events.event_listener import EventListener
+
+
+class SessionState:
+    """The event listeners and component ids of a session"""
+
+    def __init__(self) -> None:
+        # the listeners of each event and each subscriber component
+        self.listeners: dict[Any, list[EventListener]] = {}
+        self.subscribers: dict[Any, list[EventListener]] = {}
+        # the id of the next component which isn't given one
+        self.id_counter = 0
+
+
+_state: ContextVar[SessionState] = ContextVar("session_state",
+                                              default=SessionState())
+
+
+def current_state() -> SessionState:
+    """Get the state of the session the caller runs in"""
+    return _state.get()
+
+
+def enter_new_state() -> SessionState:
+    """Give the current context a state of its own"""
+    state = SessionState()
+    _state.set(state)
+    return state
@@ -0,0 +1,82 @@
+"""
+Compiled terminfo entries (see term(5)) are read directly for the terminal
+types curses can't look up. curses is set up for a single terminal type per
+process, while the clients of a session manager may each report another one.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from os import environ, path
+import struct
+from typing import Optional
+
+# the index of repeat_char (rep) among the string capabilities
+REPEAT_CHAR = 121
+
+# magic number of an entry -> the size of its numbers (legacy and 32 bit)
+NUMBER_SIZES = {0o432: 2, 0o1036: 4}
+# magic, sizes of the names and the string table, counts of the booleans,
+# numbers and strings
+HEADER = struct.Struct("<6h")
+STRING_OFFSET = struct.Struct("<h")
+
+# where ncurses looks for entries after $TERMINFO, ~/.terminfo and
+# $TERMINFO_DIRS
+SYSTEM_DIRECTORIES = ("/etc/terminfo", "/lib/terminfo", "/usr/share/terminfo",
+                      "/usr/lib/terminfo", "/usr/share/lib/terminfo")
+
+
+def _directories() -> list[str]:
+    """Get the directories entries are searched in, in order"""
+    directories = []
+    if environ.get("TERMINFO"):
+        directories.append(environ["TERMINFO"])
+    directories.append(path.expanduser("~/.terminfo"))
+    # an empty directory in $TERMINFO_DIRS stands for the system ones
+    for directory in environ.get("TERMINFO_DIRS", "").split(":"):
+        if directory:
+            directories.append(directory)
+    directories.extend(SYSTEM_DIRECTORIES)
+    return directories
+
+
+def read_entry(term: str) -> Optional[bytes]:
+    """Read the compiled entry of a terminal type, None when there is none"""
+    if not term or "/" in term:
+        return None
+
+    for directory in _directories():
+        # entries are kept in a directory named after their first letter, or
+        # its hex code on file systems which ignore case
+        for letter in (term[0], f"{ord(term[0]):x}"):
+            try:
+                with open(path.join(directory, letter, term), "rb") as entry:
+                    return entry.read()
+            except OSError:
+                continue
+
+    return None
+
+
+@cache
+def has_string(term: str, index: int) -> bool:
+    """Does the entry of a terminal type have the string capability at
+    index? It's False when the terminal type has no entry."""
+    entry = read_entry(term)
+    if entry is None or len(entry) < HEADER.size:
+        return False
+
+    magic, names, booleans, numbers, strings, _ = HEADER.unpack_from(entry)
+    if magic not in NUMBER_SIZES or not 0 <= index < strings:
+        return False
+
+    offset = HEADER.size + names + booleans
+    # the numbers start at an even byte
+    offset += offset % 2
+    offset += numbers * NUMBER_SIZES[magic] + index * STRING_OFFSET.size
+    if len(entry) < offset + STRING_OFFSET.size:
+        return False
+
+    # a missing capability has a negative offset (-1 absent, -2 cancelled)
+    return STRING_OFFSET.unpack_from(entry, offset)[0] >= 0
@@ -0,0 +1,233 @@
+"""
+The virtual screen decodes the bytes a terminal backend writes into a grid of
+cells, the same way a terminal emulator would. Only the control sequences the
+terminal backends emit are understood - cursor movement, erasing the screen,
+scroll regions, scrolling, repeating chars and colours. Modes (CSI ? ... h/l)
+are ignored.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+
+from tui._cell_style import CellStyle, DEFAULT_CELL_STYLE
+from tui._grid import resize_grid
+
+# a control sequence (CSI) with its parameters and final byte, a control char
+# or a printable char. An escape which isn't followed by a complete sequence
+# is matched on its own, so it can be held back until more bytes arrive
+TOKEN = re.compile(
+        r"\x1b\[(\??)([\d;]*)([@-~])|\x1b|[\r\n\b]|[^\x1b\r\n\b]",
+        re.S
+    )
+
+
+class VirtualScreen:
+    """A grid of cells (chars and their styles) which changes according to
+    the bytes fed to it"""
+
+    def __init__(self, rows: int, columns: int) -> None:
+        self.rows = rows
+        self.columns = columns
+        self.cells: list[list[str]] = [[" "] * columns for _ in range(rows)]
+        self.styles: list[list[CellStyle]] = [
+                [DEFAULT_CELL_STYLE] * columns for _ in range(rows)
+            ]
+
+        # 0-based position of the cursor
+        self.cursor_row = 0
+        self.cursor_column = 0
+        # a char was written in the last column, the next one wraps
+        self._pending_wrap = False
+        # the rows scrolling is limited to (DECSTBM)
+        self._top = 0
+        self._bottom = rows - 1
+        # the colours chars are drawn with
+        self._style = DEFAULT_CELL_STYLE
+        # the last char which was written, for REP
+        self._last_char = " "
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        # the start of a control sequence which wasn't fed entirely
+        self._partial = ""
+
+    def feed(self, data: bytes) -> None:
+        """Apply the bytes a terminal received to the screen. Sequences may
+        be split between calls."""
+        text = self._partial + self._decoder.decode(data)
+        self._partial = ""
+
+        for token in TOKEN.finditer(text):
+            if token.group(0) == "\x1b":
+                # keep an incomplete sequence for the next feed
+                self._partial = text[token.start():]
+                return
+
+            if token.group(3) is not None:
+                if not token.group(1):
+                    self._control_sequence(token.group(3), token.group(2))
+            else:
+                self._char(token.group(0))
+
+    def resize(self, rows: int, columns: int) -> None:
+        """Change the size of the screen, keeping the cells which fit"""
+        resize_grid(self.cells, rows, columns, " ")
+        resize_grid(self.styles, rows, columns, DEFAULT_CELL_STYLE)
+
+        self.rows = rows
+        self.columns = columns
+        self._top = 0
+        self._bottom = rows - 1
+        self._move_to(self.cursor_row, self.cursor_column)
+
+    def _char(self, char: str) -> None:
+        """Write a char or execute a control char"""
+        if char == "\r":
+            self.cursor_column = 0
+            self._pending_wrap = False
+        elif char == "\n":
+            self._line_feed()
+        elif char == "\b":
+            self._move_to(self.cursor_row, self.cursor_column - 1)
+        else:
+            if self._pending_wrap:
+                self.cursor_column = 0
+                self._line_feed()
+
+            self._last_char = char
+            self.cells[self.cursor_row][self.cursor_column] = char
+            self.styles[self.cursor_row][self.cursor_column] = self._style
+            if self.cursor_column == self.columns - 1:
+                self._pending_wrap = True
+            else:
+                self.cursor_column += 1
+
+    def _line_feed(self) -> None:
+        """Move the cursor down, scrolling when it's on the bottom margin"""
+        self._pending_wrap = False
+        if self.cursor_row == self._bottom:
+            self._scroll(1)
+        elif self.cursor_row < self.rows - 1:
+            self.cursor_row += 1
+
+    def _control_sequence(self, final: str, parameters: str) -> None:
+        """Execute a control sequence"""
+        values = [int(value) if value else 0
+                  for value in parameters.split(";")] if parameters else []
+        # most sequences treat a missing or 0 parameter as 1
+        amount = max(values[0], 1) if values else 1
+
+        if final == "b":
+            # repeating chars writes them, the cursor may wrap
+            for _ in range(amount):
+                self._char(self._last_char)
+            return
+
+        self._pending_wrap = False
+        match final:
+            case "H" | "f":
+                row = values[0] if values else 1
+                column = values[1] if len(values) > 1 else 1
+                self._move_to(max(row, 1) - 1, max(column, 1) - 1)
+            case "A":
+                self._move_to(self.cursor_row - amount, self.cursor_column)
+            case "B":
+                self._move_to(self.cursor_row + amount, self.cursor_column)
+            case "C":
+                self._move_to(self.cursor_row, self.cursor_column + amount)
+            case "D":
+                self._move_to(self.cursor_row, self.cursor_column - amount)
+            case "J":
+                self._erase_display(values[0] if values else 0)
+            case "m":
+                self._select_graphic_rendition(values or [0])
+            case "r":
+                top = values[0] if values and values[0] else 1
+                bottom = (values[1] if len(values) > 1 and values[1]
+                          else self.rows)
+                if top < bottom <= self.rows:
+                    self._top = top - 1
+                    self._bottom = bottom - 1
+                    self._move_to(0, 0)
+            case "S":
+                self._scroll(amount)
+            case "T":
+                self._scroll(-amount)
+
+    def _move_to(self, row: int, column: int) -> None:
+        """Move the cursor, keeping it on the screen"""
+        self.cursor_row = min(max(row, 0), self.rows - 1)
+        self.cursor_column = min(max(column, 0), self.columns - 1)
+
+    def _blank_style(self) -> CellStyle:
+        """Return the style erased cells get - the current background"""
+        return CellStyle.get(background=self._style.background)
+
+    def _erase_display(self, mode: int) -> None:
+        """Erase from the cursor to the end of the screen (0), from the start
+        of the screen to the cursor (1) or the entire screen (2)"""
+        style = self._blank_style()
+        first = self.cursor_row * self.columns + self.cursor_column
+        start, end = {
+                0: (first, self.rows * self.columns),
+                1: (0, first + 1),
+            }.get(mode, (0, self.rows * self.columns))
+
+        for cell in range(start, end):
+            row, column = divmod(cell, self.columns)
+            self.cells[row][column] = " "
+            self.styles[row][column] = style
+
+    def _scroll(self, amount: int) -> None:
+        """Scroll the rows within the scroll region up (positive amount) or
+        down (negative amount)"""
+        style = self._blank_style()
+        size = self._bottom - self._top + 1
+        shift = min(abs(amount), size)
+        blank_cells = [[" "] * self.columns for _ in range(shift)]
+        blank_styles = [[style] * self.columns for _ in range(shift)]
+
+        for grid, blank in ((self.cells, blank_cells),
+                            (self.styles, blank_styles)):
+            region = grid[self._top:self._bottom + 1]
+            if amount > 0:
+                region = region[shift:] + blank
+            else:
+                region = blank + region[:size - shift]
+            grid[self._top:self._bottom + 1] = region
+
+    def _select_graphic_rendition(self, values: list[int]) -> None:
+        """Change the colours chars are drawn with"""
+        foreground = self._style.foreground
+        background = self._style.background
+
+        index = 0
+        while index < len(values):
+            value = values[index]
+            if value == 0:
+                foreground = background = ""
+            elif 30 <= value <= 37 or 90 <= value <= 97:
+                foreground = str(value)
+            elif 40 <= value <= 47 or 100 <= value <= 107:
+                background = str(value)
+            elif value == 39:
+                foreground = ""
+            elif value == 49:
+                background = ""
+            elif value in (38, 48):
+                # 256 colours (5;n) and true colours (2;r;g;b)
+                length = 3 if values[index + 1:index + 2] == [5] else 5
+                colour = ";".join(map(str, values[index:index + length]))
+                if value == 38:
+                    foreground = colour
+                else:
+                    background = colour
+                index += length - 1
+
+            index += 1
+
+        self._style = CellStyle.get(foreground, background)
+
+    def __str__(self) -> str:
+        return "\n".join("".join(row) for row in self.cells)
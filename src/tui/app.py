@@ -2,22 +2,51 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+from concurrent.futures import (CancelledError, Executor, Future,
+                                ProcessPoolExecutor, ThreadPoolExecutor)
+from functools import partial
+import inspect
+import os
+import select
+import signal
 import threading
 from time import perf_counter
-from typing import Optional
-from queue import Queue
-
-from tui._coordinates import Coordinates
+from typing import Any, Awaitable, Callable, Optional
+from queue import Empty, SimpleQueue
+
+from tui._cell_style import CURSOR_CELL_STYLE
+from tui._coordinates import Coordinates, Rectangle
+from tui._frame_writer import FrameWriter
+from tui.area import Area
+from tui.components.button import Button
 from tui.components.container import Container
 from tui.compositor import Compositor
+from tui.events._input_tokenizer import InputTokenizer
 from tui.events.event import Event
 from tui.events.event_broker import EventBroker
-from tui.events.mouse import MouseEventTypes
+from tui.events.mouse import MouseAction, MouseEventTypes
 from tui.events.mouse_event import MouseEvent
+from tui.executor import ExecutorStats, TaskDoneEvent, timed_call
+from tui.latency import LatencyHistogram
+from tui.profiler import (COMPOSE, CURSOR, DIFF, EVENTS, POST_COMPOSITION,
+                          PRE_COMPOSITION, QUEUE, TIMERS, WRITE, FrameProfiler,
+                          ProfileStats)
 from tui.styles.border import DefaultBorder
-from tui.terminal import Terminal
+from tui.terminal import BaseTerminal, Terminal
+from tui.timers import Timer, Timers
 from tui.components.division import Division
 
+# mouse actions which only report a new position. Consecutive ones are
+# coalesced, only the latest position is handled
+COALESCED_MOUSE_ACTIONS = (MouseAction.MOUSE_MOVE, MouseAction.MOUSE_DRAG)
+# how many bytes of input are read at once
+INPUT_CHUNK_SIZE = 4096
+# how long to wait for the rest of a sequence which starts with an escape
+# before taking the escape as a key press, in seconds
+ESCAPE_TIMEOUT = 0.05
+
 
 class App():
     """Contains everything necessary for running the application."""
@@ -27,10 +56,66 @@ class App():
             # static row and col amount (in case terminal fails)
             rows: Optional[int] = None,
             columns: Optional[int] = None,
+            # print frames on a dedicated thread, so a slow terminal doesn't
+            # stall event handling
+            writer_thread: bool = False,
+            # the terminal backend, the tty the app is ran in by default
+            terminal: Optional[BaseTerminal] = None,
+            # only compose frames when a component changed or an event was
+            # handled, instead of every 1 / fps seconds
+            render_on_demand: bool = False,
+            # compose a frame as soon as input which triggered callbacks is
+            # handled instead of on the next tick, but no sooner than this
+            # many seconds after the previous frame
+            input_frame_interval: Optional[float] = None,
+            # the executors run_in_executor submits to. A thread pool and a
+            # process pool are created when they're first needed by default
+            thread_executor: Optional[Executor] = None,
+            process_executor: Optional[Executor] = None
     ) -> None:
+        # the root follows the terminal's size in the dimensions which
+        # weren't given
+        self._fit_rows = rows is None
+        self._fit_columns = columns is None
+        # set by the SIGWINCH handler, the resize is handled in the main loop
+        self._resized = False
+        # the main loop runs until the app is stopped
+        self._running = False
+        self.render_on_demand = render_on_demand
+        # the terminal dropped the last frame, the next one has to be printed
+        # even if nothing changed
+        self._frame_dropped = False
+        self.input_frame_interval = input_frame_interval
+        # when the last frame was composed (perf_counter)
+        self._last_frame = 0.0
+        # how long after it was read input which triggered callbacks was
+        # written to the terminal, and when the earliest input which isn't
+        # written yet was read
+        self.input_latency = LatencyHistogram()
+        self._input_read_at: Optional[float] = None
+
+        # callbacks of the events handled since the last frame
+        self._pre_composit_hook: list[Callable[[], Any]] = []
+        self._post_composit_hook: list[Callable[[], Any]] = []
+        # the latest of consecutive mouse moves (or drags), handled once a
+        # different event arrives or the next frame is composed
+        self._pending_move: Optional[MouseEvent] = None
+
+        # the event loop run_async runs on, the future which is done once the
+        # app stops and the tasks started for awaitable callbacks
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Future] = None
+        self._tasks: set[asyncio.Future] = set()
+        # when run runs the app, awaitables are run on this loop, kept on a
+        # thread of its own. It's started for the first awaitable.
+        self._task_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task_thread: Optional[threading.Thread] = None
+
         # Instance of the terminal the app is being ran in
         try:
-            self.__terminal: Terminal = Terminal()
+            self.__terminal: BaseTerminal = (
+                    Terminal() if terminal is None else terminal
+                )
             if rows is None:
                 rows = self.__terminal.rows
             if columns is None:
@@ -38,7 +123,36 @@ class App():
         except OSError:
             pass
 
-        self.event_queue: Queue[Event] = Queue()
+        # prints frames when a writer thread is used. Its written and dropped
+        # counters describe the frames handed over to it
+        self.frame_writer: Optional[FrameWriter] = None
+        if writer_thread:
+            self.frame_writer = FrameWriter(self.__terminal,
+                                            input_latency=self.input_latency)
+
+        # puts are reentrant, so the SIGWINCH handler can wake the loop up
+        self.event_queue: SimpleQueue[Optional[Event]] = SimpleQueue()
+
+        self.thread_executor = thread_executor
+        self.process_executor = process_executor
+        # the executors the app created, they're shut down when it stops
+        self._own_executors: list[Executor] = []
+        self.executor_stats = ExecutorStats()
+
+        # callbacks scheduled with call_later, set_timeout and set_interval.
+        # When the app runs on an event loop, the handle of the loop callback
+        # which runs the next timer
+        self._timers = Timers()
+        self._timer_handle: Optional[asyncio.TimerHandle] = None
+
+        # how long the phases of the latest frames took. With a writer
+        # thread, the diff and write of the latest printed frame are
+        # counted, the terminal's written counter tells when there's a new one
+        self.profiler = FrameProfiler()
+        self._profiled_writes = 0
+        # splits input into events, and when the input it holds back was read
+        self._tokenizer = InputTokenizer()
+        self._held_input_read_at = 0.0
         self.frequency = 1 / fps
 
         # Create a root element with the size of the terminal resolution
@@ -53,38 +167,28 @@ class App():
                     _row=event.coordinates.row - 1,
                     _column=event.coordinates.column - 1)
 
-        def show_cursor(area: list[list[str]]):
-            """Draw cursor and change its position every move event"""
-
-            def draw_cursor() -> None:
-                row = mem_cursor_pos.coords.row
-                col = mem_cursor_pos.coords.column
-                show_cursor.prev_coords = mem_cursor_pos.coords
-                try:
-                    show_cursor.prev_value = area[row][col]
-                    area[row][col] = "\x1b[30;47h" + area[row][col]
-                except IndexError:
-                    return
-
-            def undraw_cursor() -> None:
-                row = show_cursor.prev_coords.row
-                col = show_cursor.prev_coords.column
-                try:
-                    area[row][col] = show_cursor.prev_value
-                except IndexError:
-                    return
-
+        def show_cursor(area: Area, damage: list[Rectangle]):
+            """Draw cursor and change its position every move event. The
+            composed area is new every frame, so only the cells the cursor
+            leaves and enters have to be added to the damaged rectangles"""
             try:
-                undraw_cursor()
-            except AttributeError:
-                # prev value isn't set on first call
-                pass
-
-            try:
-                draw_cursor()
+                coords = mem_cursor_pos.coords
             except AttributeError:
                 # mem_cursor_pos.coords isn't set before a event occurs
-                pass
+                return
+
+            prev_coords = getattr(show_cursor, "prev_coords", None)
+            if prev_coords is not None:
+                damage.append(Rectangle(top_left=prev_coords,
+                                        bottom_right=prev_coords))
+            show_cursor.prev_coords = None
+
+            if (0 <= coords.row < area.rows
+                    and 0 <= coords.column < area.columns):
+                area.set_cell_style(coords.row, coords.column,
+                                    CURSOR_CELL_STYLE)
+                damage.append(Rectangle(top_left=coords, bottom_right=coords))
+                show_cursor.prev_coords = coords
 
         self._show_cursor = show_cursor
         EventBroker.subscribe(
@@ -93,11 +197,12 @@ class App():
                 post_composition=mem_cursor_pos
         )
 
-        def set_focus(event: MouseEvent) -> None:
-            """Set focus to a component once it's clicked"""
+        def set_focus(event: MouseEvent) -> Optional[Awaitable[None]]:
+            """Set focus to a component once it's clicked. Clicking a button
+            signals it, the returned awaitable runs its callbacks."""
             focus_component = self.root.find_component(event.coordinates)
             if focus_component is None:
-                return
+                return None
 
             if set_focus.prev_component is not None:
                 set_focus.prev_component._focus = False
@@ -105,6 +210,11 @@ class App():
             focus_component._focus = True
             set_focus.prev_component = focus_component
 
+            if isinstance(focus_component, Button):
+                return focus_component.click_signal()
+
+            return None
+
         set_focus.prev_component = None
         EventBroker.subscribe(
                 event=MouseEventTypes.MOUSE_LEFT_CLICK,
@@ -121,70 +231,686 @@ class App():
     def root(self, new_root: Container) -> None:
         """Change the root component"""
         self._root = new_root
+        new_root.mark_dirty()
 
-    def get_events(self) -> None:
-        """Continuously fetch events and put them in the event queue."""
-        from tui.events._mouse_parser import MouseParser
-        from tui.events.key_event import HotkeyEvent
-        from tui.events.keys import ANSI_SEQUENCES_KEYS
+    def get_events(self, stop_fd: Optional[int] = None) -> None:
+        """Continuously fetch events and put them in the event queue. The app
+        is stopped once the input is closed. Fetching stops without reading
+        more input as soon as stop_fd becomes readable."""
+        fds = [self.__terminal.input_fd]
+        if stop_fd is not None:
+            fds.append(stop_fd)
 
         while True:
-            # read from stdin
-            control_code = self.__terminal.read_bytes(_bytes=16).decode()
-            # check if it's a control sequence or a simple key press
-            if len(control_code) == 1:
-                self.event_queue.put(HotkeyEvent(control_code))
+            if stop_fd in select.select(fds, [], [])[0]:
+                return
+
+            events = self._read_events()
+            if events is None:
+                self.stop()
+                return
+
+            for event in events:
+                self.event_queue.put(event)
+
+            if not self._tokenizer.pending:
                 continue
 
-            # check if it's a mouse control code and add to the event queue
-            try:
-                self.event_queue.put(
-                        HotkeyEvent(ANSI_SEQUENCES_KEYS[control_code])
-                    )
-            except KeyError:
-                self.event_queue.put(MouseParser.get_mouse_event(control_code))
+            # a held back escape is a key press when nothing follows it
+            readable = select.select(fds, [], [], ESCAPE_TIMEOUT)[0]
+            if stop_fd in readable:
+                return
+            if not readable:
+                for event in self._flush_events():
+                    self.event_queue.put(event)
+
+    def _read_events(self) -> Optional[list[Event]]:
+        """Read the input available on the terminal and split it into
+        events. A sequence which was cut off is completed by later input.
+        None is returned when the input was closed, e.g. the other end of a
+        pty or socket hung up."""
+        try:
+            data = self.__terminal.read_bytes(_bytes=INPUT_CHUNK_SIZE)
+        except BlockingIOError:
+            # the fd is non-blocking (see write_on_loop) and had no input
+            return []
+        except OSError:
+            return None
+        if not data:
+            return None
+
+        read_at = perf_counter()
+        if not self._tokenizer.pending:
+            self._held_input_read_at = read_at
+
+        events = self._tokenizer.feed(data)
+        for event in events:
+            event.read_at = read_at
+        return events
+
+    def _flush_events(self) -> list[Event]:
+        """Take the input the tokenizer held back as it is"""
+        events = self._tokenizer.flush()
+        for event in events:
+            event.read_at = self._held_input_read_at
+        return events
 
     def run(self) -> None:
-        """Start and constantly update the app."""
+        """Start and constantly update the app. Awaitables returned by
+        callbacks are run as tasks on an event loop kept on a thread of its
+        own, so waiting in them doesn't stall rendering. run_async runs them
+        on the app's own loop instead."""
+        # the input thread stops once the app does, when a byte is written to
+        # the pipe, so input typed afterwards isn't read
+        stop_input, stop_input_writer = os.pipe()
         input_thread = threading.Thread(
                 target=self.get_events,
-                args=(),
+                args=(stop_input,),
                 daemon=True
             )
 
+        # set before the input thread starts, so a stop it requests (when the
+        # input ends right away) isn't overwritten
+        self._running = True
         input_thread.start()
+        if self.frame_writer is not None:
+            self.frame_writer.start()
+
+        def handle_resize(_signum, _frame) -> None:
+            """Note the resize, it's handled between frames"""
+            self.notify_resize()
+
+        # signal handlers can only be set in the main thread
+        prev_handler = None
+        if threading.current_thread() is threading.main_thread():
+            prev_handler = signal.signal(signal.SIGWINCH, handle_resize)
 
         try:
-            pre_composit_hook = []
-            post_composit_hook = []
-            timer_start = perf_counter()
-            while True:
-                while self.event_queue.qsize() > 0:
-                    event = self.event_queue.get()
-                    EventBroker.handle(
-                            event=event,
-                            pre_composit_hook=pre_composit_hook,
-                            post_composit_hook=post_composit_hook
-                    )
-
-                if perf_counter() - timer_start >= self.frequency:
-                    composited_area = Compositor.compose(
-                                    self.root,
-                                    pre_composit=pre_composit_hook,
-                                    post_composit=post_composit_hook)
-                    self._show_cursor(composited_area.char_area)
-                    self.__terminal.print(composited_area)
-                    timer_start = perf_counter()
-                    pre_composit_hook = []
-                    post_composit_hook = []
+            # when the next frame is due
+            deadline = perf_counter() + self.frequency
+            while self._running:
+                # sleep until an event arrives, a timer or the next frame is
+                # due. An app with nothing to render sleeps until an event
+                # or a timer changes something
+                wake_up = (float("inf") if self._idle()
+                           else self._next_frame(deadline))
+                next_timer = self._timers.next_deadline()
+                if next_timer is not None:
+                    wake_up = min(wake_up, next_timer)
+                try:
+                    event = self.event_queue.get(
+                            timeout=(None if wake_up == float("inf")
+                                     else max(wake_up - perf_counter(), 0))
+                        )
+                except Empty:
+                    event = None
+
+                # handle the event along with the ones which arrived with it
+                if event is not None:
+                    self._handle_event(event)
+                self._handle_queued_events()
+                self._run_due_timers()
+
+                if perf_counter() >= self._next_frame(deadline):
+                    self._render_frame()
+                    deadline = perf_counter() + self.frequency
 
         except KeyboardInterrupt:
-            self.__terminal.disable_mouse()
-            self.__terminal.disable_input()
-        except BaseException as e:
-            self.__terminal.disable_mouse()
-            self.__terminal.disable_input()
-            raise e
+            pass
+        finally:
+            os.write(stop_input_writer, b"\0")
+            input_thread.join()
+            os.close(stop_input)
+            os.close(stop_input_writer)
+            self._stop_task_loop()
+            self._shutdown_executors()
+            self._stop_writer()
+            self.__terminal.restore()
+            if prev_handler is not None:
+                signal.signal(signal.SIGWINCH, prev_handler)
+
+    async def run_async(self, resize_signal: bool = True) -> None:
+        """Run the app on the running asyncio event loop until it's stopped.
+        Input is read when the terminal has some, frames are scheduled on the
+        loop and awaitables returned by event callbacks are run as tasks, so
+        other coroutines run alongside the app.
+
+        SIGWINCH is handled unless resize_signal is False, e.g. when the
+        terminal isn't the process' own. notify_resize reports resizes
+        then."""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        stopped = loop.create_future()
+        self._stopped = stopped
+
+        def read_input() -> None:
+            """Handle the input which is ready to be read. The next frame is
+            brought forward when it triggered callbacks."""
+            nonlocal frame_handle, escape_handle
+            if escape_handle is not None:
+                escape_handle.cancel()
+                escape_handle = None
+
+            events = self._read_events()
+            if events is None:
+                loop.remove_reader(self.__terminal.input_fd)
+                self.stop()
+                return
+
+            for event in events:
+                self._handle_event(event)
+            if self._tokenizer.pending:
+                escape_handle = loop.call_later(ESCAPE_TIMEOUT, flush_input)
+
+            due = loop.time() + self._next_frame(float("inf")) - perf_counter()
+            if due < frame_handle.when():
+                frame_handle.cancel()
+                frame_handle = loop.call_at(due, frame)
+
+        def flush_input() -> None:
+            """Take a held back escape as a key press, nothing followed it"""
+            nonlocal escape_handle
+            escape_handle = None
+            for event in self._flush_events():
+                self._handle_event(event)
+
+        def frame() -> None:
+            """Render a frame and schedule the next one"""
+            nonlocal frame_handle
+            try:
+                self._handle_queued_events()
+                self._render_frame()
+            except Exception as error:
+                self._set_failed(error)
+                return
+            frame_handle = loop.call_at(loop.time() + self.frequency, frame)
+
+        def handle_resize() -> None:
+            """Note the resize, it's handled before the next frame"""
+            self._resized = True
+
+        loop.add_reader(self.__terminal.input_fd, read_input)
+        # signal handlers can only be set in the main thread
+        resize_handler = False
+        if (resize_signal
+                and threading.current_thread() is threading.main_thread()):
+            loop.add_signal_handler(signal.SIGWINCH, handle_resize)
+            resize_handler = True
+
+        if self.frame_writer is not None:
+            self.frame_writer.start()
+
+        self._running = True
+        escape_handle: Optional[asyncio.TimerHandle] = None
+        frame_handle = loop.call_at(loop.time() + self.frequency, frame)
+        self._schedule_timers()
+        try:
+            await stopped
+        finally:
+            self._running = False
+            frame_handle.cancel()
+            if self._timer_handle is not None:
+                self._timer_handle.cancel()
+                self._timer_handle = None
+            if escape_handle is not None:
+                escape_handle.cancel()
+            loop.remove_reader(self.__terminal.input_fd)
+            if resize_handler:
+                loop.remove_signal_handler(signal.SIGWINCH)
+
+            # the app's tasks don't outlive it
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            self._loop = None
+            self._stopped = None
+            self._shutdown_executors()
+            self._stop_writer()
+            self.__terminal.restore()
+
+    def _handle_event(self, event: Event) -> None:
+        """Prepare the callbacks of an event, they are called when the next
+        frame is composed. Consecutive mouse moves of the same kind are
+        coalesced, the other events are handled in order."""
+        if isinstance(event, TaskDoneEvent):
+            self._handle_pending_move()
+            self._pre_composit_hook.append(event.callback)
+            return
+
+        if (isinstance(event, MouseEvent)
+                and event.action in COALESCED_MOUSE_ACTIONS):
+            pending = self._pending_move
+            if pending is not None and pending.event is event.event:
+                # the latency is measured from the first move
+                if pending.read_at is not None:
+                    event.read_at = pending.read_at
+            else:
+                self._handle_pending_move()
+            self._pending_move = event
+            return
+
+        self._handle_pending_move()
+        self._dispatch_event(event)
+
+    def _handle_pending_move(self) -> None:
+        """Handle the mouse move which was held back for coalescing"""
+        if self._pending_move is not None:
+            event, self._pending_move = self._pending_move, None
+            self._dispatch_event(event)
+
+    def _dispatch_event(self, event: Event) -> None:
+        """Add the callbacks of the event's listeners to the hooks"""
+        callbacks = (len(self._pre_composit_hook)
+                     + len(self._post_composit_hook))
+        with self.profiler.phase(EVENTS):
+            EventBroker.handle(
+                    event=event,
+                    pre_composit_hook=self._pre_composit_hook,
+                    post_composit_hook=self._post_composit_hook
+            )
+
+        # the latency of input is measured when it has a visible effect
+        if (event.read_at is not None and self._input_read_at is None
+                and len(self._pre_composit_hook)
+                + len(self._post_composit_hook) > callbacks):
+            self._input_read_at = event.read_at
+
+    def _next_frame(self, deadline: float) -> float:
+        """Get when the next frame is due (perf_counter) - at the deadline of
+        the regular tick, or sooner when input triggered callbacks and input
+        frames are enabled"""
+        if self.input_frame_interval is None or not (
+                self._pre_composit_hook or self._post_composit_hook
+                or self._pending_move is not None):
+            return deadline
+
+        return min(deadline, self._last_frame + self.input_frame_interval)
+
+    def _handle_queued_events(self) -> None:
+        """Handle the events waiting in the event queue"""
+        start = perf_counter()
+        handling = self.profiler.elapsed(EVENTS)
+        try:
+            while True:
+                try:
+                    event = self.event_queue.get_nowait()
+                except Empty:
+                    return
+
+                if event is not None:
+                    self._handle_event(event)
+        finally:
+            # the time spent handling the events is profiled on its own
+            self.profiler.add(QUEUE, perf_counter() - start
+                              - (self.profiler.elapsed(EVENTS) - handling))
+
+    def _idle(self) -> bool:
+        """Is there nothing to render, so the frame can be skipped? Only apps
+        which render on demand skip frames."""
+        return (self.render_on_demand and not self.root._dirty
+                and not self._resized
+                and not self._frame_dropped
+                and self._pending_move is None
+                and not self._pre_composit_hook
+                and not self._post_composit_hook)
+
+    def _render_frame(self) -> None:
+        """Compose the root component, calling the callbacks of the events
+        handled since the previous frame, and print it"""
+        if self._resized:
+            self._resized = False
+            self._resize()
+            # the terminal is painted entirely, even when no component
+            # changed (e.g. the root's size is fixed)
+            self.root.mark_dirty()
+
+        self._handle_pending_move()
+        if self._idle():
+            return
+
+        self._last_frame = perf_counter()
+        pre_composit_hook = [self._awaiting(callback)
+                             for callback in self._pre_composit_hook]
+        post_composit_hook = [self._awaiting(callback)
+                              for callback in self._post_composit_hook]
+        self._pre_composit_hook = []
+        self._post_composit_hook = []
+
+        # the hooks are called here rather than by the compositor, so they
+        # are profiled apart from the composition
+        with self.profiler.phase(PRE_COMPOSITION):
+            for callback in pre_composit_hook:
+                callback()
+        with self.profiler.phase(COMPOSE):
+            # the terminal may be resized below the size of the children
+            composited_area, damage = Compositor.compose(
+                            self.root, pre_composit=[], post_composit=[],
+                            clip=True)
+        with self.profiler.phase(POST_COMPOSITION):
+            for callback in post_composit_hook:
+                callback()
+        with self.profiler.phase(CURSOR):
+            self._show_cursor(composited_area, damage)
+
+        if self.frame_writer is None:
+            self._frame_dropped = not self.__terminal.print(composited_area,
+                                                            damage)
+            if not self._frame_dropped and self._input_read_at is not None:
+                self.input_latency.record(perf_counter() - self._input_read_at)
+                self._input_read_at = None
+        else:
+            self.frame_writer.submit(composited_area, damage,
+                                     read_at=self._input_read_at)
+            self._input_read_at = None
+
+        stats = self.__terminal.stats
+        if stats.written != self._profiled_writes:
+            self._profiled_writes = stats.written
+            self.profiler.add(DIFF, stats.diff_seconds)
+            self.profiler.add(WRITE, stats.write_seconds)
+        self.profiler.end_frame()
+
+    def stats(self) -> ProfileStats:
+        """Get percentiles of how long the phases of the latest frames took
+        and how many frames took longer than 1 / fps"""
+        return self.profiler.stats(budget=self.frequency)
+
+    def _awaiting(self, callback: Callable[[], Any]) -> Callable[[], None]:
+        """Wrap a callback, so the awaitable it returns (if any) is run"""
+        def wrapper() -> None:
+            result = callback()
+            if inspect.isawaitable(result):
+                self._run_awaitable(result)
+
+        return wrapper
+
+    def _run_awaitable(self, awaitable: Awaitable[Any]) -> None:
+        """Run an awaitable as a task on the event loop the app runs on, or
+        on the task loop when run runs the app"""
+        if self._loop is None:
+            self._run_on_task_loop(awaitable)
+            return
+
+        task = asyncio.ensure_future(awaitable, loop=self._loop)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _run_on_task_loop(self, awaitable: Awaitable[Any]) -> None:
+        """Run an awaitable as a task on the task loop, so it doesn't stall
+        rendering. Once it's done, the UI thread is woken up to show what it
+        changed, and an exception it raised is raised on the UI thread, like
+        the exception of a callback."""
+        if self._task_loop is None:
+            self._task_loop = asyncio.new_event_loop()
+            self._task_thread = threading.Thread(
+                    target=self._run_task_loop,
+                    args=(self._task_loop,),
+                    daemon=True
+                )
+            self._task_thread.start()
+
+        def done(task: asyncio.Future) -> None:
+            """Hand the outcome over to the UI thread"""
+            error = None if task.cancelled() else task.exception()
+            self.event_queue.put(TaskDoneEvent(partial(
+                    self._task_finished, error, None, None
+                )))
+
+        def start() -> None:
+            """Start the task on the task loop"""
+            asyncio.ensure_future(awaitable).add_done_callback(done)
+
+        # the task keeps the context (session) of the callback which returned
+        # the awaitable
+        self._task_loop.call_soon_threadsafe(
+                start, context=contextvars.copy_context())
+
+    @staticmethod
+    def _run_task_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """Run the task loop until it's stopped, then cancel the tasks which
+        didn't finish"""
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.close()
+
+    def _stop_task_loop(self) -> None:
+        """Stop the task loop, the app's tasks don't outlive it"""
+        if self._task_loop is None or self._task_thread is None:
+            return
+
+        self._task_loop.call_soon_threadsafe(self._task_loop.stop)
+        self._task_thread.join()
+        self._task_loop = None
+        self._task_thread = None
+
+    def _task_done(self, task: asyncio.Future) -> None:
+        """Forget a finished task. An exception it raised stops the app and
+        is raised by run_async, as it would be by run."""
+        self._tasks.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+
+        self._set_failed(task.exception())
+
+    def run_in_executor(
+            self,
+            function: Callable[..., Any],
+            *args: Any,
+            # called with the function's result on the UI thread
+            on_done: Optional[Callable[[Any], Any]] = None,
+            # run the function in the process pool instead of the thread
+            # pool. The function, its arguments and result have to be
+            # picklable
+            process: bool = False,
+            **kwargs: Any
+    ) -> Future:
+        """Run a function in the background, so a slow callback doesn't
+        stall rendering. on_done is called before the next frame after the
+        function returns. An exception the function raises is raised on the
+        UI thread, like one raised by an event callback. The returned future
+        is done once the function is. Functions which didn't start when the
+        app stops are cancelled, their future raises CancelledError."""
+        if process:
+            if self.process_executor is None:
+                self.process_executor = ProcessPoolExecutor()
+                self._own_executors.append(self.process_executor)
+            executor = self.process_executor
+        else:
+            if self.thread_executor is None:
+                self.thread_executor = ThreadPoolExecutor()
+                self._own_executors.append(self.thread_executor)
+            executor = self.thread_executor
+
+        result: Future = Future()
+        result.set_running_or_notify_cancel()
+
+        def done(future: Future) -> None:
+            """Hand the outcome over to the UI thread. It's called by the
+            executor's thread, or by the thread which shut the executor down
+            when the function was cancelled."""
+            if future.cancelled():
+                # result is already running, so it can't be cancelled
+                self.executor_stats.count_cancelled()
+                result.set_exception(CancelledError())
+                return
+
+            error = future.exception()
+            value, duration = ((None, 0.0) if error is not None
+                               else future.result())
+            self.executor_stats.count_finished(error, duration)
+            if error is None:
+                result.set_result(value)
+            else:
+                result.set_exception(error)
+
+            self.event_queue.put(TaskDoneEvent(partial(
+                    self._task_finished, error, value, on_done
+                )))
+
+        self.executor_stats.submitted += 1
+        executor.submit(timed_call, function, args, kwargs).add_done_callback(
+                done)
+        return result
+
+    def _task_finished(
+            self,
+            error: Optional[BaseException],
+            value: Any,
+            on_done: Optional[Callable[[Any], Any]]
+    ) -> Any:
+        """Raise the exception of a finished background function or call its
+        callback. It's called on the UI thread."""
+        if error is not None:
+            raise error
+
+        if on_done is not None:
+            return on_done(value)
+        return None
+
+    def _shutdown_executors(self) -> None:
+        """Shut down the executors the app created, cancelling the functions
+        which didn't start yet"""
+        for executor in self._own_executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if executor is self.thread_executor:
+                self.thread_executor = None
+            if executor is self.process_executor:
+                self.process_executor = None
+        self._own_executors = []
+
+    def call_later(
+            self,
+            delay: float,
+            callback: Callable[..., Any],
+            *args: Any
+    ) -> Timer:
+        """Call callback(*args) once after delay seconds. Timers run on the
+        UI thread before the next frame is composed, so they can change
+        components. They should be scheduled from the UI thread (event
+        callbacks, other timers) or before the app runs."""
+        return self._add_timer(delay, partial(callback, *args))
+
+    def set_timeout(self, callback: Callable[[], Any], delay: float) -> Timer:
+        """Call callback once after delay seconds, see call_later"""
+        return self._add_timer(delay, callback)
+
+    def set_interval(
+            self,
+            callback: Callable[[], Any],
+            interval: float
+    ) -> Timer:
+        """Call callback every interval seconds until the returned timer is
+        cancelled. Intervals which pass while the app is busy are skipped
+        rather than run in a burst. Raise ValueError unless interval is
+        positive."""
+        return self._add_timer(interval, callback, interval)
+
+    def _add_timer(
+            self,
+            delay: float,
+            callback: Callable[[], Any],
+            interval: Optional[float] = None
+    ) -> Timer:
+        """Schedule a timer, awaitables its callback returns are run"""
+        timer = self._timers.add(delay, self._awaiting(callback), interval)
+        self._schedule_timers()
+        return timer
+
+    def _schedule_timers(self) -> None:
+        """Wake the event loop up when the next timer is due. run checks the
+        timers every time it wakes up instead."""
+        if self._loop is None:
+            return
+
+        if self._timer_handle is not None:
+            self._timer_handle.cancel()
+            self._timer_handle = None
+
+        deadline = self._timers.next_deadline()
+        if deadline is not None:
+            self._timer_handle = self._loop.call_at(
+                    self._loop.time() + deadline - perf_counter(),
+                    self._run_timers
+                )
+
+    def _run_due_timers(self) -> None:
+        """Run the timers which are due, profiling them"""
+        with self.profiler.phase(TIMERS):
+            self._timers.run_due()
+
+    def _run_timers(self) -> None:
+        """Run the timers which are due on the event loop. An exception a
+        callback raises is raised by run_async."""
+        self._timer_handle = None
+        try:
+            self._run_due_timers()
+        except Exception as error:
+            self._set_failed(error)
+        self._schedule_timers()
+
+    def notify_resize(self) -> None:
+        """Note that the terminal was resized. The root is fitted to the new
+        size before the next frame. Can be called from any thread."""
+        self._resized = True
+        # wake the main loop up, None isn't handled as an event
+        self.event_queue.put(None)
+
+    def refresh(self) -> None:
+        """Compose the next frame even if no component changed. Can be called
+        from any thread."""
+        self.root.mark_dirty()
+        # wake the main loop up, None isn't handled as an event
+        self.event_queue.put(None)
+
+    def stop(self) -> None:
+        """Stop the app after the frame it's currently working on. Can be
+        called from any thread."""
+        self._running = False
+        # wake the main loop up, None isn't handled as an event
+        self.event_queue.put(None)
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._set_stopped)
+
+    def _set_stopped(self) -> None:
+        """Let run_async return"""
+        if self._stopped is not None and not self._stopped.done():
+            self._stopped.set_result(None)
+
+    def _set_failed(self, error: BaseException) -> None:
+        """Let run_async raise an exception raised on the event loop"""
+        if self._stopped is not None and not self._stopped.done():
+            self._stopped.set_exception(error)
+
+    def _resize(self) -> None:
+        """Fit the root component to the terminal's new size. Only the root
+        is resized, so the component tree is kept and the children are laid
+        out again when the next frame is composed, clipping the ones which no
+        longer fit. The terminal paints that frame entirely."""
+        if self.frame_writer is None:
+            self.__terminal.update_size()
+        else:
+            # the writer thread may be diffing a frame against the terminal
+            self.frame_writer.update_size()
+        self.root.resize(
+                rows=(self.__terminal.rows if self._fit_rows
+                      else self.root.area.rows),
+                columns=(self.__terminal.columns if self._fit_columns
+                         else self.root.area.columns)
+            )
+
+    def _stop_writer(self) -> None:
+        """Wait for the writer thread to print its last frame, so the
+        terminal isn't restored while a frame is being written"""
+        if self.frame_writer is not None:
+            self.frame_writer.stop()
 
 
 def main():
@@ -7,10 +7,13 @@ done.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+import copy
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
 
 from tui._area_box_model import BoxModel
+from tui._cell_style import CellStyle, DEFAULT_CELL_STYLE
 from tui._coordinates import RestrictedCoordinates, Coordinates
+from tui._grid import resize_grid
 
 if TYPE_CHECKING:
     from tui.styles.area import AreaInfo
@@ -19,12 +22,20 @@ if TYPE_CHECKING:
 
 class Area:
     """Responsible for rendering how a component should look. This includes
-    the box model and any dynamic changes that may happen within it"""
+    the box model and any dynamic changes that may happen within it.
+
+    Every change to the cells has to go through the area's methods rather
+    than through char_area and style_area directly. The methods call
+    on_change, which a component sets to mark itself dirty, so a component
+    whose area changes is composed again instead of reusing its last
+    composition."""
     # TODO: methods to add margin and padding after initialization
     def __init__(
             self,
             area_info: AreaInfo,
-            border: Optional[Border] = None
+            border: Optional[Border] = None,
+            # the style of cells which aren't given one explicitly
+            cell_style: CellStyle = DEFAULT_CELL_STYLE
     ) -> None:
         self.model = BoxModel(info=area_info)
         # char_area is where every change is reflected
@@ -34,6 +45,23 @@ class Area:
                 for _ in range(self.rows)
             ]
 
+        # style_area holds the style of every cell in char_area
+        self.cell_style = cell_style
+        self.style_area: list[list[CellStyle]] = [
+                [cell_style] * self.columns
+                for _ in range(self.rows)
+            ]
+
+        # rows which may be shared with a snapshot of the area. They're copied
+        # before the area writes to them
+        self._shared_rows: set[int] = set()
+
+        # the border drawn along the margin, kept to redraw it on resize
+        self.border: Optional[Border] = None
+
+        # called after the cells or the size of the area change
+        self.on_change: Optional[Callable[[], None]] = None
+
         # the area pointer is used for easier navigating and writing to
         # char_area as it automatically keeps track of a lot of variables
         self.area_ptr = RestrictedCoordinates(
@@ -51,6 +79,7 @@ class Area:
         if border is None:
             return
 
+        self.border = border
         # apply border between margin and padding
         self.area_ptr.restriction = self.model.with_margin
 
@@ -94,7 +123,10 @@ class Area:
             string: str,  # string to be added to the area
             # should new line start at current area pointer column
             column_preserve: bool = False,
-            ptr_preserve: bool = True  # reset area pointer to initial position
+            # reset area pointer to initial position
+            ptr_preserve: bool = True,
+            # style of the written cells, their style is kept when omitted
+            style: Optional[CellStyle] = None
     ) -> None:
         """
         Write to char_area starting from area_ptr coordinates. Any '\n' in the
@@ -116,6 +148,11 @@ class Area:
         ):
             raise IndexError("String is too large")
 
+        if self._shared_rows:
+            first = self.area_ptr.row
+            self._own_rows(range(first, min(first + string.count("\n") + 1,
+                                            len(self.char_area))))
+
         for count, char in enumerate(string):
             if char == '\n':
                 # if area_ptr is on the last row and the last char is a newline
@@ -134,6 +171,9 @@ class Area:
                 continue
 
             self.char_area[self.area_ptr.row][self.area_ptr.column] = char
+            if style is not None:
+                self.style_area[self.area_ptr.row][
+                        self.area_ptr.column] = style
 
             # Required check to prevent a RestrictedCoordinates exception
             if (self.area_ptr.column < self.area_ptr.restriction.bottom_right
@@ -150,6 +190,122 @@ class Area:
             # hence returning the pointer 1 back
             self.area_ptr.column -= 1
 
+        self._changed()
+
+    def add_area(self, area: Area, clip: bool = False) -> None:
+        """Draw another area (its chars and styles) with its top left corner
+        at area_ptr coordinates. Doesn't mutate the area pointer. An area
+        which doesn't fit raises IndexError, unless clip is set - then only
+        the part which fits is drawn."""
+        relative = self.area_ptr.get_relative_coords()
+        rows = self.area_ptr.restriction.rows - relative.row
+        columns = self.area_ptr.restriction.columns - relative.column
+        if not clip and (area.rows > rows or area.columns > columns):
+            raise IndexError("Area is too large")
+
+        rows = min(rows, area.rows)
+        columns = min(columns, area.columns)
+        if self._shared_rows:
+            self._own_rows(range(self.area_ptr.row, self.area_ptr.row + rows))
+
+        first = self.area_ptr.column
+        last = first + columns
+        for row in range(rows):
+            self.char_area[self.area_ptr.row + row][first:last] = (
+                    area.char_area[row][:columns]
+                )
+            self.style_area[self.area_ptr.row + row][first:last] = (
+                    area.style_area[row][:columns]
+                )
+
+        self._changed()
+
+    def resize(self, rows: int, columns: int) -> None:
+        """Change the size of the area in place. Cells which fit in both sizes
+        keep their chars and styles, new cells are blank. The border is
+        redrawn along the new edges and the area pointer is reset."""
+        self._own_rows(range(len(self.char_area)))
+        border = self.border
+        if border is not None:
+            self._clear_border()
+
+        resize_grid(self.char_area, rows, columns, " ")
+        resize_grid(self.style_area, rows, columns, self.cell_style)
+
+        self.model.resize(rows, columns)
+        self.area_ptr.restriction = self.model.with_padding
+        self.border = None
+        self.add_border(border)
+        self.area_ptr.reset_coords()
+        self._changed()
+
+    def set_cell_style(self, row: int, column: int, style: CellStyle) -> None:
+        """Change the style of a single cell"""
+        if self._shared_rows:
+            self._own_rows((row,))
+        self.style_area[row][column] = style
+        self._changed()
+
+    def snapshot(self) -> Area:
+        """Copy the area without copying its cells. The copy shares the rows
+        of the original, and a shared row is copied by whichever area writes
+        to it first (copy on write). The rectangles of the box model are
+        shared as well, since they're replaced rather than changed."""
+        area = Area.__new__(Area)
+        area.model = copy.copy(self.model)
+        # resizing changes the info in place
+        area.model.info = copy.copy(self.model.info)
+        area.char_area = list(self.char_area)
+        area.style_area = list(self.style_area)
+        area.cell_style = self.cell_style
+        area.border = self.border
+        # the snapshot belongs to no component
+        area.on_change = None
+        area.area_ptr = RestrictedCoordinates(
+                _row=self.area_ptr.row,
+                _column=self.area_ptr.column,
+                _restriction=self.area_ptr.restriction
+            )
+
+        self._shared_rows = set(range(len(self.char_area)))
+        area._shared_rows = set(self._shared_rows)
+        return area
+
+    def _own_rows(self, rows: Iterable[int]) -> None:
+        """Copy the rows which are shared with a snapshot, so writing to them
+        doesn't change the snapshot"""
+        for row in rows:
+            if row in self._shared_rows:
+                self._shared_rows.discard(row)
+                self.char_area[row] = self.char_area[row][:]
+                self.style_area[row] = self.style_area[row][:]
+
+    def _clear_border(self) -> None:
+        """Replace the chars of the border with blanks"""
+        edges = self.model.with_margin
+        top = edges.top_left.row
+        bottom = edges.bottom_right.row
+        left = edges.top_left.column
+        right = edges.bottom_right.column
+
+        self.char_area[top][left:right + 1] = [" "] * (right - left + 1)
+        self.char_area[bottom][left:right + 1] = [" "] * (right - left + 1)
+        for row in range(top, bottom + 1):
+            self.char_area[row][left] = " "
+            self.char_area[row][right] = " "
+
+    def fill_style(self, style: CellStyle) -> None:
+        """Change the style of every cell and the style of cells which aren't
+        given one explicitly"""
+        self.cell_style = style
+        self.style_area = [[style] * self.columns for _ in range(self.rows)]
+        self._changed()
+
+    def _changed(self) -> None:
+        """Let the owner of the area know that it changed"""
+        if self.on_change is not None:
+            self.on_change()
+
     def _verify_str(self, string: str, column_preserve: bool) -> bool:
         """Verify that string can fit in char_area - used in add_chars.
         It mimics the behaviour of add_char to make sure the string never goes
@@ -193,9 +349,9 @@ class Area:
     @rows.setter
     def rows(self, rows: int) -> None:
         """Set the rows in the area"""
-        raise NotImplementedError
+        self.resize(rows, self.columns)
 
     @columns.setter
     def columns(self, columns: int) -> None:
         """Set the columns in the area"""
-        raise NotImplementedError
+        self.resize(self.rows, columns)
@@ -10,12 +10,18 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
+from tui._cell_style import CellStyle
 from tui._coordinates import Coordinates, Rectangle
 from tui.area import Area
 from tui.component_node import CMNode
 from tui.style import Style
 from tui.styles.border import Border
 
+# style attributes which change how the area is coloured
+COLOUR_ATTRIBUTES = frozenset(
+        ("foreground", "background", "text_colour", "text_background")
+    )
+
 
 class Component(CMNode):
     """Abstract class responsible for creating TUI elements."""
@@ -26,9 +32,15 @@ class Component(CMNode):
     ) -> None:
         self.style = style
         # if a component has focus, it will listen to it's non-global events
-        self._focus = False
+        self.__focus = False
 
-        self.__area = Area(self.__style.area_info)
+        self.__area = Area(
+                self.__style.area_info,
+                cell_style=CellStyle.from_colours(
+                        self.__style.colour_info.foreground,
+                        self.__style.colour_info.background
+                    )
+            )
 
         # rect mapping is the rectangle which this child component resides in,
         # using absolute coordinates (relative to its parent-moost (root)
@@ -36,17 +48,55 @@ class Component(CMNode):
         # hence where it's set.
         self.__rect_mapping: Optional[Rectangle] = None
 
+        # the place (row, column, rows, columns) the component was drawn at
+        # when it was last composed with damage tracked. Together with the
+        # dirty flags, the compositor finds which parts of the screen changed.
+        self._last_composition: Optional[tuple[int, int, int, int]] = None
+        # the area the component was composed to along with its children,
+        # and where it was drawn (relative to the area composition started
+        # from). It's reused while the component isn't dirty.
+        self._composed_area: Optional[Area] = None
+        self._composed_origin: Optional[Coordinates] = None
+
         super().__init__(identifier=identifier)
+        # writing to the area marks the component dirty
+        self.__area.on_change = self.mark_dirty
 
     def add_border(self, border: Border) -> None:
         """Add border to the component. Note that adding a border decreases the
         space the component's can use"""
         self.area.add_border(border)
+        self.mark_dirty()
+
+    def resize(self, rows: int, columns: int) -> None:
+        """Change the size of the component in place. Its content is laid
+        out again, while its children are left as they are."""
+        if rows == self.area.rows and columns == self.area.columns:
+            return
+
+        self.area.resize(rows, columns)
+        self._on_resize()
+        self.mark_dirty()
+
+    def _on_resize(self) -> None:
+        """Lay out the component's content after its area was resized"""
 
     def set_style(self, attribute_name: str, value: Any) -> None:
         """Change the value of a style attribute"""
         self.style.set_value(attribute_name, value)
 
+        if attribute_name in COLOUR_ATTRIBUTES:
+            self._apply_colours()
+
+        self.mark_dirty()
+
+    def _apply_colours(self) -> None:
+        """Colour the component's area according to its style"""
+        self.area.fill_style(CellStyle.from_colours(
+                self.style.colour_info.foreground,
+                self.style.colour_info.background
+            ))
+
     def get_style(self, attribute_name: str) -> Any:
         """Get the value of a style attribute"""
         self.style.get_value(attribute_name)
@@ -55,6 +105,18 @@ class Component(CMNode):
         """Does the component have focus?"""
         return self._focus
 
+    @property
+    def _focus(self) -> bool:
+        """Get whether the component has focus"""
+        return self.__focus
+
+    @_focus.setter
+    def _focus(self, focus: bool) -> None:
+        """Give or take focus from the component"""
+        if focus != self.__focus:
+            self.__focus = focus
+            self.mark_dirty()
+
     def find_component(self, coordinates: Coordinates) -> Optional[Component]:
         """Find the child-most component which encapsulates the coordinates we
         search by. A recursive depth search is performed on the component tree.
@@ -107,7 +169,10 @@ class Component(CMNode):
 
     @property
     def area(self) -> Area:
-        """Get this component's area (space it's drawn in)"""
+        """Get this component's area (space it's drawn in). Changes to the
+        area have to go through its methods, which mark the component dirty -
+        writing to char_area or style_area directly isn't shown until the
+        component is marked dirty."""
         return self.__area
 
     @area.setter
@@ -116,3 +181,5 @@ class Component(CMNode):
         Mainly used for testing.
         """
         self.__area = area
+        self.__area.on_change = self.mark_dirty
+        self.mark_dirty()
@@ -11,23 +11,43 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 from tui._node_list import NodeList
+from tui._session_state import current_state
 
 
 class CMNode(ABC):
     """Base object in the model. An abstract class, handling the treelike
     structure"""
-    id_counter = 0
 
     def __init__(
             self,
             identifier: Optional[str] = None,  # Unique node id
     ) -> None:
         if identifier is None:
-            self.__id = str(CMNode.id_counter)
-            CMNode.id_counter += 1
+            # ids are unique within a session
+            state = current_state()
+            self.__id = str(state.id_counter)
+            state.id_counter += 1
         else:
             self.__id = identifier
-        self.__children: NodeList = NodeList()
+        # the node this one is a child of, set by the parent's children list
+        self._parent: Optional[CMNode] = None
+        # the node or one of its descendants changed since it was last
+        # composed
+        self._dirty = True
+        # the node itself (its area, style or children) changed since it was
+        # last composed, rather than only its descendants
+        self._content_dirty = True
+        self.__children: NodeList = NodeList(owner=self)
+
+    def mark_dirty(self) -> None:
+        """Note that the node changed, so it and its parents have to be
+        composed again. A dirty node's parents are always dirty, so marking
+        stops at the first node which already is."""
+        self._content_dirty = True
+        node = self
+        while node is not None and not node._dirty:
+            node._dirty = True
+            node = node._parent
 
     @property
     def id(self) -> Optional[str]:
@@ -1,14 +1,29 @@
 """The input is a widget for capturing user input. It works as a dynamic label
-as to where every new char the user writes forces a text update. Text can be
-deleted with backspace."""
+as to where every new char the user writes forces a text update. Pasted text
+is inserted at once, without its control chars. Text can be deleted with
+backspace."""
 
 from typing import Optional
+import re
 
+from tui._cell_style import CURSOR_CELL_STYLE
+from tui._parser import Parser
 from tui.components.label import Label
 from tui.events.event_broker import EventBroker
 from tui.events.key_event import HotkeyEvent
 from tui.events.keys import ANSI_SEQUENCES_KEYS, Keys
+from tui.events.paste_event import PasteEvent
 from tui.style import Style
+from tui.styles.text import TextAlignment
+
+# control chars of pasted text would move the cursor or change the terminal's
+# modes when the text is printed. They're dropped, tabs become a space and
+# newlines are kept
+PASTE_TRANSLATION: dict[int, Optional[str]] = {
+        code: None for code in (*range(0x20), *range(0x7f, 0xa0))
+    }
+PASTE_TRANSLATION[ord("\t")] = " "
+del PASTE_TRANSLATION[ord("\n")]
 
 
 class Input(Label):
@@ -24,6 +39,8 @@ class Input(Label):
                          label_text=placeholder)
 
         self.placeholder = placeholder
+        # the text the user entered, the placeholder is shown until then
+        self._input_text = ""
         self.pos_pointer = 0
 
         def add_text_event(event: HotkeyEvent) -> None:
@@ -55,23 +72,111 @@ class Input(Label):
                 pre_composition=add_text_event
         )
 
+        def paste_text_event(event: PasteEvent) -> None:
+            """Insert pasted text, laying the input out once"""
+            self.add_text(event.text.translate(PASTE_TRANSLATION))
+
+        EventBroker.subscribe(
+                event=PasteEvent(""),
+                subscriber=self,
+                pre_composition=paste_text_event
+        )
+
     def add_text(self, text: str) -> None:
+        """Insert text at the caret and move the caret after it. When all of
+        it doesn't fit, as much of its start as fits is inserted."""
+        fits = len(text)
+        if not self._show_inserted(text):
+            # halve the range between a length which fits and one which
+            # doesn't. The last shown text is the longest which fits
+            fits, too_long = 0, len(text)
+            while too_long - fits > 1:
+                middle = (fits + too_long) // 2
+                if self._show_inserted(text[:middle]):
+                    fits = middle
+                else:
+                    too_long = middle
+            if not fits:
+                return
+
+        self._input_text = (self._input_text[:self.pos_pointer] + text[:fits]
+                            + self._input_text[self.pos_pointer:])
+        self.pos_pointer += fits
+        self._render_caret()
+
+    def _show_inserted(self, text: str) -> bool:
+        """Show the input's text with text inserted at the caret, unless it
+        doesn't fit. Return whether it was shown."""
         try:
-            self.text = self.text[:self.pos_pointer] + text + "\x1b[30;47h  "
+            self.text = (self._input_text[:self.pos_pointer] + text
+                         + self._input_text[self.pos_pointer:])
         except ValueError:  # not enough space
-            return
-        self.text = self.text[:-2]
-        self.pos_pointer += len(text)
+            return False
+
+        return True
 
     def remove_last_char(self) -> None:
+        """Remove the char before the caret"""
         # do nothing if text is empty
-        if self.text.startswith("\x1b[30;47h") or len(self.text) < 1:
+        if self.pos_pointer < 1:
             return
 
+        self._input_text = (self._input_text[:self.pos_pointer - 1]
+                            + self._input_text[self.pos_pointer:])
         self.pos_pointer -= 1
-        self.text = self.text[:self.pos_pointer] + "\x1b[30;47h  "
-        self.text = self.text[:-2]
+        self.text = self._input_text
+        self._render_caret()
 
     def get_input(self) -> str:
-        """Get the label's text"""
-        return self._text.split("\x1b[30;47h")[0]
+        """Get the text the user entered"""
+        return self._input_text
+
+    def _on_resize(self) -> None:
+        """Align the input's text within its new size"""
+        super()._on_resize()
+        if self._input_text:
+            self._render_caret()
+
+    def _render_to_area(self) -> None:
+        """Clear the input's area before rendering its text, since the text
+        can become shorter"""
+        self._blank_content()
+        super()._render_to_area()
+
+    def _render_caret(self) -> None:
+        """Highlight the cell after the rendered text"""
+        padding = self.area.model.with_padding
+        row = self.text.count("\n")
+        # the last line of the entered text as the label wrapped it, it's
+        # drawn from where aligning it put it
+        wrapped = re.findall(Parser.auto_wrap_text(padding.columns),
+                             self._input_text.split("\n")[-1])[:-1]
+        if wrapped:
+            line = wrapped[-1]
+        else:
+            # an empty line isn't drawn, the next char starts it
+            line = ""
+            if "\n" in self._input_text:
+                row += 1
+        # the cell a char of the line (or the first char of an empty line)
+        # is drawn to, found by aligning it
+        shown = line or "x"
+        column = (self._align_line(shown, padding.columns).index(shown)
+                  + len(line))
+
+        if column >= padding.columns:
+            if self.style.get_value("text_align") is TextAlignment.LEFT:
+                # the next char starts the next row
+                row += 1
+                column = 0
+            else:
+                # aligned text ends at the last column, the caret stays on it
+                column = padding.columns - 1
+
+        if row >= padding.rows:
+            return
+
+        self.area.set_cell_style(padding.top_left.row + row,
+                                 padding.top_left.column + column,
+                                 CURSOR_CELL_STYLE)
+        self.mark_dirty()
@@ -6,6 +6,7 @@ itself. Dynamic changes to the label's text should are also handled
 from typing import Optional
 import re
 
+from tui._cell_style import CellStyle
 from tui.components.widget import Widget
 from tui._parser import Parser
 from tui.style import Style
@@ -29,7 +30,30 @@ class Label(Widget):
     def _render_to_area(self) -> None:
         """Render the label's text to its area"""
         self.area.area_ptr.reset_coords()
-        self.area.add_chars(self.text)
+        self.area.add_chars(self.text, style=CellStyle.from_colours(
+                self.style.text_info.text_colour,
+                self.style.text_info.text_background
+            ))
+        self.mark_dirty()
+
+    def _apply_colours(self) -> None:
+        """Colour the label's area and text according to its style"""
+        super()._apply_colours()
+        self._render_to_area()
+
+    def _blank_content(self) -> None:
+        """Overwrite the content of the area (within padding) with blanks"""
+        self.area.area_ptr.reset_coords()
+        self.area.add_chars(
+                "\n".join([" " * self.area.model.with_padding.columns]
+                          * self.area.model.with_padding.rows),
+                style=self.area.cell_style
+            )
+
+    def _on_resize(self) -> None:
+        """Align the label's text within its new size"""
+        self._blank_content()
+        self.text = self._label_text
 
     def clear(self) -> None:
         """Clear existing area"""
@@ -61,14 +85,7 @@ class Label(Widget):
 
             wrapped_lines = re.findall(Parser.auto_wrap_text(max_width), line)
             for _line in wrapped_lines[:-1]:  # last value is a dud so trim it
-                # align text horizontally
-                match self.style.get_value("text_align"):
-                    case TextAlignment.LEFT:
-                        lines.append(_line)
-                    case TextAlignment.CENTER:
-                        lines.append(_line.center(max_width))
-                    case TextAlignment.RIGHT:
-                        lines.append(f"{_line:>{max_width}}")
+                lines.append(self._align_line(_line, max_width))
 
                 if len(lines) > max_height:
                     raise ValueError("Too many lines, cannot fit")
@@ -83,8 +100,20 @@ class Label(Widget):
             case VerticalAlignment.BOTTOM:
                 self._text = '\n' * remaining_lines + '\n'.join(lines)
 
+        # the text before it's aligned, kept to align it again on resize
+        self._label_text = new_text
         self._render_to_area()
 
+    def _align_line(self, line: str, max_width: int) -> str:
+        """Align a wrapped line of text horizontally"""
+        match self.style.get_value("text_align"):
+            case TextAlignment.CENTER:
+                return line.center(max_width)
+            case TextAlignment.RIGHT:
+                return f"{line:>{max_width}}"
+            case _:
+                return line
+
     @property
     def children(self) -> None:
         """Widgets can't have child components"""
@@ -5,10 +5,9 @@ It may composite only a part of the screen where updates have occurred.
 
 from __future__ import annotations
 
-import copy
 from typing import TYPE_CHECKING, Optional
 
-from tui._coordinates import Coordinates, Rectangle, CoordinateError
+from tui._coordinates import Coordinates, Rectangle, Region, CoordinateError
 from tui.component import Area
 from tui.events.event_listener import Callback
 from tui.styles.compositor import Orientation
@@ -33,10 +32,16 @@ class Compositor:
     def compose(
             root: Component,  # the component which's area is being composed
             pre_composit: list[Callback],
-            post_composit: list[Callback]
-    ) -> Area:
+            post_composit: list[Callback],
+            # draw only the part of children which fits in their parent,
+            # instead of raising InsufficientAreaError
+            clip: bool = False
+    ) -> tuple[Area, list[Rectangle]]:
         """Compose a component with its children components recursively. Run
-        pre-compose and post-compose hooks
+        pre-compose and post-compose hooks.
+
+        Return the composed area along with the rectangles (relative to the
+        area) which changed since the previous composition.
         """
         for callback in pre_composit:
             callback()
@@ -50,22 +55,104 @@ class Compositor:
                 + Coordinates(1, 1)
             )
 
-        new_area = Compositor._compose(root=root)
+        damage = Region()
+        new_area = Compositor._compose(root=root, damage=damage, clip=clip)
 
         for callback in post_composit:
             callback()
 
-        return new_area
+        # clipped children may have changed outside of the area
+        bounds = root.area.model.area_rect
+        rects = [rect.intersection(bounds) for rect in damage]
+
+        # the cached area of the root is repainted by later compositions,
+        # while the frame is handed to the terminal as is
+        return new_area.snapshot(), [rect for rect in rects if rect]
 
     @staticmethod
-    def _compose(root: Component) -> Area:
+    def _compose(
+            root: Component,
+            damage: Optional[Region] = None,
+            origin: Coordinates = Coordinates(0, 0),
+            clip: bool = False
+    ) -> Area:
         """Compose a component with its children components recursively
 
         root: the component's area that's being composed
-        next_component: rectangular area which the next component should occupy
+        damage: region collecting the rectangles that changed since the
+            previous composition
+        origin: where the root's area is drawn, relative to the area of the
+            component composition started from
+        clip: draw only the part of children which fits in the root's area,
+            children outside of it are composed but not drawn
+
+        A component which didn't change since it was composed at the same
+        origin is reused as is. When only its descendants changed and its
+        children are laid out as before, the dirty children are repainted
+        onto the area it was last composed to, so the cost of a composition
+        depends on what changed rather than on the size of the tree.
         """
+        cached = root._composed_area is not None and (
+                root._composed_origin == origin)
+        if cached and not root._dirty:
+            return root._composed_area
+
+        # map the component to where it's drawn, add 1 because terminal
+        # coordinates start at 1
+        root._rect_mapping = Rectangle(
+                top_left=origin + Coordinates(1, 1),
+                bottom_right=origin + Coordinates(root.area.rows,
+                                                  root.area.columns)
+            )
+        layout = Compositor._lay_out_children(root)
+
+        if cached and not root._content_dirty and all(
+                Compositor._laid_out_as_before(child, origin + position)
+                for child, position in layout):
+            new_area = root._composed_area
+            layout = [(child, position) for child, position in layout
+                      if child._dirty]
+        else:
+            if damage is not None:
+                Compositor._track_damage(root, damage, origin)
+            new_area = root.area.snapshot()
+
+        padding = new_area.model.with_padding
+        for child, position in layout:
+            # recursion ends when there are no more children
+            child_area = Compositor._compose(
+                    child,
+                    damage=damage,
+                    origin=origin + position,
+                    clip=clip
+                )
+            if clip and position not in padding:
+                continue
 
-        new_area = copy.deepcopy(root.area)
+            # draw child component
+            try:
+                new_area.area_ptr.row = position.row
+                new_area.area_ptr.column = position.column
+                new_area.add_area(child_area, clip=clip)
+            except IndexError as exc:
+                raise InsufficientAreaError(
+                        "Component area isn't large enough"
+                    ) from exc
+
+        root._composed_area = new_area
+        root._composed_origin = origin
+        root._dirty = False
+        root._content_dirty = False
+        return new_area
+
+    @staticmethod
+    def _lay_out_children(
+            root: Component
+    ) -> list[tuple[Component, Coordinates]]:
+        """Find where each child of a component is drawn, relative to the
+        component's area"""
+        layout = []
+        padding = root.area.model.with_padding.top_left
 
         # the rectangle the previous child was in
         prev_rect: Optional[Rectangle] = None
@@ -85,27 +172,62 @@ class Compositor:
                         "Component area isn't large enough"
                     ) from exc
 
-            # recursion ends when there are no more children
-            child_area = Compositor._compose(child)
+            layout.append((child, Coordinates(
+                    prev_rect.top_left.row + padding.row,
+                    prev_rect.top_left.column + padding.column
+                )))
             prev_component = child
-            new_area.area_ptr.row = (
-                prev_rect.top_left.row
-                + new_area.model.with_padding.top_left.row
-            )
-            new_area.area_ptr.column = (
-                prev_rect.top_left.column
-                + new_area.model.with_padding.top_left.column
-            )
 
-            # draw child component
-            try:
-                new_area.add_chars(str(child_area), column_preserve=True)
-            except IndexError as exc:
-                raise InsufficientAreaError(
-                        "Component area isn't large enough"
-                    ) from exc
+        return layout
 
-        return new_area
+    @staticmethod
+    def _laid_out_as_before(child: Component, origin: Coordinates) -> bool:
+        """Is a child drawn at the same place and with the same size as when
+        it was last composed, so repainting it covers the same cells?"""
+        return (child._composed_area is not None
+                and child._composed_origin == origin
+                and child._composed_area.rows == child.area.rows
+                and child._composed_area.columns == child.area.columns)
+
+    @staticmethod
+    def _track_damage(
+            component: Component,
+            damage: Region,
+            origin: Coordinates
+    ) -> None:
+        """Add the rectangle a component occupies to the damaged region if
+        it changed itself (its area, style or children) or moved since it was
+        last composed, along with the rectangle it occupied then. Changing
+        children damages the whole component, so the space of removed
+        children is repainted."""
+        composition = (origin.row, origin.column,
+                       component.area.rows, component.area.columns)
+
+        last_composition = component._last_composition
+        if composition == last_composition and not component._content_dirty:
+            return
+
+        component._last_composition = composition
+        damage.add(Rectangle(
+                top_left=Coordinates(origin.row, origin.column),
+                bottom_right=Coordinates(
+                        _row=origin.row + component.area.rows - 1,
+                        _column=origin.column + component.area.columns - 1
+                    )
+            ))
+
+        if last_composition is None or last_composition == composition:
+            return
+
+        # the component moved or was resized, its previous place changed too
+        row, column, rows, columns = last_composition
+        damage.add(Rectangle(
+                top_left=Coordinates(row, column),
+                bottom_right=Coordinates(
+                        _row=row + rows - 1,
+                        _column=column + columns - 1
+                    )
+            ))
 
     @staticmethod
     def _get_next_rectangle(
@@ -266,7 +388,7 @@ class Compositor:
         if len(symbol) != 1:
             raise ValueError("symbol must be one char")
 
-        new_area = copy.deepcopy(component.area)
+        new_area = component.area.snapshot()
         new_area.area_ptr.row = 0
         new_area.area_ptr.column = 0
 
@@ -0,0 +1,202 @@
+"""The input tokenizer splits the bytes read from a terminal into events. Reads
+can contain many key presses and mouse reports (fast typing, mouse sweeps) or
+end in the middle of one, so sequences are carried over between reads. Text
+between bracketed paste markers becomes a single paste event."""
+
+from __future__ import annotations
+
+import codecs
+import re
+from typing import Optional
+
+from tui._coordinates import Coordinates
+from tui.events.event import Event
+from tui.events.key_event import HotkeyEvent
+from tui.events.keys import ANSI_SEQUENCES_KEYS
+from tui.events.mouse import MouseEventTypes, xterm_code_map
+from tui.events.mouse_event import MouseEvent
+from tui.events.paste_event import PasteEvent
+
+# \x1b[<0;99;20M - event type, column, row and press or release
+SGR_MOUSE = re.compile(r"\x1b\[<(\d+);(\d+);(\d+)([mM])")
+# a complete control sequence - parameters, intermediates and a final byte
+CONTROL_SEQUENCE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+# the start of a control sequence which was cut off at the end of a read
+PARTIAL_CONTROL_SEQUENCE = re.compile(r"\x1b\[[0-?]*[ -/]*\Z")
+# bracketed paste mode wraps pasted text in these sequences
+PASTE_START = "\x1b[200~"
+PASTE_END = "\x1b[201~"
+
+# the escape sequences of keys and every sequence which starts one of them
+KEY_SEQUENCES = {sequence: keys for sequence, keys
+                 in ANSI_SEQUENCES_KEYS.items() if sequence[0] == "\x1b"}
+KEY_PREFIXES = frozenset(sequence[:end] for sequence in KEY_SEQUENCES
+                         for end in range(1, len(sequence)))
+LONGEST_KEY_SEQUENCE = max(map(len, KEY_SEQUENCES))
+
+
+class InputTokenizer:
+    """Turns a stream of input bytes into key and mouse events"""
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(
+                errors="replace"
+            )
+        # the start of a sequence which wasn't read entirely
+        self._partial = ""
+        # the text of a paste whose end wasn't read yet. It's kept in the
+        # chunks it was read in, so a long paste isn't joined and searched
+        # again on every read.
+        self._pasted: Optional[list[str]] = None
+
+    @property
+    def pending(self) -> bool:
+        """Is the start of a sequence held back? A lone escape is held back
+        too, it's only known to be the escape key once nothing follows it.
+        An unfinished paste isn't pending, it's held back until it ends
+        however long that takes."""
+        return bool(self._partial)
+
+    def feed(self, data: bytes) -> list[Event]:
+        """Return the events of every complete key press and mouse report.
+        An incomplete sequence at the end is kept for the next feed."""
+        text = self._decoder.decode(data)
+        if self._pasted is not None:
+            return self._continue_paste(self._pasted, text)
+
+        text = self._partial + text
+        self._partial = ""
+        return self._tokenize(text, final=False)
+
+    def flush(self) -> list[Event]:
+        """Return the events of the held back input, taking it as it is"""
+        events: list[Event] = []
+        if self._pasted is not None:
+            events.append(self._paste_event("".join(self._pasted)))
+            self._pasted = None
+
+        text, self._partial = self._partial, ""
+        return events + self._tokenize(text, final=True)
+
+    def _continue_paste(self, pasted: list[str], text: str) -> list[Event]:
+        """Add text to the chunks of the unfinished paste. Only the new text
+        is searched for the end of the paste, along with the few chars before
+        it which could start the end sequence."""
+        overlap = ""
+        for chunk in reversed(pasted):
+            if len(overlap) >= len(PASTE_END) - 1:
+                break
+            overlap = chunk[-(len(PASTE_END) - 1):] + overlap
+        overlap = overlap[-(len(PASTE_END) - 1):]
+
+        end = (overlap + text).find(PASTE_END)
+        if end == -1:
+            pasted.append(text)
+            return []
+
+        # where the end sequence starts, relative to the start of text (it's
+        # negative when it started in an earlier read)
+        end -= len(overlap)
+        pasted.append(text)
+        joined = "".join(pasted)
+        self._pasted = None
+        events: list[Event] = [self._paste_event(
+                joined[:len(joined) - len(text) + end]
+            )]
+        return events + self._tokenize(text[end + len(PASTE_END):],
+                                       final=False)
+
+    def _tokenize(self, text: str, final: bool) -> list[Event]:
+        """Split text into events. Unless it's final, an incomplete sequence
+        at the end is kept in _partial."""
+        events: list[Event] = []
+        start = 0
+        while True:
+            escape = text.find("\x1b", start)
+            end = len(text) if escape == -1 else escape
+            # each char which isn't part of a sequence is a key press
+            events.extend(HotkeyEvent(char) for char in text[start:end])
+            if escape == -1:
+                return events
+
+            start = self._sequence(text, escape, events, final)
+            if start == -1:
+                if text.startswith(PASTE_START, escape):
+                    self._pasted = [text[escape + len(PASTE_START):]]
+                else:
+                    self._partial = text[escape:]
+                return events
+
+    @staticmethod
+    def _sequence(text: str, start: int, events: list[Event],
+                  final: bool) -> int:
+        """Add the event of the sequence at start to events and return where
+        the sequence ends. -1 is returned when more input could still change
+        which sequence it is."""
+        if text.startswith(PASTE_START, start):
+            return InputTokenizer._paste(text, start, events, final)
+
+        mouse = SGR_MOUSE.match(text, start)
+        if mouse is not None:
+            events.append(InputTokenizer._mouse_event(*mouse.groups()))
+            return mouse.end()
+
+        if not final and (
+                (len(text) - start < LONGEST_KEY_SEQUENCE
+                 and text[start:] in KEY_PREFIXES)
+                or PARTIAL_CONTROL_SEQUENCE.match(text, start)):
+            return -1
+
+        # the longest key sequence which matches
+        key_end = 0
+        end = start + 1
+        while end <= len(text):
+            if text[start:end] in KEY_SEQUENCES:
+                key_end = end
+            if text[start:end] not in KEY_PREFIXES:
+                break
+            end += 1
+
+        sequence = CONTROL_SEQUENCE.match(text, start)
+        if sequence is not None and sequence.end() > key_end:
+            # a control sequence which isn't a known key
+            events.append(MouseEvent(
+                    coordinates=Coordinates(_row=-1, _column=-1),
+                    event_type=MouseEventTypes.MOUSE_UNKNOWN
+                ))
+            return sequence.end()
+
+        events.append(HotkeyEvent(KEY_SEQUENCES[text[start:key_end]]))
+        return key_end
+
+    @staticmethod
+    def _paste(text: str, start: int, events: list[Event],
+               final: bool) -> int:
+        """Add the event of the paste at start to events and return where it
+        ends, or -1 when its end wasn't read yet"""
+        end = text.find(PASTE_END, start + len(PASTE_START))
+        if end == -1:
+            if not final:
+                return -1
+            end = len(text)
+
+        events.append(InputTokenizer._paste_event(
+                text[start + len(PASTE_START):end]
+            ))
+        return min(end + len(PASTE_END), len(text))
+
+    @staticmethod
+    def _paste_event(pasted: str) -> PasteEvent:
+        """Create the event of pasted text"""
+        # terminals send newlines as carriage returns, like the enter key
+        return PasteEvent(pasted.replace("\r\n", "\n").replace("\r", "\n"))
+
+    @staticmethod
+    def _mouse_event(_type: str, column: str, row: str,
+                     _release: str) -> MouseEvent:
+        """Create the event of an SGR mouse report"""
+        return MouseEvent(
+                coordinates=Coordinates(_row=int(row), _column=int(column)),
+                event_type=xterm_code_map.get(_type,
+                                              MouseEventTypes.MOUSE_UNKNOWN)
+            )
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from abc import ABC
 from enum import Enum
-from typing import FrozenSet
+from functools import cache
+from typing import FrozenSet, Optional
 
 
 class Modifiers(str, Enum):
@@ -14,6 +15,7 @@ class Modifiers(str, Enum):
     ALT = "alt"
 
     @staticmethod
+    @cache
     def contains(item: str) -> bool:
         """Does a string exist as a Modifier value?"""
         try:
@@ -28,3 +30,6 @@ class Event(ABC):
     """Base event class. All event classes should inherit from it."""
     def __init__(self, modifiers: FrozenSet[Modifiers]):
         self.modifiers: FrozenSet[Modifiers] = modifiers
+        # when the input the event was parsed from was read (perf_counter),
+        # None for events which weren't read from the terminal
+        self.read_at: Optional[float] = None
@@ -3,7 +3,8 @@ and the 'consumer' listeners. It handles subscribing listeners to events and
 calling them on event trigger."""
 
 
-from typing import Optional
+from typing import Any, Optional
+from tui._session_state import current_state
 from tui.component import Component
 from tui.components.division import Division
 from tui.events.event import Event
@@ -14,14 +15,28 @@ from tui.events.mouse import MouseEventTypes
 from tui.events.mouse_event import MouseEvent
 
 
+class _SessionAttribute:
+    """A class attribute which is looked up in the state of the session the
+    caller runs in, so every session has its own value"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name  # the attribute of the session state
+
+    def __get__(self, instance: object, owner: Optional[type] = None) -> Any:
+        return getattr(current_state(), self.name)
+
+
 class EventBroker:
     """Responsible for managing event subscription and event callbacks"""
 
     # a 'subscriber' with id == -1 is used to signify a global event
     __global_component = Division(identifier='-1')
 
-    listeners: dict[Event, list[EventListener]] = {}
-    subscribers: dict[Component, list[EventListener]] = {}
+    # the listeners of each event (dict[Event, list[EventListener]]) and of
+    # each component (dict[Component, list[EventListener]]) in the current
+    # session
+    listeners = _SessionAttribute("listeners")
+    subscribers = _SessionAttribute("subscribers")
 
     @staticmethod
     def subscribe(
@@ -0,0 +1,21 @@
+"""The Paste Event reports text pasted into the terminal. Terminals which
+support bracketed paste mode send the whole paste at once, so it's handled
+as a single event instead of a key press for every char."""
+
+from __future__ import annotations
+
+from tui.events.event import Event
+
+
+class PasteEvent(Event):
+    """The PasteEvent is triggered when text is pasted. Every paste event is
+    equal to the others, so listeners subscribed to one receive them all."""
+    def __init__(self, text: str) -> None:
+        self.text = text
+        super().__init__(frozenset())
+
+    def __eq__(self, __o: object) -> bool:
+        return isinstance(__o, PasteEvent)
+
+    def __hash__(self) -> int:
+        return hash(PasteEvent)
@@ -0,0 +1,74 @@
+"""
+Background work runs on thread or process pools, so a slow callback doesn't
+stall rendering. The results are handed back to the UI thread through the
+app's event queue and the statistics below describe the work.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import threading
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from tui.events.event import Event
+from tui.latency import LatencyHistogram
+
+
+@dataclass
+class ExecutorStats:
+    """Counters describing the work ran in executors"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    # functions which didn't start before the app stopped
+    cancelled: int = 0
+    # how long the functions ran, not counting the time they waited for a
+    # worker
+    duration: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # the executors' threads count the functions which end
+    _lock: threading.Lock = field(default_factory=threading.Lock,
+                                  repr=False, compare=False)
+
+    @property
+    def pending(self) -> int:
+        """How many submitted functions are waiting or running"""
+        return self.submitted - self.completed - self.failed - self.cancelled
+
+    def count_finished(
+            self,
+            error: Optional[BaseException],
+            duration: float
+    ) -> None:
+        """Count a function which returned or raised error"""
+        with self._lock:
+            if error is None:
+                self.completed += 1
+                self.duration.record(duration)
+            else:
+                self.failed += 1
+
+    def count_cancelled(self) -> None:
+        """Count a function which was cancelled before it started"""
+        with self._lock:
+            self.cancelled += 1
+
+
+class TaskDoneEvent(Event):
+    """Posted to the event queue when background work is done. Its callback
+    is called on the UI thread before the next frame is composed."""
+    def __init__(self, callback: Callable[[], Any]) -> None:
+        self.callback = callback
+        super().__init__(frozenset())
+
+
+def timed_call(
+        function: Callable[..., Any],
+        args: tuple,
+        kwargs: dict[str, Any]
+) -> tuple[Any, float]:
+    """Call a function and return its result along with how long it ran. It's
+    a module level function, so process pools can pickle it."""
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    return result, perf_counter() - start
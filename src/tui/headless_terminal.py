@@ -0,0 +1,106 @@
+"""
+The headless terminal is a terminal backend which doesn't need a tty. The
+bytes it receives are kept in memory and decoded into a virtual screen, so
+apps can be tested and benchmarked end to end, e.g. on servers and in CI.
+"""
+
+from __future__ import annotations
+
+from os import close, pipe, read, terminal_size, write
+
+from tui._cell_style import CellStyle
+from tui._virtual_screen import VirtualScreen
+from tui.terminal import BaseTerminal
+
+
+class HeadlessTerminal(BaseTerminal):
+    """An in-memory terminal. Frames are decoded into a virtual screen and
+    input is whatever is sent with send_input."""
+
+    def __init__(
+            self,
+            rows: int = 24,
+            columns: int = 80,
+            # wrap every frame in the synchronized update mode
+            synchronized_output: bool = True,
+            # scroll rows which moved vertically instead of redrawing them
+            scroll_regions: bool = True,
+            # collapse runs of the same char with the REP sequence
+            repeat_chars: bool = True,
+            # keep every written byte in output. Long benchmarks may not want
+            # to
+            keep_output: bool = True
+    ) -> None:
+        super().__init__(
+                size=terminal_size((columns, rows)),
+                synchronized_output=synchronized_output,
+                scroll_regions=scroll_regions,
+                repeat_chars=repeat_chars
+            )
+        self.keep_output = keep_output
+        self.output = bytearray()  # the byte stream written to the terminal
+        self.screen = VirtualScreen(rows=rows, columns=columns)
+        # set to act like a terminal still draining earlier output, so the
+        # frames printed without waiting are dropped
+        self.draining = False
+        # input is sent through a pipe, so it can be waited for like the
+        # input of a tty. Its ends are closed by restore
+        self.input_fd, self._input_writer = pipe()
+        self._open_fds = [self.input_fd, self._input_writer]
+
+    def resize(self, rows: int, columns: int) -> None:
+        """Resize the terminal, the way a user resizes a window"""
+        self._size = terminal_size((columns, rows))
+        self.screen.resize(rows=rows, columns=columns)
+
+    def update_size(self) -> None:
+        """The size is changed with resize. The next frame is still painted
+        entirely, as it would be on a real terminal."""
+        self._repaint = True
+
+    def output_pending(self) -> bool:
+        """The virtual screen is updated as soon as bytes are written, so
+        output is only pending while draining is set"""
+        return self.draining
+
+    def write_bytes(self, data: bytes) -> None:
+        """Decode bytes into the virtual screen"""
+        if self.keep_output:
+            self.output += data
+        self.screen.feed(data)
+
+    def send_input(self, data: bytes) -> None:
+        """Make bytes available to read_bytes, as if they were typed"""
+        write(self._input_writer, data)
+
+    def close_input(self) -> None:
+        """Close the input, as if the user hung up. Reading returns no bytes
+        once the sent input was read."""
+        self._close(self._input_writer)
+
+    def read_bytes(self, _bytes: int = 16) -> bytes:
+        """Read input sent with send_input, waiting until there is some"""
+        return read(self.input_fd, _bytes)
+
+    def restore(self) -> None:
+        """Close the input pipe, the terminal's settings are never changed.
+        The app restores its terminal when it stops, so a headless terminal
+        can't be run again."""
+        for fd in list(self._open_fds):
+            self._close(fd)
+
+    def _close(self, fd: int) -> None:
+        """Close an end of the input pipe unless it's closed already"""
+        if fd in self._open_fds:
+            self._open_fds.remove(fd)
+            close(fd)
+
+    @property
+    def cells(self) -> list[list[str]]:
+        """Get the chars currently displayed on the virtual screen"""
+        return self.screen.cells
+
+    @property
+    def styles(self) -> list[list[CellStyle]]:
+        """Get the styles of the cells on the virtual screen"""
+        return self.screen.styles
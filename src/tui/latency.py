@@ -0,0 +1,60 @@
+"""
+Latency histograms count durations in buckets which double in width, so
+recording is cheap and a few buckets cover everything from tens of
+microseconds to seconds.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+# upper bounds of the buckets in seconds, 64 µs to about 1 s. Longer
+# durations are counted in an extra bucket
+BUCKET_BOUNDS = tuple(2 ** exponent / 1_000_000 for exponent in range(6, 21))
+
+
+class LatencyHistogram:
+    """Counts durations in buckets and keeps their mean and maximum"""
+
+    def __init__(self, bounds: tuple[float, ...] = BUCKET_BOUNDS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0  # the sum of the durations, in seconds
+        self.max = 0.0
+
+    def record(self, latency: float) -> None:
+        """Count a duration, given in seconds"""
+        self.counts[bisect_left(self.bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    @property
+    def mean(self) -> float:
+        """Get the mean duration in seconds"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Get an upper bound of the given percentile (0 - 100) in seconds -
+        the bound of the bucket it falls in, or the maximum when it's lower"""
+        needed = self.count * percentile / 100
+        counted = 0
+        for bound, count in zip(self.bounds, self.counts):
+            counted += count
+            if counted >= needed and counted:
+                return min(bound, self.max)
+
+        return self.max
+
+    def __str__(self) -> str:
+        lines = []
+        for index, count in enumerate(self.counts):
+            if index < len(self.bounds):
+                label = f"<= {self.bounds[index] * 1000:8.3f} ms"
+            else:
+                label = f" > {self.bounds[-1] * 1000:8.3f} ms"
+
+            lines.append(f"{label} {count:8}")
+
+        return "\n".join(lines)
@@ -0,0 +1,114 @@
+"""
+The frame profiler records how long each phase of a frame took, from
+handling the events which arrived before it to writing it to the terminal.
+The timings of the latest frames are kept in a fixed-size ring buffer, so
+profiling costs the same however long the app runs.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterator
+
+# the phases of a frame, in the order they happen
+QUEUE = "queue"  # taking events from the event queue
+EVENTS = "events"  # finding the listeners of events (EventBroker.handle)
+TIMERS = "timers"  # running timer callbacks
+PRE_COMPOSITION = "pre_composition"  # pre-composition callbacks
+COMPOSE = "compose"  # Compositor.compose
+POST_COMPOSITION = "post_composition"  # post-composition callbacks
+CURSOR = "cursor"  # drawing the mouse cursor
+DIFF = "diff"  # diffing the frame against the previous one
+WRITE = "write"  # writing the frame to the terminal
+PHASES = (QUEUE, EVENTS, TIMERS, PRE_COMPOSITION, COMPOSE, POST_COMPOSITION,
+          CURSOR, DIFF, WRITE)
+
+
+@dataclass
+class PhaseStats:
+    """Percentiles of how long a phase took, in seconds"""
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+
+
+@dataclass
+class ProfileStats:
+    """A summary of the frames in the profiler's ring buffer"""
+    frames: int  # frames in the summary
+    over_budget: int  # frames which took longer than the frame budget
+    phases: dict[str, PhaseStats]
+    total: PhaseStats  # all phases of a frame together
+
+
+class FrameProfiler:
+    """Records the time spent in each phase of the latest frames"""
+
+    def __init__(self, size: int = 600) -> None:
+        self.size = size  # how many frames are kept
+        # a column of timings for each phase, a row for each frame. The
+        # oldest row is overwritten by the next frame
+        self._timings = {phase: [0.0] * size for phase in PHASES}
+        self._next = 0  # the row of the next frame
+        self._frames = 0  # rows filled
+        # the timings of the frame which is being worked on
+        self._current = dict.fromkeys(PHASES, 0.0)
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time spent in a phase to the current frame"""
+        self._current[phase] += seconds
+
+    def elapsed(self, phase: str) -> float:
+        """Get the time spent in a phase during the current frame"""
+        return self._current[phase]
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Add the time the block takes to a phase of the current frame"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._current[phase] += perf_counter() - start
+
+    def end_frame(self) -> None:
+        """Store the timings of the current frame and start the next one"""
+        for phase, seconds in self._current.items():
+            self._timings[phase][self._next] = seconds
+            self._current[phase] = 0.0
+
+        self._next = (self._next + 1) % self.size
+        self._frames = min(self._frames + 1, self.size)
+
+    def stats(self, budget: float) -> ProfileStats:
+        """Summarize the stored frames. Frames which took longer than budget
+        seconds are counted as over budget."""
+        columns = {phase: timings[:self._frames]
+                   for phase, timings in self._timings.items()}
+        totals = [sum(frame) for frame in zip(*columns.values())]
+
+        return ProfileStats(
+                frames=self._frames,
+                over_budget=sum(total > budget for total in totals),
+                phases={phase: self._percentiles(timings)
+                        for phase, timings in columns.items()},
+                total=self._percentiles(totals)
+            )
+
+    @staticmethod
+    def _percentiles(timings: list[float]) -> PhaseStats:
+        """Get the percentiles of timings"""
+        if not timings:
+            return PhaseStats()
+
+        ordered = sorted(timings)
+        last = len(ordered) - 1
+        return PhaseStats(
+                p50=ordered[round(last * 0.50)],
+                p95=ordered[round(last * 0.95)],
+                p99=ordered[round(last * 0.99)],
+                max=ordered[last]
+            )
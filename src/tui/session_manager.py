@@ -0,0 +1,124 @@
+"""
+The session manager serves an app to many terminals from one process, e.g. a
+pty or a socket for every operator. Each session's app is built and ran in a
+context of its own, so its components, event listeners and component ids
+aren't shared with the other sessions. Every session runs on one asyncio
+event loop, which waits for the input of all terminals with a single
+selector and schedules their frames and timers. Output is written without
+blocking the loop, frames are dropped for a client which doesn't keep up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextvars import Context
+from typing import Callable, Optional
+
+from tui._session_state import enter_new_state
+from tui.app import App
+from tui.terminal import BaseTerminal
+
+
+class Session:
+    """A terminal and the app served to it"""
+
+    def __init__(self, terminal: BaseTerminal, app: App,
+                 context: Context) -> None:
+        self.terminal = terminal
+        self.app = app
+        # the context the app was built in and runs in
+        self.context = context
+        self.task: Optional[asyncio.Task] = None
+        # the exception which ended the session, if any
+        self.error: Optional[BaseException] = None
+
+    def stop(self) -> None:
+        """End the session, restoring its terminal"""
+        self.app.stop()
+
+
+class SessionManager:
+    """Runs an app for each terminal added to it on one event loop"""
+
+    def __init__(
+            self,
+            # builds the app of a session. It's called in the session's
+            # context, so the components it creates belong to the session
+            app_factory: Callable[[BaseTerminal], App]
+    ) -> None:
+        self.app_factory = app_factory
+        self.sessions: list[Session] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Future] = None
+
+    def add(self, terminal: BaseTerminal) -> Session:
+        """Build an app for a terminal and run it. Sessions added before
+        serve is called are started by it. Call it from the thread serve
+        runs on."""
+        context = Context()
+        app = context.run(self._create_app, terminal)
+        session = Session(terminal, app, context)
+        self.sessions.append(session)
+        if self._loop is not None:
+            self._start(session)
+
+        return session
+
+    async def serve(self) -> None:
+        """Run the sessions until stop is called, then stop every session
+        which is still running"""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = self._loop.create_future()
+        for session in self.sessions:
+            if session.task is None:
+                self._start(session)
+
+        try:
+            await self._stopped
+        finally:
+            tasks = [session.task for session in self.sessions
+                     if session.task is not None]
+            for session in self.sessions:
+                session.stop()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._loop = None
+            self._stopped = None
+
+    def stop(self) -> None:
+        """Let serve return. Can be called from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._set_stopped)
+
+    def _set_stopped(self) -> None:
+        """Let serve return"""
+        if self._stopped is not None and not self._stopped.done():
+            self._stopped.set_result(None)
+
+    def _create_app(self, terminal: BaseTerminal) -> App:
+        """Give the session's context its own state and build the app"""
+        enter_new_state()
+        return self.app_factory(terminal)
+
+    def _start(self, session: Session) -> None:
+        """Run a session's app as a task in the session's context"""
+        loop = asyncio.get_running_loop()
+        # a client which stops reading mustn't block the other sessions
+        session.terminal.write_on_loop(loop)
+        # the task copies the context it's created in, and create_task only
+        # takes the context as an argument since Python 3.11. The process'
+        # own terminal isn't resized with the sessions'
+        session.task = session.context.run(
+                loop.create_task,
+                session.app.run_async(resize_signal=False)
+            )
+        session.task.add_done_callback(
+                lambda task: self._session_done(session, task)
+            )
+
+    def _session_done(self, session: Session, task: asyncio.Task) -> None:
+        """Forget a session whose app stopped. An exception which ended it
+        is kept in the session instead of stopping the other sessions."""
+        if session in self.sessions:
+            self.sessions.remove(session)
+        if not task.cancelled():
+            session.error = task.exception()
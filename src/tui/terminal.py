@@ -3,79 +3,788 @@ This file makes the connection between the application and the terminal it's
 being ran it.
 """
 
-from os import get_terminal_size, terminal_size, system, read
-from sys import stdin
+from abc import ABC, abstractmethod
+import asyncio
+from dataclasses import dataclass
+from fcntl import ioctl
+from functools import cache
+from os import (environ, get_terminal_size, get_blocking, set_blocking,
+                terminal_size, read, write)
+from select import select
+from struct import unpack
+from time import perf_counter
+from sys import stdin, stdout
+import termios
 from typing import Optional, TextIO
 
+try:
+    import curses
+except ImportError:  # Python can be built without curses
+    curses = None
+
+from tui._cell_style import CellStyle, DEFAULT_CELL_STYLE
+from tui._coordinates import Rectangle
+from tui._terminfo import REPEAT_CHAR, has_string
 from tui.area import Area
 
+# DEC synchronized update mode. The terminal holds off rendering while the
+# mode is set, so a frame is never displayed half drawn. Terminals that don't
+# support the mode ignore it.
+SYNC_BEGIN = b"\x1b[?2026h"
+SYNC_END = b"\x1b[?2026l"
 
-class Terminal:
-    """Responsible for providing an interface to the terminal the program is
-    being ran in"""
+# mouse reporting - clicks (1000), motion (1003) in the SGR (1006) and urxvt
+# (1015) formats
+MOUSE_ENABLE = b"\x1b[?1000;1003;1006;1015h"
+MOUSE_DISABLE = b"\x1b[?1000;1003;1006;1015l"
 
-    def __init__(self, input_stream: TextIO = stdin) -> None:
-        self.__size: terminal_size = get_terminal_size()  # columns and rows
-        self.input_stream = input_stream
-        self.input_fd = input_stream.fileno()  # save fd in case it's lost
+# bracketed paste mode - pasted text is wrapped in \x1b[200~ and \x1b[201~, so
+# it's told apart from typing
+BRACKETED_PASTE_ENABLE = b"\x1b[?2004h"
+BRACKETED_PASTE_DISABLE = b"\x1b[?2004l"
 
-        self.__mouse_input = False
-        self.__input = False
+# the alternate screen buffer keeps the shell's screen intact and is restored
+# when the app exits
+ALTERNATE_SCREEN_ENABLE = b"\x1b[?1049h"
+ALTERNATE_SCREEN_DISABLE = b"\x1b[?1049l"
 
-        self._prev_state: Optional[Area] = None
+# Not every platform can report the amount of bytes waiting in the tty output
+# queue
+TIOCOUTQ: Optional[int] = getattr(termios, "TIOCOUTQ", None)
 
-        self.enable_input()
-        self.enable_mouse()
 
-    def print(self, area: Area) -> None:
+def merge_damage(
+        first: Optional[list[Rectangle]],
+        second: Optional[list[Rectangle]]
+) -> Optional[list[Rectangle]]:
+    """Combine the damage of two frames. None stands for the entire area."""
+    if first is None or second is None:
+        return None
+
+    return first + second
+
+
+def supports_repeat(fd: int, term: Optional[str] = None) -> bool:
+    """Does the terminal type term (the process' $TERM when not given)
+    support repeating the previous char (REP) according to the terminfo
+    database? curses looks the first terminal type up, as it's set up for
+    a single one per process. The entries of other types are read
+    directly. No process is spawned either way."""
+    if term is None:
+        term = environ.get("TERM", "")
+
+    if curses is not None and not _curses_set_up():
+        try:
+            curses.setupterm(term, fd)
+            return curses.tigetstr("rep") is not None
+        except curses.error:
+            return False
+
+    return has_string(term, REPEAT_CHAR)
+
+
+def _curses_set_up() -> bool:
+    """Was curses set up for a terminal type already? Setting it up again
+    keeps the first type."""
+    try:
+        curses.tigetstr("rep")
+    except curses.error:
+        return False
+    return True
+
+
+@dataclass
+class FrameStats:
+    """Counters describing the frames a terminal has received"""
+    written: int = 0  # frames which were printed
+    dropped: int = 0  # frames skipped while the terminal was busy
+    bytes_written: int = 0
+    # bytes the cursor movement optimizer saved, compared to moving the
+    # cursor with absolute coordinates
+    cursor_bytes_saved: int = 0  # in the last frame
+    total_cursor_bytes_saved: int = 0
+    # bytes saved by repeating chars (REP) instead of writing each of them
+    run_bytes_saved: int = 0  # in the last frame
+    total_run_bytes_saved: int = 0
+    frame_bytes: int = 0  # bytes of the last frame
+    # how long diffing and writing the last frame took, in seconds
+    diff_seconds: float = 0.0
+    write_seconds: float = 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """How many times larger the last frame would be without repeated
+        chars"""
+        if self.frame_bytes == 0:
+            return 1.0
+
+        return (self.frame_bytes + self.run_bytes_saved) / self.frame_bytes
+
+
+class BaseTerminal(ABC):
+    """Turns areas into the bytes which draw them on a terminal, sending only
+    what changed since the previous frame. Backends decide where the bytes
+    are written and where input is read from. They should have an input_fd
+    attribute, the fd which becomes readable when there's input."""
+
+    def __init__(
+            self,
+            size: terminal_size,  # columns and rows
+            # wrap every frame in the synchronized update mode
+            synchronized_output: bool = True,
+            # scroll rows which moved vertically instead of redrawing them
+            scroll_regions: bool = True,
+            # collapse runs of the same char with the REP sequence
+            repeat_chars: bool = False
+    ) -> None:
+        self._size = size
+        self.synchronized_output = synchronized_output
+        self.scroll_regions = scroll_regions
+        self.repeat_chars = repeat_chars
+        self.stats = FrameStats()
+
+        # the previous frame is remembered row by row. Each row is kept as a
+        # joined string, so identical rows can be skipped with a single string
+        # comparison, and as lists of cells and cell styles, so changed rows
+        # can be scanned
+        self._prev_rows: Optional[list[str]] = None
+        self._prev_cells: list[list[str]] = []
+        self._prev_styles: list[list[CellStyle]] = []
+        # 1-based (row, column) of the terminal's cursor, None when unknown
+        self._cursor: Optional[tuple[int, int]] = None
+        # the colours the terminal currently draws with
+        self._sgr: CellStyle = DEFAULT_CELL_STYLE
+        # damage of the frames which were dropped since the last printed one
+        self._dropped_damage: Optional[list[Rectangle]] = []
+        # the screen's content is unknown (after a resize), so the next frame
+        # is painted entirely
+        self._repaint = False
+
+    def print(
+            self,
+            area: Area,
+            # the rectangles of the area which could have changed. When not
+            # given, the entire area is compared to the previous frame
+            damage: Optional[list[Rectangle]] = None,
+            # block until the terminal accepts the frame instead of dropping
+            wait: bool = False
+    ) -> bool:
         """Print a string to the terminal. Overwrites content in the terminal
-        for higher response time and no stuttering."""
-        # handle first print
-        if self._prev_state is None:
-            print("\x1b[2J\x1b[H", end="")
-            print(str(area), end="", flush=True)
-            self._prev_state = area
+        for higher response time and no stuttering.
+
+        Unless told to wait, the frame is dropped and False is returned while
+        the terminal is still draining earlier output. The next frame that is
+        printed is diffed against the last frame that was written, so it also
+        carries every change of the dropped frames."""
+        # handle first print and repaints
+        if (self._prev_rows is None or self._repaint
+                or len(self._prev_rows) != area.rows
+                or len(self._prev_cells[0]) != area.columns):
+            self._repaint = False
+            # clear the screen and diff against it
+            self._prev_cells = [[" "] * len(row) for row in area.char_area]
+            self._prev_styles = [[DEFAULT_CELL_STYLE] * len(row)
+                                 for row in area.style_area]
+            self._prev_rows = ["".join(row) for row in self._prev_cells]
+            self._cursor = (1, 1)
+            self._sgr = DEFAULT_CELL_STYLE
+            self._dropped_damage = []
+            self._diff_and_write(area, prefix=b"\x1b[0m\x1b[2J\x1b[H")
+            return True
+
+        damage = merge_damage(self._dropped_damage, damage)
+        if not wait and self.output_pending():
+            self.stats.dropped += 1
+            self._dropped_damage = damage
+            return False
+
+        self._dropped_damage = []
+        self._diff_and_write(area, damage)
+        return True
+
+    def _diff_and_write(
+            self,
+            area: Area,
+            damage: Optional[list[Rectangle]] = None,
+            prefix: bytes = b""  # written before the changes
+    ) -> None:
+        """Diff an area against the previous frame and write the changes,
+        timing both"""
+        start = perf_counter()
+        frame = prefix + self._mutate_on_diff(area, damage)
+        diffed = perf_counter()
+        self._write_frame(frame)
+        self.stats.diff_seconds = diffed - start
+        self.stats.write_seconds = perf_counter() - diffed
+
+    @abstractmethod
+    def update_size(self) -> None:
+        """Read the terminal's size again after it was resized. Terminals
+        reflow their content on resize, so the next frame should be painted
+        entirely."""
+
+    @abstractmethod
+    def output_pending(self) -> bool:
+        """Is the terminal still draining previously written output?"""
+
+    @abstractmethod
+    def write_bytes(self, data: bytes) -> None:
+        """Write bytes to the terminal"""
+
+    def write_on_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Write without blocking the event loop the terminal's app runs on,
+        e.g. when it's shared with other sessions. Terminals which never
+        block on writes ignore it."""
+
+    @abstractmethod
+    def read_bytes(self, _bytes: int = 16) -> bytes:
+        """Read input from the terminal, waiting until there is some"""
 
+    @abstractmethod
+    def restore(self) -> None:
+        """Undo every change made to the terminal's settings and modes"""
+
+    def _write_frame(self, frame: bytes) -> None:
+        """Write a frame, wrapping it in the synchronized update mode"""
+        self.stats.written += 1
+        self.stats.frame_bytes = len(frame)
+        if not frame:
             return
 
-        print(self._mutate_on_diff(self._prev_state, area),
-              end="",
-              flush=True)
-        self._prev_state = area
+        if self.synchronized_output:
+            frame = SYNC_BEGIN + frame + SYNC_END
+
+        self._write(frame)
+
+    def _write(self, data: bytes) -> None:
+        """Write bytes to the terminal and count them"""
+        self.stats.bytes_written += len(data)
+        self.write_bytes(data)
+
+    def _mutate_on_diff(
+            self,
+            area: Area,
+            damage: Optional[list[Rectangle]] = None
+    ) -> bytes:
+        """Find the difference between the previous frame and an area and
+        return bytes which describe how the terminal should change to
+        display the area. Assume that both have the same dimensions.
+
+        Rows are compared as joined strings first, so unchanged rows are
+        skipped without looking at their cells. Only the span between the
+        first and last differing column of a changed row is scanned. When
+        damaged rectangles are given, only the rows they span are checked
+        for vertical shifts and only they are compared."""
+        mutate: list[bytes] = []
+        self.stats.cursor_bytes_saved = 0
+        self.stats.run_bytes_saved = 0
+
+        if damage is None:
+            spans = [(0, len(area.char_area) - 1, None)]
+        else:
+            spans = [(rect.top_left.row, rect.bottom_right.row, rect)
+                     for rect in damage]
+
+        for top, bottom, rect in spans:
+            rows = ["".join(area.char_area[line_count])
+                    for line_count in range(top, bottom + 1)]
+
+            # scrolling moves entire rows, so the rows have to be compared
+            # entirely afterwards
+            if self.scroll_regions and self._scroll(mutate, rows, top):
+                rect = None
+
+            if rect is None:
+                self._diff_rows(mutate, area, rows, top)
+            else:
+                self._diff_rect(mutate, area, rect)
+
+        return b"".join(mutate)
+
+    def _diff_rows(
+            self,
+            mutate: list[bytes],  # output segments of the frame
+            area: Area,
+            rows: list[str],  # joined rows of the area, starting from top
+            top: int
+    ) -> None:
+        """Append the segments which change entire rows of the previous frame
+        to the ones of the area"""
+        prev_rows = self._prev_rows
+
+        for line_count, row2 in enumerate(rows, start=top):
+            styles2 = area.style_area[line_count]
+            if (row2 == prev_rows[line_count]
+                    and styles2 == self._prev_styles[line_count]):
+                continue
+
+            line2 = area.char_area[line_count]
+            self._diff_row(mutate, line_count, line2, styles2,
+                           *self._diff_span(line_count, line2, styles2))
+
+            prev_rows[line_count] = row2
+            self._prev_cells[line_count] = list(line2)
+            self._prev_styles[line_count] = list(styles2)
+
+    def _diff_rect(
+            self,
+            mutate: list[bytes],  # output segments of the frame
+            area: Area,
+            rect: Rectangle
+    ) -> None:
+        """Append the segments which change a rectangle of the previous frame
+        to the one of the area"""
+        first = rect.top_left.column
+        last = rect.bottom_right.column + 1
+
+        for line_count in range(rect.top_left.row, rect.bottom_right.row + 1):
+            line1 = self._prev_cells[line_count]
+            line2 = area.char_area[line_count]
+            styles1 = self._prev_styles[line_count]
+            styles2 = area.style_area[line_count]
+            if (line1[first:last] == line2[first:last]
+                    and styles1[first:last] == styles2[first:last]):
+                continue
+
+            self._diff_row(mutate, line_count, line2, styles2,
+                           *self._diff_span(line_count, line2, styles2,
+                                            first, last - 1))
+            line1[first:last] = line2[first:last]
+            styles1[first:last] = styles2[first:last]
+            self._prev_rows[line_count] = "".join(line1)
 
-    def _mutate_on_diff(self, area1: Area, area2: Area) -> str:
-        """Find the difference between 2 strings and return a string which
-        describes how the first one should change to become the second. Assume
-        that both strings have the same dimensions. Expected strings are
-        unnecessarily bloated for this sole reason (a lot of whitespaces can be
-        followed by '\n') """
-        mutate_str = ""
+    def _scroll(
+            self,
+            mutate: list[bytes],  # output segments of the frame
+            rows: list[str],  # joined rows of the new frame, starting from top
+            top: int
+    ) -> bool:
+        """Detect if the changed rows are the rows of the previous frame
+        shifted vertically. If they are, limit scrolling to them (DECSTBM),
+        scroll them (SU/SD) and update the previous frame accordingly, so only
+        the newly exposed rows differ. Return whether scrolling happened."""
+        prev_rows = self._prev_rows
+
+        # narrow down to the rows which changed
+        first = 0
+        last = len(rows) - 1
+        while first <= last and rows[first] == prev_rows[top + first]:
+            first += 1
+        while last > first and rows[last] == prev_rows[top + last]:
+            last -= 1
+
+        new_block = rows[first:last + 1]
+        prev_block = prev_rows[top + first:top + last + 1]
+        block_size = len(new_block)
+
+        # at least 2 rows should be kept for scrolling to pay off
+        for shift in range(1, block_size - 1):
+            if new_block[:-shift] == prev_block[shift:]:
+                direction = "S"  # content moves up
+                break
+            if new_block[shift:] == prev_block[:-shift]:
+                direction = "T"  # content moves down
+                break
+        else:
+            return False
+
+        # exposed rows are filled with the current background colour, so
+        # the colours are reset first. The region is reset right away. Both
+        # set and reset move the cursor to the top left corner
+        mutate.append(
+                CellStyle.transition(self._sgr, DEFAULT_CELL_STYLE)
+                + f"\x1b[{top + first + 1};{top + last + 1}r".encode()
+                + self._relative_move(shift, direction)
+                + b"\x1b[r"
+            )
+        self._sgr = DEFAULT_CELL_STYLE
+        self._cursor = (1, 1)
+
+        start = top + first
+        end = top + last + 1
+        columns = len(self._prev_cells[0])
+        blank_cells = [[" "] * columns for _ in range(shift)]
+        blank_styles = [[DEFAULT_CELL_STYLE] * columns for _ in range(shift)]
+        blank_rows = [" " * columns] * shift
+
+        for prev, blank in ((self._prev_cells, blank_cells),
+                            (self._prev_styles, blank_styles),
+                            (prev_rows, blank_rows)):
+            if direction == "S":
+                prev[start:end] = prev[start + shift:end] + blank
+            else:
+                prev[start:end] = blank + prev[start:end - shift]
+
+        return True
+
+    def _diff_row(
+            self,
+            mutate: list[bytes],  # output segments of the frame
+            line_count: int,
+            line2: list[str],  # new row
+            styles2: list[CellStyle],  # styles of the new row
+            first: int,  # first and last columns which are compared
+            last: int
+    ) -> None:
+        """Append the segments which change a row of the previous frame to
+        the one of the new frame"""
+        transition = CellStyle.transition
+        line1 = self._prev_cells[line_count]
+        styles1 = self._prev_styles[line_count]
 
         # are the char differences consecutive
         streak = False
+        # the char which is being repeated and how many times it was
+        run_char = ""
+        run_length = 0
 
-        for line_count, line1 in enumerate(area1.char_area):
-            for char_count, char1 in enumerate(line1):
-                char2 = area2.char_area[line_count][char_count]
-                if char1 != char2:
-                    if streak is False:
-                        # move cursor - add +1 because enumeration starts at 0
-                        # and terminal emulators start counting rows and
-                        # columns from 1.
-                        mutate_str += self._move_cursor(row=line_count+1,
-                                                        column=char_count+1)
-                        streak = True
-
-                    mutate_str += char2
+        for char_count in range(first, last + 1):
+            char2 = line2[char_count]
+            style2 = styles2[char_count]
+            if line1[char_count] != char2 or styles1[char_count] is not style2:
+                if streak is False:
+                    # move cursor - add +1 because enumeration starts at 0
+                    # and terminal emulators start counting rows and columns
+                    # from 1.
+                    mutate.append(self._cursor_to(row=line_count+1,
+                                                  column=char_count+1,
+                                                  line=line2,
+                                                  styles=styles2))
+                    streak = True
+
+                if style2 is not self._sgr:
+                    if run_length:
+                        mutate.append(self._encode_run(run_char, run_length))
+                        run_length = 0
+                    mutate.append(transition(self._sgr, style2))
+                    self._sgr = style2
+
+                if char2 == run_char and run_length:
+                    run_length += 1
                 else:
-                    streak = False
+                    if run_length:
+                        mutate.append(self._encode_run(run_char, run_length))
+                    run_char = char2
+                    run_length = 1
+            elif streak:
+                streak = False
+                self._cursor = (line_count + 1, char_count + 1)
+                mutate.append(self._encode_run(run_char, run_length))
+                run_length = 0
+
+        if run_length:
+            mutate.append(self._encode_run(run_char, run_length))
+
+        if streak:
+            # the streak ended with the last compared column. Writing the
+            # last column of the row leaves the cursor in a pending wrap
+            # state, which terminals handle differently
+            self._cursor = (None if last == len(line2) - 1
+                            else (line_count + 1, last + 2))
+
+    def _encode_run(self, glyph: str, length: int) -> bytes:
+        """Return the encoded bytes which write a glyph a number of times. The
+        glyph is repeated with REP when it's supported and shorter."""
+        encoded = self._encode_glyph(glyph)
+        if length == 1:
+            return encoded
+
+        if self.repeat_chars and glyph.isprintable():
+            repeat = self._repeat(length - 1)
+            saved = len(encoded) * (length - 1) - len(repeat)
+            if saved > 0:
+                self.stats.run_bytes_saved += saved
+                self.stats.total_run_bytes_saved += saved
+                return encoded + repeat
+
+        return encoded * length
+
+    def _diff_span(
+            self,
+            line_count: int,
+            line2: list[str],  # new row
+            styles2: list[CellStyle],  # styles of the new row
+            first: int = 0,
+            last: Optional[int] = None
+    ) -> tuple[int, int]:
+        """Return the first and last column in which a row of the previous
+        frame and a new row differ, searching between the first and last
+        columns. The rows are expected to differ in at least one of those
+        columns."""
+        line1 = self._prev_cells[line_count]
+        styles1 = self._prev_styles[line_count]
+        if last is None:
+            last = len(line2) - 1
 
-        return mutate_str
+        while (line1[first] == line2[first]
+               and styles1[first] is styles2[first]):
+            first += 1
 
-    def _move_cursor(self, row: int, column: int) -> str:
-        """Return an ANSI code which moves the string to the specified
+        while line1[last] == line2[last] and styles1[last] is styles2[last]:
+            last -= 1
+
+        return first, last
+
+    def _cursor_to(
+            self,
+            row: int,
+            column: int,
+            line: list[str],  # cells of the row the cursor moves to
+            styles: list[CellStyle]  # styles of those cells
+    ) -> bytes:
+        """Return the cheapest bytes which move the cursor from its current
+        position to row and column. Relative moves, carriage returns, line
+        feeds, rewriting the skipped cells of the row (line) and absolute
+        moves are compared."""
+        best = self._move_cursor(row, column)
+        # bytes saved are measured against "CSI row;column f"
+        baseline = len(best)
+
+        if self._cursor is not None:
+            cursor_row, cursor_column = self._cursor
+
+            if row == cursor_row:
+                vertical = b""
+            elif row < cursor_row:
+                vertical = self._relative_move(cursor_row - row, "A")
+            else:
+                vertical = self._relative_move(row - cursor_row, "B")
+
+            # move vertically, then horizontally from the current column
+            moves = [vertical + self._move_horizontally(cursor_column,
+                                                        column, line, styles)]
+
+            if row != cursor_row or column < cursor_column:
+                # return to the first column first. Line feeds are used
+                # only after a carriage return, so the output processing of
+                # the tty doesn't matter
+                if row > cursor_row and row - cursor_row < len(vertical):
+                    vertical = b"\n" * (row - cursor_row)
+                moves.append(b"\r" + vertical
+                             + self._move_horizontally(1, column, line,
+                                                       styles))
+
+            for move in moves:
+                if len(move) < len(best):
+                    best = move
+
+        self.stats.cursor_bytes_saved += baseline - len(best)
+        self.stats.total_cursor_bytes_saved += baseline - len(best)
+        self._cursor = (row, column)
+        return best
+
+    def _move_horizontally(
+            self,
+            from_column: int,
+            to_column: int,
+            line: list[str],  # cells of the row the cursor moves in
+            styles: list[CellStyle]  # styles of those cells
+    ) -> bytes:
+        """Return the cheapest bytes which move the cursor within a row"""
+        if to_column == from_column:
+            return b""
+
+        if to_column < from_column:
+            return self._relative_move(from_column - to_column, "D")
+
+        move = self._relative_move(to_column - from_column, "C")
+
+        # the skipped cells can be written again instead, as long as they
+        # are plain chars drawn with the current colours
+        if to_column - from_column < len(move):
+            skipped = "".join(line[from_column - 1:to_column - 1])
+            if (len(skipped) == to_column - from_column
+                    and skipped.isprintable()
+                    and all(style is self._sgr for style
+                            in styles[from_column - 1:to_column - 1])):
+                rewrite = skipped.encode()
+                if len(rewrite) < len(move):
+                    return rewrite
+
+        return move
+
+    @staticmethod
+    @cache
+    def _move_cursor(row: int, column: int) -> bytes:
+        """Return an encoded ANSI code which moves the cursor to the specified
         coordinates."""
-        return f"\x1b[{row};{column}f"
+        return f"\x1b[{row};{column}f".encode()
+
+    @staticmethod
+    @cache
+    def _relative_move(amount: int, direction: str) -> bytes:
+        """Return an encoded ANSI code which moves the cursor by an amount of
+        cells in a direction (A - up, B - down, C - forward, D - back)"""
+        if amount == 1:
+            return f"\x1b[{direction}".encode()
+
+        return f"\x1b[{amount}{direction}".encode()
+
+    @staticmethod
+    @cache
+    def _repeat(amount: int) -> bytes:
+        """Return an encoded ANSI code which repeats the previously written
+        char an amount of times (REP)"""
+        return f"\x1b[{amount}b".encode()
+
+    @staticmethod
+    @cache
+    def _encode_glyph(glyph: str) -> bytes:
+        """Return the encoded bytes of a char_area cell. Screens reuse a small
+        set of glyphs, so each one is only encoded once."""
+        return glyph.encode()
+
+    @property
+    def columns(self) -> int:
+        """Return the amount of visible columns in the terminal."""
+        return self._size[0]
+
+    @property
+    def rows(self) -> int:
+        """Return the amount of visible rows in the terminal."""
+        return self._size[1]
+
+
+class Terminal(BaseTerminal):
+    """Responsible for providing an interface to the terminal the program is
+    being ran in"""
+
+    def __init__(
+            self,
+            # files or file descriptors, e.g. of a pty or a socket
+            input_stream: TextIO | int = stdin,
+            output_stream: TextIO | int = stdout,
+            # wrap every frame in the synchronized update mode
+            synchronized_output: bool = True,
+            # scroll rows which moved vertically instead of redrawing them
+            scroll_regions: bool = True,
+            # draw on the alternate screen buffer
+            alternate_screen: bool = True,
+            # collapse runs of the same char with the REP sequence. Detected
+            # from the terminfo database when not given
+            repeat_chars: Optional[bool] = None,
+            # the size when the output can't report it (e.g. a socket),
+            # as (columns, rows)
+            size: tuple[int, int] = (80, 24),
+            # the terminal type, e.g. the one a remote client reports. The
+            # process' $TERM when not given
+            term: Optional[str] = None
+    ) -> None:
+        self.input_stream = input_stream
+        # save fd in case it's lost
+        self.input_fd = (input_stream if isinstance(input_stream, int)
+                         else input_stream.fileno())
+        # frames are written straight to the fd, bypassing TextIOWrapper
+        self.output_stream = output_stream
+        self.output_fd = (output_stream if isinstance(output_stream, int)
+                          else output_stream.fileno())
+        self._fallback_size = terminal_size(size)
+        super().__init__(
+                size=self._read_size(),
+                synchronized_output=synchronized_output,
+                scroll_regions=scroll_regions,
+                repeat_chars=(supports_repeat(self.output_fd, term)
+                              if repeat_chars is None else repeat_chars)
+            )
+
+        self.__mouse_input = False
+        self.__input = False
+        self.__alternate_screen = False
+        # terminal attributes from before input was enabled, None when the
+        # input stream isn't a terminal
+        self.__saved_attributes: Optional[list] = None
+        # the loop the output is flushed on once write_on_loop was called,
+        # and the bytes the output didn't accept yet
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._output_buffer = bytearray()
+        self._output_blocking = True
+
+        # the modes are set with a single write
+        self.enable_input()
+        self._write((ALTERNATE_SCREEN_ENABLE if alternate_screen else b"")
+                    + MOUSE_ENABLE + BRACKETED_PASTE_ENABLE)
+        self.__alternate_screen = alternate_screen
+        self.__mouse_input = True
+
+    def update_size(self) -> None:
+        """Read the terminal's size again after it was resized. Terminals
+        reflow their content on resize, so the next frame is painted
+        entirely."""
+        self._size = self._read_size()
+        self._repaint = True
+
+    def _read_size(self) -> terminal_size:
+        """Get the size of the output terminal, or the fallback size when
+        the output isn't a terminal"""
+        try:
+            return get_terminal_size(self.output_fd)
+        except OSError:
+            return self._fallback_size
+
+    def output_pending(self) -> bool:
+        """Is the terminal still draining previously written output?"""
+        if self._output_buffer:
+            return True
+        if TIOCOUTQ is not None:
+            try:
+                queued = ioctl(self.output_fd, TIOCOUTQ, b"\0\0\0\0")
+                return unpack("i", queued)[0] > 0
+            except OSError:
+                # not a tty (e.g. a pipe)
+                pass
+
+        return not select([], [self.output_fd], [], 0)[1]
+
+    def write_bytes(self, data: bytes) -> None:
+        """Write bytes to the output fd. A frame is usually written with a
+        single system call, but the tty may accept it partially. Once
+        writing on a loop, the bytes which aren't accepted right away are
+        buffered instead of waited for."""
+        if self._loop is not None:
+            self._buffer_output(data, self._loop)
+            return
+
+        view = memoryview(data)
+        while view:
+            view = view[write(self.output_fd, view):]
+
+    def write_on_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Make the output non-blocking. The bytes it doesn't accept right
+        away are buffered and written once the loop finds it writable, and
+        frames are dropped while the buffer isn't empty, so a client which
+        stops reading doesn't stall the other sessions on the loop."""
+        self._output_blocking = get_blocking(self.output_fd)
+        set_blocking(self.output_fd, False)
+        self._loop = loop
+
+    def _buffer_output(self, data: bytes,
+                       loop: asyncio.AbstractEventLoop) -> None:
+        """Write what the output accepts and buffer the rest"""
+        if not self._output_buffer:
+            try:
+                data = data[write(self.output_fd, data):]
+            except BlockingIOError:
+                pass
+            if not data:
+                return
+            loop.add_writer(self.output_fd, self._flush_output, loop)
+
+        self._output_buffer += data
+
+    def _flush_output(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Write the buffered output the output accepts, called by the loop
+        when it's writable"""
+        try:
+            written = write(self.output_fd, self._output_buffer)
+        except BlockingIOError:
+            return
+        except OSError:
+            # the client hung up, its input ends the session
+            written = len(self._output_buffer)
+
+        del self._output_buffer[:written]
+        if not self._output_buffer:
+            loop.remove_writer(self.output_fd)
 
     def read_bytes(self, _bytes: int = 16) -> bytes:
         """Read bytes from the input stream"""
@@ -86,26 +795,74 @@ class Terminal:
         if self.input is False:
             raise ValueError("Input is disabled, cannot enable mouse input")
 
-        print("\x1b[?1000;1003;1006;1015h")
+        self._write(MOUSE_ENABLE)
         self.__mouse_input = True
 
     def disable_mouse(self) -> None:
         """Disable mouse reporting"""
-        print("\x1b[?1000;1003;1006;1015l")
+        self._write(MOUSE_DISABLE)
         self.__mouse_input = False
 
     def enable_input(self) -> None:
-        """Change terminal settings to preferred ones. Call disable input to
-        revert them."""
-        system("stty -icanon")  # Enable shell input
-        system("stty -echo")  # Disable character printing on stdin
+        """Change terminal settings to preferred ones - chars are read as
+        soon as they're typed and aren't echoed. Call disable input to revert
+        them."""
+        try:
+            attributes = termios.tcgetattr(self.input_fd)
+        except termios.error:
+            # not a terminal, there's nothing to change
+            self.__input = True
+            return
+
+        self.__saved_attributes = attributes
+        # copy the control chars as well, they're a nested list
+        attributes = attributes[:6] + [list(attributes[6])]
+        attributes[3] &= ~(termios.ICANON | termios.ECHO)  # local modes
+        attributes[6][termios.VMIN] = 1
+        attributes[6][termios.VTIME] = 0
+        termios.tcsetattr(self.input_fd, termios.TCSAFLUSH, attributes)
         self.__input = True
 
     def disable_input(self) -> None:
         """Restore terminal settings so that they do not affect the terminal
         after the app terminates."""
-        system("stty echo")
-        system("stty sane")
+        self._write(b"\x1b[0m")  # reset colours
+        self._restore_attributes()
+
+    def restore(self) -> None:
+        """Disable mouse reporting and bracketed paste, leave the alternate
+        screen and restore terminal settings. The modes are reset with a
+        single write."""
+        self._write(MOUSE_DISABLE + BRACKETED_PASTE_DISABLE + b"\x1b[0m"
+                    + (ALTERNATE_SCREEN_DISABLE if self.__alternate_screen
+                       else b""))
+        self.__mouse_input = False
+        self.__alternate_screen = False
+        # a client which stopped reading isn't waited for
+        self._restore_attributes(termios.TCSADRAIN if self._loop is None
+                                 else termios.TCSANOW)
+        if self._loop is not None:
+            self._stop_writing_on_loop(self._loop)
+
+    def _stop_writing_on_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Write the buffered output the output accepts right away, dropping
+        the rest, and make the output blocking again"""
+        loop.remove_writer(self.output_fd)
+        try:
+            write(self.output_fd, self._output_buffer)
+        except OSError:
+            pass
+        self._output_buffer.clear()
+        set_blocking(self.output_fd, self._output_blocking)
+        self._loop = None
+
+    def _restore_attributes(self, when: int = termios.TCSADRAIN) -> None:
+        """Restore the terminal attributes saved when input was enabled, by
+        default once the pending output is written"""
+        if self.__saved_attributes is not None:
+            termios.tcsetattr(self.input_fd, when, self.__saved_attributes)
+            self.__saved_attributes = None
+
         self.__input = False
 
     @property
@@ -118,16 +875,6 @@ class Terminal:
         """Is mouse input enabled?"""
         return self.__mouse_input
 
-    @property
-    def columns(self) -> int:
-        """Return the amount of visible columns in the terminal."""
-        return self.__size[0]
-
-    @property
-    def rows(self) -> int:
-        """Return the amount of visible rows in the terminal."""
-        return self.__size[1]
-
 
 if __name__ == '__main__':
     term: Terminal = Terminal()
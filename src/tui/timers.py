@@ -0,0 +1,118 @@
+"""
+Timers run callbacks after a delay or repeatedly, on the thread the app runs
+on. They're kept in a heap ordered by when they're due, so scheduling and
+running a timer costs O(log n). Cancelled timers are removed lazily, the
+heap is compacted once most of it is cancelled.
+"""
+
+from __future__ import annotations
+
+import heapq
+from itertools import count
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+
+class Timer:
+    """A callback scheduled to run at a point in time (perf_counter), again
+    every interval seconds when it has one"""
+
+    def __init__(
+            self,
+            timers: Timers,
+            when: float,
+            callback: Callable[[], Any],
+            interval: Optional[float] = None
+    ) -> None:
+        self._timers = timers
+        self.when = when
+        self.callback = callback
+        self.interval = interval
+        self.cancelled = False
+        self._scheduled = False  # the timer is in the heap
+
+    def cancel(self) -> None:
+        """Stop the timer. It's a no-op when it already ran or was
+        cancelled."""
+        if not self.cancelled:
+            self.cancelled = True
+            if self._scheduled:
+                self._timers._cancelled_timer()
+
+
+class Timers:
+    """The timers of an app, ordered by when they're due"""
+
+    def __init__(self) -> None:
+        # when the timer is due, a sequence number which keeps timers which
+        # are due at the same time in the order they were added, the timer
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._sequence = count()
+        self._cancelled = 0  # cancelled timers still in the heap
+
+    def add(
+            self,
+            delay: float,
+            callback: Callable[[], Any],
+            interval: Optional[float] = None
+    ) -> Timer:
+        """Schedule a callback to run after delay seconds, and every interval
+        seconds afterwards when given. The interval has to be positive, or
+        the timer would always be due."""
+        if interval is not None and interval <= 0:
+            raise ValueError("Timer interval must be positive")
+
+        timer = Timer(self, perf_counter() + delay, callback, interval)
+        self._push(timer)
+        return timer
+
+    def next_deadline(self) -> Optional[float]:
+        """Get when the next timer is due, None when there is none"""
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)[2]._scheduled = False
+            self._cancelled -= 1
+
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: Optional[float] = None) -> None:
+        """Run the callbacks of the timers which are due. An interval timer
+        runs once even if several of its intervals passed. Timers scheduled
+        by the callbacks run on the next call at the earliest."""
+        if now is None:
+            now = perf_counter()
+
+        due = []
+        while (deadline := self.next_deadline()) is not None and (
+                deadline <= now):
+            timer = heapq.heappop(self._heap)[2]
+            timer._scheduled = False
+            due.append(timer)
+            if timer.interval is not None:
+                timer.when += timer.interval
+                if timer.when <= now:
+                    # skip the intervals which passed meanwhile
+                    timer.when = now + timer.interval
+                self._push(timer)
+
+        for timer in due:
+            # a callback may have cancelled a timer which was due as well
+            if not timer.cancelled:
+                timer.callback()
+
+    def _push(self, timer: Timer) -> None:
+        """Add a timer to the heap"""
+        timer._scheduled = True
+        heapq.heappush(self._heap, (timer.when, next(self._sequence), timer))
+
+    def _cancelled_timer(self) -> None:
+        """Note a cancelled timer, compacting the heap once most of it is
+        cancelled"""
+        self._cancelled += 1
+        if self._cancelled > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap
+                          if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
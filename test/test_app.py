@@ -0,0 +1,568 @@
+"""Test that ./src/app.py is behaving correctly"""
+
+import asyncio
+from concurrent.futures import CancelledError
+import socket
+import threading
+import time
+
+import pytest
+
+from tui._cell_style import CURSOR_CELL_STYLE
+from tui._coordinates import Coordinates
+from tui.app import App
+from tui.components.button import Button
+from tui.components.division import Division
+from tui.components.input import Input
+from tui.components.label import Label
+from tui.events.key_event import HotkeyEvent
+from tui.events.mouse import MouseEventTypes
+from tui.events.mouse_event import MouseEvent
+from tui.events.paste_event import PasteEvent
+from tui.headless_terminal import HeadlessTerminal
+from tui.terminal import Terminal
+
+pytest_plugins = ('pytest_asyncio')
+
+
+@pytest.mark.asyncio
+async def test_app_run_async():
+    """Test that frames are rendered while other coroutines run"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000)
+    label = Label(style="rows=1, columns=5", label_text="wait")
+    app.root.append_child(label)
+
+    async def fetch() -> None:
+        await asyncio.sleep(0.01)
+        label.text = "done"
+        while "done" not in str(terminal.screen):
+            await asyncio.sleep(0.001)
+        app.stop()
+
+    await asyncio.wait_for(asyncio.gather(app.run_async(), fetch()),
+                           timeout=5)
+    assert str(terminal.screen).split("\n")[0] == "done      "
+
+
+@pytest.mark.asyncio
+async def test_app_run_async_button_click():
+    """Test that clicking a button runs its callbacks as a task"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000)
+    button = Button(style="rows=1, columns=5", text="click")
+    app.root.append_child(button)
+
+    @button.on_click()
+    def clicked() -> None:
+        app.stop()
+
+    # render the first frame, so the button is mapped, then click it
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.05, terminal.send_input, b"\x1b[<0;2;1M")
+
+    await asyncio.wait_for(app.run_async(), timeout=5)
+    assert button.has_focus()
+
+
+def test_app_marks_changes_dirty():
+    """Test that changing a component marks it and its parents dirty and
+    that composing the frame cleans them"""
+    app = App(terminal=HeadlessTerminal(rows=3, columns=10),
+              render_on_demand=True)
+    division = Division(style="rows=2, columns=10")
+    label = Label(style="rows=1, columns=5", label_text="a")
+    division.append_child(label)
+    app.root.append_child(division)
+    app._render_frame()
+    assert not app.root._dirty
+
+    label.text = "b"
+    assert app.root._dirty and division._dirty and label._dirty
+    app._render_frame()
+
+    label.set_style("text_colour", "red")
+    assert app.root._dirty
+    app._render_frame()
+
+    division.children.pop(0)
+    assert app.root._dirty and division._dirty
+    app._render_frame()
+
+    app.refresh()
+    assert app.root._dirty
+
+
+def test_app_render_on_demand():
+    """Test that frames are only printed when something changed"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000, render_on_demand=True)
+    label = Label(style="rows=1, columns=5", label_text="idle")
+    app.root.append_child(label)
+
+    def change_once_and_stop():
+        while terminal.stats.written == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        label.text = "busy"
+        time.sleep(0.05)
+        app.stop()
+
+    threading.Thread(target=change_once_and_stop, daemon=True).start()
+    app.run()
+
+    assert terminal.stats.written == 2
+    assert str(terminal.screen).split("\n")[0] == "busy      "
+
+
+def test_app_render_on_demand_resize():
+    """Test that a resize repaints the terminal when frames are rendered on
+    demand, even though the root's size is fixed"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, render_on_demand=True, rows=2, columns=6)
+    app.root.append_child(Label(style="rows=1, columns=5",
+                                label_text="hello"))
+    app._render_frame()
+
+    # the terminal cleared its screen when it was resized
+    terminal.resize(rows=4, columns=12)
+    terminal.screen.feed(b"\x1b[2J")
+    app.notify_resize()
+    app._render_frame()
+
+    assert terminal.stats.written == 2
+    assert str(terminal.screen).split("\n")[0] == "hello       "
+
+
+def test_app_resize_wakes_idle_loop():
+    """Test that a resize reported from another thread wakes an app which
+    sleeps until something changes"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000, render_on_demand=True)
+
+    def resize_and_stop():
+        while terminal.stats.written == 0:
+            time.sleep(0.001)
+        terminal.resize(rows=4, columns=12)
+        app.notify_resize()
+        while terminal.stats.written == 1:
+            time.sleep(0.001)
+        app.stop()
+
+    threading.Thread(target=resize_and_stop, daemon=True).start()
+    app.run()
+    assert terminal.stats.written == 2
+    assert app.root.area.columns == 12
+
+
+@pytest.mark.parametrize("writer_thread", [False, True])
+def test_app_input_frames(writer_thread: bool):
+    """Test that input which triggers callbacks is printed right away
+    instead of on the next tick, and that its latency is recorded"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1, writer_thread=writer_thread,
+              input_frame_interval=0)
+
+    def click_and_stop():
+        terminal.send_input(b"\x1b[<0;2;1M")
+        while app.input_latency.count == 0:
+            time.sleep(0.001)
+        app.stop()
+
+    threading.Thread(target=click_and_stop, daemon=True).start()
+    start = time.perf_counter()
+    app.run()
+
+    # the first regular frame is only due after a second
+    assert time.perf_counter() - start < 0.5
+    assert app.input_latency.count == 1
+    assert app.input_latency.max < 0.5
+
+
+def test_app_event_wakes_loop():
+    """Test that an event is handled as soon as it arrives rather than when
+    the next frame is due"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    # the first frame is only due after a second
+    app = App(terminal=terminal, fps=1)
+    handle_event = app._handle_event
+    frames_written = []
+
+    def handle_and_stop(event) -> None:
+        frames_written.append(terminal.stats.written)
+        handle_event(event)
+        app.stop()
+
+    app._handle_event = handle_and_stop
+    threading.Timer(0.05, terminal.send_input, args=(b"a",)).start()
+    start = time.perf_counter()
+    app.run()
+
+    assert frames_written == [0]
+    assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.parametrize("render_on_demand", [False, True])
+def test_app_idle_loop_sleeps(render_on_demand: bool):
+    """Test that the loop sleeps until the next frame is due while there
+    are no events, instead of spinning, and that an app which renders on
+    demand sleeps until something changes"""
+    app = App(terminal=HeadlessTerminal(rows=3, columns=10), fps=20,
+              render_on_demand=render_on_demand)
+    handle_queued_events = app._handle_queued_events
+    wake_ups = 0
+
+    def counting_handle_queued_events() -> None:
+        nonlocal wake_ups
+        wake_ups += 1
+        handle_queued_events()
+
+    app._handle_queued_events = counting_handle_queued_events
+    fired = []
+    app.call_later(0.1, fired.append, True)
+    threading.Timer(0.3, app.stop).start()
+    app.run()
+
+    assert fired
+    if render_on_demand:
+        # the first frame, the timer and stopping
+        assert wake_ups <= 3
+    else:
+        # about six frames are due
+        assert 3 < wake_ups < 20
+
+
+@pytest.mark.asyncio
+async def test_app_run_async_input_frames():
+    """Test that input brings the next frame forward on an event loop"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1, input_frame_interval=0)
+
+    async def click_and_stop() -> None:
+        terminal.send_input(b"\x1b[<0;2;1M")
+        while app.input_latency.count == 0:
+            await asyncio.sleep(0.001)
+        app.stop()
+
+    await asyncio.wait_for(asyncio.gather(app.run_async(), click_and_stop()),
+                           timeout=0.5)
+    assert app.input_latency.count == 1
+
+
+def test_app_coalesces_mouse_moves():
+    """Test that only the latest of consecutive mouse moves is handled and
+    that other events break the run of moves"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal)
+
+    def move(column: int) -> MouseEvent:
+        return MouseEvent(Coordinates(1, column), MouseEventTypes.MOUSE_MOVE)
+
+    app._handle_event(move(1))
+    app._handle_pending_move()
+    move_callbacks = len(app._post_composit_hook)
+    app._post_composit_hook = []
+
+    for column in range(1, 8):
+        app._handle_event(move(column))
+    assert app._post_composit_hook == []
+
+    app._handle_event(HotkeyEvent("a"))
+    assert len(app._post_composit_hook) == move_callbacks
+    for column in range(1, 5):
+        app._handle_event(move(column))
+
+    app._render_frame()
+    # the cursor is drawn where the mouse moved last
+    assert terminal.styles[0][3] is CURSOR_CELL_STYLE
+    assert terminal.styles[0][6] is not CURSOR_CELL_STYLE
+
+
+def test_app_input_burst():
+    """Test that every key of input read at once reaches the focused input"""
+    terminal = HeadlessTerminal(rows=3, columns=20)
+    app = App(terminal=terminal, fps=1000)
+    text_input = Input(style="rows=1, columns=20")
+    app.root.append_child(text_input)
+    text_input._focus = True
+
+    def type_and_stop():
+        terminal.send_input("héllo wörld\x1b[D\x7f".encode())
+        while "héllo wörl" not in str(terminal.screen):
+            time.sleep(0.001)
+        app.stop()
+
+    threading.Thread(target=type_and_stop, daemon=True).start()
+    app.run()
+    assert text_input._input_text == "héllo wörl"
+
+
+def test_app_paste():
+    """Test that pasted text is inserted into the focused input at once"""
+    terminal = HeadlessTerminal(rows=3, columns=20)
+    app = App(terminal=terminal, fps=1000)
+    text_input = Input(style="rows=1, columns=20")
+    app.root.append_child(text_input)
+    text_input._focus = True
+
+    def paste_and_stop():
+        terminal.send_input(b"a\x1b[200~pasted text\x1b[201~")
+        while "apasted text" not in str(terminal.screen):
+            time.sleep(0.001)
+        app.stop()
+
+    threading.Thread(target=paste_and_stop, daemon=True).start()
+    app.run()
+    assert text_input.get_input() == "apasted text"
+    assert text_input.pos_pointer == 12
+
+
+def test_app_paste_control_chars():
+    """Test that the control chars of pasted text aren't inserted into an
+    input, except for newlines, and that tabs become spaces"""
+    terminal = HeadlessTerminal(rows=3, columns=20)
+    app = App(terminal=terminal, fps=1000)
+    text_input = Input(style="rows=2, columns=20")
+    app.root.append_child(text_input)
+    text_input._focus = True
+
+    app._handle_event(PasteEvent("a\x1b[2J\tb\x07\x00\nc\x7f\x9bd"))
+    app._render_frame()
+    assert text_input.get_input() == "a[2J b\ncd"
+    assert str(terminal.screen).split("\n")[:2] == ["a[2J b" + " " * 14,
+                                                    "cd" + " " * 18]
+
+
+def test_app_paste_too_long():
+    """Test that as much of the start of a paste as fits is inserted"""
+    terminal = HeadlessTerminal(rows=3, columns=20)
+    app = App(terminal=terminal, fps=1000)
+    text_input = Input(style="rows=1, columns=10")
+    app.root.append_child(text_input)
+    text_input._focus = True
+
+    app._handle_event(HotkeyEvent("a"))
+    app._handle_event(HotkeyEvent("z"))
+    app._render_frame()
+    text_input.pos_pointer = 1
+    app._handle_event(PasteEvent("0123456789"))
+    app._render_frame()
+    assert text_input.get_input() == "a01234567z"
+    assert text_input.pos_pointer == 9
+    assert str(terminal.screen).split("\n")[0] == "a01234567z" + " " * 10
+
+    # nothing fits anymore
+    app._handle_event(PasteEvent("more"))
+    app._render_frame()
+    assert text_input.get_input() == "a01234567z"
+
+
+@pytest.mark.parametrize("process", [False, True])
+def test_app_run_in_executor(process: bool):
+    """Test that background work doesn't stall frames and that its result
+    is handed to the UI thread"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000)
+    label = Label(style="rows=1, columns=5", label_text="wait")
+    app.root.append_child(label)
+    ui_thread = threading.current_thread()
+    frames = []
+
+    def done(result: int) -> None:
+        assert threading.current_thread() is ui_thread
+        frames.append(terminal.stats.written)
+        label.text = str(result)
+        app.stop()
+
+    function = pow if process else (lambda base, exp: time.sleep(0.1)
+                                    or pow(base, exp))
+    future = app.run_in_executor(function, 2, 10, on_done=done,
+                                 process=process)
+    assert app.executor_stats.pending == 1
+    app.run()
+
+    assert future.result() == 1024
+    assert app.executor_stats.completed == 1
+    assert app.executor_stats.duration.count == 1
+    if not process:
+        assert frames[0] > 10
+    assert str(terminal.screen).split("\n")[0] == "1024      "
+
+
+def test_app_run_in_executor_error():
+    """Test that an exception raised in the background is raised by run"""
+    app = App(terminal=HeadlessTerminal(rows=3, columns=10), fps=1000)
+
+    def fail() -> None:
+        raise KeyError("background")
+
+    app.run_in_executor(fail)
+    with pytest.raises(KeyError):
+        app.run()
+    assert app.executor_stats.failed == 1
+
+
+def test_app_stop_while_running_in_executor():
+    """Test that stopping the app cancels the functions which didn't start
+    and that the futures of all functions resolve"""
+    app = App(terminal=HeadlessTerminal(rows=3, columns=10), fps=1000)
+    release = threading.Event()
+    # more functions than workers, so some are still waiting
+    futures = [app.run_in_executor(release.wait, 5) for _ in range(64)]
+    app.call_later(0.05, app.stop)
+    app.run()
+    release.set()
+
+    cancelled = 0
+    for future in futures:
+        try:
+            assert future.result(timeout=5) is True
+        except CancelledError:
+            cancelled += 1
+
+    stats = app.executor_stats
+    assert 0 < cancelled < len(futures)
+    assert stats.cancelled == cancelled
+    assert stats.completed == len(futures) - cancelled
+    assert stats.pending == 0
+
+
+def test_app_stops_reading_input():
+    """Test that the input thread stops with the app, so input typed
+    afterwards is left for whoever reads the terminal next"""
+    served, client = socket.socketpair()
+    with served, client:
+        terminal = Terminal(input_stream=served.fileno(),
+                            output_stream=served.fileno(), size=(10, 3))
+        app = App(terminal=terminal, fps=1000)
+        threads = threading.active_count()
+        app.call_later(0.05, app.stop)
+        app.run()
+        assert threading.active_count() == threads
+
+        client.sendall(b"typed")
+        served.settimeout(1)
+        assert served.recv(16) == b"typed"
+
+
+def test_app_timers():
+    """Test that the loop wakes up for timers instead of waiting for the
+    next frame"""
+    app = App(terminal=HeadlessTerminal(rows=3, columns=10), fps=1)
+    ticks = []
+    interval = app.set_interval(lambda: ticks.append(time.perf_counter()),
+                                0.01)
+    cancelled = app.set_timeout(lambda: ticks.append(None), 0.02)
+    cancelled.cancel()
+    app.call_later(0.1, app.stop)
+
+    start = time.perf_counter()
+    app.run()
+    interval.cancel()
+
+    assert time.perf_counter() - start < 0.5
+    assert 5 <= len(ticks) <= 10
+    assert None not in ticks
+
+    # an interval which is always due would hang the loop
+    with pytest.raises(ValueError):
+        app.set_interval(lambda: None, 0)
+
+
+@pytest.mark.asyncio
+async def test_app_run_async_timers():
+    """Test that timers run on the event loop"""
+    app = App(terminal=HeadlessTerminal(rows=3, columns=10), fps=1)
+    ticks = []
+    app.set_interval(lambda: ticks.append(1), 0.01)
+
+    async def stop() -> None:
+        app.stop()
+
+    # a coroutine callback runs as a task
+    app.call_later(0.1, stop)
+    await asyncio.wait_for(app.run_async(), timeout=0.5)
+    assert 5 <= len(ticks) <= 10
+
+
+def test_app_stats():
+    """Test that the phases of frames are profiled"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000)
+    app.root.append_child(Label(style="rows=1, columns=5",
+                                label_text="hello"))
+    terminal.send_input(b"x")
+    app.call_later(0.05, app.stop)
+    app.run()
+
+    stats = app.stats()
+    assert stats.frames == terminal.stats.written
+    for phase in ("events", "compose", "diff", "write"):
+        assert stats.phases[phase].max > 0
+    assert stats.total.p50 >= stats.phases["compose"].p50
+
+
+@pytest.mark.asyncio
+async def test_app_shrink_below_children():
+    """Test that children which no longer fit in a shrunk window are clipped
+    instead of stopping the app"""
+    terminal = HeadlessTerminal(rows=10, columns=40)
+    app = App(terminal=terminal, fps=1000)
+    for row in range(8):
+        app.root.append_child(Label(style="rows=1, columns=40",
+                                    label_text=f"label {row}"))
+    row_division = Division(style="rows=2, columns=40, display=inline")
+    row_division.append_child(Label(style="rows=2, columns=20",
+                                    label_text="left"))
+    row_division.append_child(Label(style="rows=2, columns=20",
+                                    label_text="right"))
+    app.root.append_child(row_division)
+
+    async def shrink() -> None:
+        while "label 7" not in str(terminal.screen):
+            await asyncio.sleep(0.001)
+        terminal.resize(rows=5, columns=15)
+        app.notify_resize()
+        app.root.children[4].text = "changed"
+        while "changed" not in str(terminal.screen):
+            await asyncio.sleep(0.001)
+        app.stop()
+
+    await asyncio.wait_for(asyncio.gather(app.run_async(), shrink()),
+                           timeout=5)
+    assert str(terminal.screen) == "\n".join(
+            [f"label {row}        " for row in range(4)]
+            + ["changed        "]
+        )
+
+
+def test_app_run_awaitables():
+    """Test that awaitables returned by callbacks run on a single loop
+    without stalling frames, and that their exceptions are raised by run"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000)
+    label = Label(style="rows=1, columns=5", label_text="wait")
+    app.root.append_child(label)
+    loops = []
+
+    async def fetch() -> None:
+        loops.append(asyncio.get_running_loop())
+        written = terminal.stats.written
+        await asyncio.sleep(0.05)
+        # frames are rendered while the task waits
+        assert terminal.stats.written > written
+        label.text = "done"
+
+    async def fail() -> None:
+        await asyncio.sleep(0.1)
+        raise KeyError("task")
+
+    app.call_later(0, fetch)
+    app.call_later(0, fetch)
+    app.call_later(0, fail)
+    with pytest.raises(KeyError):
+        app.run()
+
+    assert len(loops) == 2 and loops[0] is loops[1]
+    assert loops[0].is_closed()
+    assert str(terminal.screen).split("\n")[0] == "done      "
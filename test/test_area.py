@@ -2,6 +2,7 @@
 
 import pytest
 
+from tui._cell_style import CellStyle, DEFAULT_CELL_STYLE
 from tui.area import Area
 from tui.style import AreaInfo
 from tui.styles.border import DefaultBorder
@@ -363,3 +364,85 @@ def test_area_with_margin_with_padding_add_char():
           
           \
 """
+
+
+def test_area_add_chars_with_style(three_by_three_area: Area):
+    """Test that add_chars styles only the cells it writes"""
+    style = CellStyle.get(foreground="31")
+    three_by_three_area.add_chars("ab", style=style)
+    assert three_by_three_area.style_area[0] == [
+            style, style, DEFAULT_CELL_STYLE
+        ]
+    assert three_by_three_area.style_area[1] == [DEFAULT_CELL_STYLE] * 3
+
+
+def test_area_add_area(five_rows_ten_columns_area: Area):
+    """Test that add_area copies chars and styles at the area pointer"""
+    style = CellStyle.get(background="44")
+    child = Area(area_info=AreaInfo(rows=2, columns=2), cell_style=style)
+    child.add_chars("ab\ncd")
+    five_rows_ten_columns_area.area_ptr.row = 1
+    five_rows_ten_columns_area.area_ptr.column = 8
+    five_rows_ten_columns_area.add_area(child)
+    assert str(five_rows_ten_columns_area).split("\n")[1:3] == [
+            "        ab", "        cd"
+        ]
+    assert five_rows_ten_columns_area.style_area[2][7:] == [
+            DEFAULT_CELL_STYLE, style, style
+        ]
+    five_rows_ten_columns_area.area_ptr.column = 9
+    with pytest.raises(IndexError):
+        five_rows_ten_columns_area.add_area(child)
+
+
+def test_area_resize_with_border(three_by_three_area: Area):
+    """Test that resizing keeps the content and redraws the border"""
+    three_by_three_area.add_border(border=DefaultBorder)
+    three_by_three_area.add_chars("x")
+    char_area = three_by_three_area.char_area
+    three_by_three_area.resize(rows=4, columns=5)
+    assert three_by_three_area.char_area is char_area
+    assert str(three_by_three_area) == """\
+╔═══╗
+║x  ║
+║   ║
+╚═══╝\
+"""
+    three_by_three_area.columns = 3
+    assert str(three_by_three_area) == """\
+╔═╗
+║x║
+║ ║
+╚═╝\
+"""
+    assert three_by_three_area.model.with_padding.rows == 2
+
+
+def test_area_snapshot(five_rows_ten_columns_area: Area):
+    """Test that a snapshot shares the rows of an area until either of them
+    writes to a row"""
+    area = five_rows_ten_columns_area
+    area.add_chars("ab")
+    snapshot = area.snapshot()
+    assert str(snapshot) == str(area)
+    assert all(row is snapshot_row for row, snapshot_row
+               in zip(area.char_area, snapshot.char_area))
+
+    area.area_ptr.row = 1
+    area.add_chars("cd")
+    assert snapshot.char_area[1][:2] == [' ', ' ']
+    assert area.char_area[0] is snapshot.char_area[0]
+    assert area.char_area[1] is not snapshot.char_area[1]
+
+    style = CellStyle.get("31")
+    snapshot.set_cell_style(0, 0, style)
+    assert area.style_area[0][0] is DEFAULT_CELL_STYLE
+    assert snapshot.char_area[0] is not area.char_area[0]
+
+
+def test_area_snapshot_resize(five_rows_ten_columns_area: Area):
+    """Test that resizing an area doesn't resize its snapshot"""
+    snapshot = five_rows_ten_columns_area.snapshot()
+    five_rows_ten_columns_area.resize(rows=2, columns=3)
+    assert snapshot.rows == 5 and snapshot.columns == 10
+    assert len(snapshot.char_area) == 5 and len(snapshot.char_area[0]) == 10
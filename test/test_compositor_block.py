@@ -1,7 +1,10 @@
 """Test that src/compositor.py block compositing works correctly"""
 import pytest
 
+from tui._cell_style import CellStyle
+from tui._coordinates import Coordinates, Rectangle
 from tui.compositor import Compositor, InsufficientAreaError
+from tui.components.label import Label
 from tui.components.division import Division
 from tui.style import Style
 from tui.styles.area import AreaInfo
@@ -134,6 +137,24 @@ def test_compose_child_that_exceeds_area_size(
         Compositor._compose(ten_by_ten_div)
 
 
+def test_compose_clipped_children(
+        ten_by_three_divs: list[Division],
+        ten_by_ten_div: Division
+):
+    """Test that children which don't fit are clipped when composing with
+    clip, and that the damage stays within the area"""
+    for i in range(4):
+        ten_by_three_divs[i].area = Compositor.fill_area(
+                ten_by_three_divs[i], symbol=str(i)
+            )
+        ten_by_ten_div.append_child(ten_by_three_divs[i])
+    ten_by_ten_div.resize(rows=5, columns=10)
+
+    area, damage = Compositor.compose(ten_by_ten_div, [], [], clip=True)
+    assert str(area) == "\n".join(["0" * 10] * 3 + ["1" * 10] * 2)
+    assert damage == [Rectangle(Coordinates(0, 0), Coordinates(4, 9))]
+
+
 def test_compose_one_child_which_has_one_child(
         ten_by_ten_div: Division,
         ten_by_three_divs: list[Division],
@@ -227,3 +248,83 @@ def test_compose_children_which_have_children(
 8888888888
 ++++++++++\
 """
+
+
+def test_compose_damage(ten_by_ten_div: Division):
+    """Test that composing reports the whole area the first time and only the
+    rectangle of the changed component afterwards"""
+    lbl = Label("hi", style="rows=1, columns=4")
+    ten_by_ten_div.append_child(Division(style="rows=2, columns=10"))
+    ten_by_ten_div.append_child(lbl)
+
+    _, damage = Compositor.compose(ten_by_ten_div, [], [])
+    assert damage == [Rectangle(Coordinates(0, 0), Coordinates(9, 9))]
+
+    _, damage = Compositor.compose(ten_by_ten_div, [], [])
+    assert damage == []
+
+    lbl.text = "bye"
+    area, damage = Compositor.compose(ten_by_ten_div, [], [])
+    assert damage == [Rectangle(Coordinates(2, 0), Coordinates(2, 3))]
+    assert area.char_area[2][:4] == ['b', 'y', 'e', ' ']
+
+
+def test_compose_damage_removed_child(ten_by_ten_div: Division):
+    """Test that removing a child damages its parent"""
+    ten_by_ten_div.append_child(Division(style="rows=2, columns=10"))
+    Compositor.compose(ten_by_ten_div, [], [])
+
+    ten_by_ten_div.children.pop(0)
+    _, damage = Compositor.compose(ten_by_ten_div, [], [])
+    assert damage == [Rectangle(Coordinates(0, 0), Coordinates(9, 9))]
+
+
+def test_compose_reuses_clean_components(ten_by_ten_div: Division):
+    """Test that only the dirty children of a component are composed again
+    and painted onto its previous composition"""
+    division = Division(style="rows=2, columns=10")
+    lbl = Label("hi", style="rows=1, columns=4")
+    ten_by_ten_div.append_child(division)
+    ten_by_ten_div.append_child(lbl)
+    first, _ = Compositor.compose(ten_by_ten_div, [], [])
+    cached = ten_by_ten_div._composed_area
+    division_area = division._composed_area
+
+    lbl.text = "bye"
+    assert not ten_by_ten_div._content_dirty and lbl._content_dirty
+    area, _ = Compositor.compose(ten_by_ten_div, [], [])
+    assert ten_by_ten_div._composed_area is cached
+    assert division._composed_area is division_area
+    assert area is not first and first.char_area[2][:3] == ['h', 'i', ' ']
+    assert area.char_area[2][:4] == ['b', 'y', 'e', ' ']
+    assert not ten_by_ten_div._dirty and not lbl._dirty
+
+
+def test_compose_resized_child(ten_by_ten_div: Division):
+    """Test that a child which shrinks has its parent composed again, so the
+    cells it no longer covers are cleared and damaged"""
+    lbl = Label("+" * 4, style="rows=1, columns=4")
+    ten_by_ten_div.append_child(lbl)
+    Compositor.compose(ten_by_ten_div, [], [])
+
+    lbl.text = "--"
+    lbl.resize(1, 2)
+    area, damage = Compositor.compose(ten_by_ten_div, [], [])
+    assert area.char_area[0][:4] == ['-', '-', ' ', ' ']
+    assert damage == [Rectangle(Coordinates(0, 0), Coordinates(0, 3))]
+
+
+def test_compose_area_written_directly(ten_by_ten_div: Division):
+    """Test that writing to a component's area, without marking it dirty,
+    is composed again"""
+    division = Division(style="rows=2, columns=10")
+    ten_by_ten_div.append_child(division)
+    Compositor.compose(ten_by_ten_div, [], [])
+
+    division.area.add_chars("ab")
+    division.area.set_cell_style(1, 0, CellStyle.from_colours("red", "blue"))
+    area, damage = Compositor.compose(ten_by_ten_div, [], [])
+    assert area.char_area[0][:3] == ['a', 'b', ' ']
+    assert area.style_area[1][0] == CellStyle.from_colours("red", "blue")
+    assert damage == [Rectangle(Coordinates(0, 0), Coordinates(1, 9))]
+    assert not division._dirty
@@ -5,6 +5,7 @@ from tui._coordinates import (
         Coordinates,
         Rectangle,
         CoordinateError,
+        Region,
         RestrictedCoordinates
     )
 
@@ -191,3 +192,29 @@ def test_restricted_coordinates_init_error(three_by_two_rectangle: Rectangle):
                 _column=0,
                 _restriction=three_by_two_rectangle
             )
+
+
+def test_region_merges_touching_rectangles():
+    """Test that adjacent and overlapping rectangles are merged into the
+    rectangle that bounds them"""
+    region = Region()
+    region.add(Rectangle(Coordinates(0, 0), Coordinates(1, 3)))
+    region.add(Rectangle(Coordinates(2, 2), Coordinates(4, 5)))
+
+    assert region.rects == [
+            Rectangle(Coordinates(0, 0), Coordinates(4, 5))
+        ]
+
+
+def test_region_keeps_separate_rectangles():
+    """Test that rectangles which don't touch stay separate, until a
+    rectangle connecting them is added"""
+    region = Region()
+    region.add(Rectangle(Coordinates(0, 0), Coordinates(0, 1)))
+    region.add(Rectangle(Coordinates(5, 5), Coordinates(6, 6)))
+    assert len(region) == 2
+
+    region.add(Rectangle(Coordinates(1, 1), Coordinates(4, 4)))
+    assert region.rects == [
+            Rectangle(Coordinates(0, 0), Coordinates(6, 6))
+        ]
@@ -0,0 +1,113 @@
+"""Test that ./src/_frame_writer.py is behaving correctly"""
+
+import threading
+
+import pytest
+
+from tui._coordinates import Coordinates, Rectangle
+from tui._frame_writer import FrameWriter
+from tui.area import Area
+from tui.style import AreaInfo
+
+
+class BlockingTerminal:
+    """Terminal stand-in which blocks while printing until it's released"""
+    def __init__(self):
+        self.printed = []
+        self.printing = threading.Event()
+        self.release = threading.Event()
+
+    def print(self, area, damage=None, wait=False):
+        self.printing.set()
+        self.release.wait()
+        self.printed.append((area, damage))
+        return True
+
+    def update_size(self):
+        self.printed.append("resized")
+
+
+def rect(row: int) -> Rectangle:
+    """Return a single cell rectangle in the first column of a row"""
+    return Rectangle(top_left=Coordinates(row, 0),
+                     bottom_right=Coordinates(row, 0))
+
+
+def test_frame_writer_keeps_latest_frame():
+    """Test that frames submitted while the terminal is busy are coalesced
+    into the latest one, carrying the damage of the dropped frames"""
+    terminal = BlockingTerminal()
+    writer = FrameWriter(terminal)
+    writer.start()
+    areas = [Area(area_info=AreaInfo(rows=3, columns=3)) for _ in range(4)]
+
+    writer.submit(areas[0], [rect(0)])
+    assert terminal.printing.wait(timeout=5)
+    writer.submit(areas[1], [rect(1)])
+    writer.submit(areas[2], [rect(2)])
+    writer.submit(areas[3], [rect(0)])
+    terminal.release.set()
+    writer.stop()
+
+    assert terminal.printed == [
+            (areas[0], [rect(0)]),
+            (areas[3], [rect(1), rect(2), rect(0)])
+        ]
+    assert writer.written == 2
+    assert writer.dropped == 2
+
+
+def test_frame_writer_full_damage():
+    """Test that a dropped frame without damage makes the next frame be
+    compared entirely"""
+    terminal = BlockingTerminal()
+    writer = FrameWriter(terminal)
+    area = Area(area_info=AreaInfo(rows=3, columns=3))
+
+    # not started, so frames stay in the mailbox
+    writer.submit(area, None)
+    writer.submit(area, [rect(1)])
+    terminal.release.set()
+    writer.start()
+    writer.stop()
+
+    assert terminal.printed == [(area, None)]
+
+
+def test_frame_writer_update_size():
+    """Test that the terminal's size is only read again once the frame it's
+    printing is written"""
+    terminal = BlockingTerminal()
+    writer = FrameWriter(terminal)
+    writer.start()
+    area = Area(area_info=AreaInfo(rows=3, columns=3))
+
+    writer.submit(area, [rect(0)])
+    assert terminal.printing.wait(timeout=5)
+    resize = threading.Thread(target=writer.update_size)
+    resize.start()
+    resize.join(timeout=0.05)
+    assert resize.is_alive()
+
+    terminal.release.set()
+    resize.join(timeout=5)
+    writer.stop()
+    assert terminal.printed == [(area, [rect(0)]), "resized"]
+
+
+def test_frame_writer_error():
+    """Test that an exception raised while printing is raised again by the
+    next submit"""
+    class FailingTerminal:
+        """Terminal stand-in which fails to print"""
+        def print(self, area, damage=None, wait=False):
+            raise OSError("terminal is gone")
+
+    writer = FrameWriter(FailingTerminal())
+    area = Area(area_info=AreaInfo(rows=3, columns=3))
+    writer.submit(area)
+    writer.start()
+    writer.stop()
+
+    with pytest.raises(OSError):
+        writer.submit(area)
@@ -0,0 +1,261 @@
+"""Test that ./src/headless_terminal.py is behaving correctly and that the
+frames the terminal backends emit are decoded into the areas they were
+printed from"""
+
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from tui._cell_style import CellStyle
+from tui._coordinates import Coordinates, Rectangle
+from tui.app import App
+from tui.area import Area
+from tui.components.label import Label
+from tui.headless_terminal import HeadlessTerminal
+from tui.style import AreaInfo
+from tui.styles.border import DefaultBorder
+
+STYLES = [
+        CellStyle.get(),
+        CellStyle.get(foreground="31"),
+        CellStyle.get(foreground="31", background="44"),
+        CellStyle.get(background="48;5;100"),
+    ]
+
+
+def random_frames(rows: int, columns: int, frames: int, seed: int):
+    """Yield random areas along with the cells which changed since the
+    previous one. Some frames shift a block of rows up or down."""
+    rng = random.Random(seed)
+    area = Area(area_info=AreaInfo(rows=rows, columns=columns))
+
+    for _ in range(frames):
+        prev_chars = [list(row) for row in area.char_area]
+        prev_styles = [list(row) for row in area.style_area]
+        area = Area(area_info=AreaInfo(rows=rows, columns=columns))
+        area.char_area = [list(row) for row in prev_chars]
+        area.style_area = [list(row) for row in prev_styles]
+
+        if rng.random() < 0.4:
+            shift = rng.randint(1, 3)
+            top = rng.randint(0, rows - 2)
+            bottom = rng.randint(top + 1, rows - 1)
+            for grid in (area.char_area, area.style_area):
+                block = grid[top:bottom + 1]
+                if rng.random() < 0.5:
+                    block = block[shift:] + block[:shift]
+                else:
+                    block = block[-shift:] + block[:-shift]
+                grid[top:bottom + 1] = block
+
+        for _ in range(rng.randint(0, 20)):
+            row = rng.randrange(rows)
+            column = rng.randrange(columns)
+            area.char_area[row][column] = rng.choice("ab═ ")
+            area.style_area[row][column] = rng.choice(STYLES)
+
+        damage = [
+                Rectangle(top_left=Coordinates(row, column),
+                          bottom_right=Coordinates(row, column))
+                for row in range(rows) for column in range(columns)
+                if (area.char_area[row][column] != prev_chars[row][column]
+                    or area.style_area[row][column]
+                    is not prev_styles[row][column])
+            ]
+        yield area, damage
+
+
+@pytest.mark.parametrize("with_damage", [False, True])
+@pytest.mark.parametrize("scroll_regions", [False, True])
+def test_headless_terminal_round_trip(with_damage: bool,
+                                      scroll_regions: bool):
+    """Test that the virtual screen matches every printed area"""
+    terminal = HeadlessTerminal(rows=10, columns=12,
+                                scroll_regions=scroll_regions)
+
+    for area, damage in random_frames(rows=10, columns=12, frames=200,
+                                      seed=1):
+        terminal.print(area, damage if with_damage else None)
+        assert terminal.cells == area.char_area
+        assert terminal.styles == area.style_area
+
+    assert terminal.stats.written == 200
+    assert terminal.stats.bytes_written == len(terminal.output)
+
+
+def test_headless_terminal_split_writes():
+    """Test that sequences and chars split between writes are decoded"""
+    terminal = HeadlessTerminal(rows=2, columns=4)
+    for byte in "\x1b[2;3f═\x1b[31mx".encode():
+        terminal.write_bytes(bytes([byte]))
+
+    assert terminal.cells[1] == [" ", " ", "═", "x"]
+    assert terminal.styles[1][3] is CellStyle.get(foreground="31")
+
+
+@pytest.mark.parametrize("repeat_chars", [False, True])
+def test_headless_terminal_repeat_chars(repeat_chars: bool):
+    """Test that runs of a char are repeated with REP when it's enabled"""
+    terminal = HeadlessTerminal(rows=4, columns=40,
+                                repeat_chars=repeat_chars)
+    area = Area(area_info=AreaInfo(rows=4, columns=40))
+    area.add_border(DefaultBorder)
+    terminal.print(area)
+
+    assert terminal.cells == area.char_area
+    assert (b"\x1b[37b" in terminal.output) is repeat_chars
+    if repeat_chars:
+        assert terminal.stats.compression_ratio > 3
+    else:
+        assert terminal.stats.compression_ratio == 1
+
+
+def test_headless_terminal_resize():
+    """Test that a frame of a different size is painted entirely"""
+    terminal = HeadlessTerminal(rows=3, columns=4)
+    terminal.print(Area(area_info=AreaInfo(rows=3, columns=4)))
+
+    terminal.resize(rows=2, columns=6)
+    area = Area(area_info=AreaInfo(rows=2, columns=6))
+    area.add_chars("resize")
+    terminal.print(area, damage=[])
+    assert str(terminal.screen) == "resize\n      "
+
+
+def test_headless_terminal_drops_frames():
+    """Test that frames are dropped while output is pending, and that the
+    next printed frame carries their changes"""
+    terminal = HeadlessTerminal(rows=2, columns=4)
+    terminal.print(Area(area_info=AreaInfo(rows=2, columns=4)))
+
+    terminal.draining = True
+    area = Area(area_info=AreaInfo(rows=2, columns=4))
+    area.add_chars("drop")
+    damage = [Rectangle(top_left=Coordinates(0, 0),
+                        bottom_right=Coordinates(0, 3))]
+    assert not terminal.print(area, damage)
+    assert terminal.stats.dropped == 1
+    assert terminal.stats.written == 1
+    assert str(terminal.screen) == "    \n    "
+
+    # waiting prints the frame even while output is pending
+    assert terminal.print(area, damage=[], wait=True)
+    assert str(terminal.screen) == "drop\n    "
+
+    area = Area(area_info=AreaInfo(rows=2, columns=4))
+    area.add_chars("drop\nkept")
+    assert not terminal.print(area, [Rectangle(
+            top_left=Coordinates(1, 0), bottom_right=Coordinates(1, 3))])
+    terminal.draining = False
+    assert terminal.print(area, damage=[])
+    assert str(terminal.screen) == "drop\nkept"
+    assert terminal.stats.dropped == 2
+    assert terminal.stats.written == 3
+
+
+@pytest.mark.parametrize("synchronized_output", [False, True])
+def test_headless_terminal_synchronized_output(synchronized_output: bool):
+    """Test that every frame is wrapped in the synchronized update mode when
+    it's enabled"""
+    terminal = HeadlessTerminal(rows=2, columns=4,
+                                synchronized_output=synchronized_output)
+    frames = []
+    for text in ("one", "two"):
+        area = Area(area_info=AreaInfo(rows=2, columns=4))
+        area.add_chars(text)
+        start = len(terminal.output)
+        terminal.print(area)
+        frames.append(bytes(terminal.output[start:]))
+
+    for frame in frames:
+        assert frame.startswith(b"\x1b[?2026h") is synchronized_output
+        assert frame.endswith(b"\x1b[?2026l") is synchronized_output
+        assert frame.count(b"\x1b[?2026") == 2 * synchronized_output
+    assert str(terminal.screen) == "two \n    "
+
+
+@pytest.mark.parametrize("cursor, target, line, move", [
+        # the cursor's position is unknown, it's moved absolutely
+        (None, (5, 10), "", b"\x1b[5;10f"),
+        # far jumps are cheapest with an absolute move
+        ((1, 1), (20, 40), "", b"\x1b[20;40f"),
+        # the start of the next rows with a carriage return and line feeds
+        ((3, 10), (4, 1), "", b"\r\n"),
+        ((3, 10), (5, 1), "", b"\r\n\n"),
+        ((4, 5), (4, 1), "", b"\r"),
+        # relative moves within a row or a column
+        ((5, 10), (5, 30), "", b"\x1b[20C"),
+        ((5, 30), (5, 25), "", b"\x1b[5D"),
+        ((5, 10), (5, 9), "", b"\x1b[D"),
+        ((5, 10), (6, 10), "", b"\x1b[B"),
+        ((5, 10), (2, 10), "", b"\x1b[3A"),
+        # skipped cells drawn in the current style are written again
+        ((5, 10), (5, 12), "ab", b"ab"),
+        ((5, 10), (5, 11), "a", b"a"),
+        ((5, 1), (6, 3), "ab", b"\r\nab"),
+        # unless they aren't plain chars
+        ((5, 10), (5, 12), "a\t", b"\x1b[2C"),
+    ])
+def test_headless_terminal_cursor_moves(cursor, target, line, move):
+    """Test that the cheapest bytes move the cursor"""
+    terminal = HeadlessTerminal(rows=24, columns=80)
+    cells = [" "] * 80
+    column = target[1] - len(line)
+    cells[column - 1:target[1] - 1] = list(line)
+    terminal._cursor = cursor
+    terminal._sgr = CellStyle.get()
+
+    assert terminal._cursor_to(*target, cells, [CellStyle.get()] * 80) == move
+    assert terminal._cursor == target
+
+
+def test_headless_terminal_cursor_rewrites_styled_cells():
+    """Test that skipped cells aren't written again when they're drawn in
+    another style than the current one"""
+    terminal = HeadlessTerminal(rows=24, columns=80)
+    terminal._cursor = (5, 10)
+    terminal._sgr = CellStyle.get()
+    cells = [" "] * 9 + ["a", "b"] + [" "] * 69
+    styles = [CellStyle.get()] * 80
+    assert terminal._cursor_to(5, 12, cells, styles) == b"ab"
+
+    terminal._cursor = (5, 10)
+    styles[10] = CellStyle.get(foreground="31")
+    assert terminal._cursor_to(5, 12, cells, styles) == b"\x1b[2C"
+
+
+def test_headless_app():
+    """Test that an app runs with a headless terminal"""
+    terminal = HeadlessTerminal(rows=3, columns=10)
+    app = App(terminal=terminal, fps=1000)
+    app.root.append_child(Label(style="rows=1, columns=5",
+                                label_text="hello"))
+
+    def stop_after_first_frame():
+        while terminal.stats.written == 0:
+            time.sleep(0.001)
+        app.stop()
+
+    threading.Thread(target=stop_after_first_frame, daemon=True).start()
+    app.run()
+
+    assert str(terminal.screen).split("\n")[0] == "hello     "
+
+
+def test_headless_terminal_closes_input():
+    """Test that running apps on headless terminals doesn't leak their input
+    pipes, even when the input was closed already"""
+    fds = len(os.listdir("/proc/self/fd"))
+    for index in range(20):
+        terminal = HeadlessTerminal(rows=3, columns=10)
+        app = App(terminal=terminal, fps=1000)
+        if index % 2:
+            terminal.close_input()
+        else:
+            app.call_later(0.001, app.stop)
+        app.run()
+
+    assert len(os.listdir("/proc/self/fd")) == fds
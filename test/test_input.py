@@ -0,0 +1,53 @@
+"""Test that src/components/input.py works correctly"""
+
+import pytest
+
+from tui._cell_style import CURSOR_CELL_STYLE
+from tui.components.input import Input
+
+
+def caret(text_input: Input) -> list[tuple[int, int]]:
+    """Get the cells of the input's area which show the caret"""
+    return [(row, column)
+            for row, styles in enumerate(text_input.area.style_area)
+            for column, style in enumerate(styles)
+            if style is CURSOR_CELL_STYLE]
+
+
+@pytest.mark.parametrize("align, text, cell", [
+        ("left", "ab", (0, 2)),
+        ("center", "ab", (0, 6)),
+        ("center", "abc", (0, 6)),
+        ("right", "ab", (0, 9)),
+        # the caret stays on the last column of aligned text
+        ("center", "abcdefghij", (0, 9)),
+        ("right", "abcdefghij", (0, 9)),
+        # wrapped text, the caret follows its last line
+        ("center", "abcdefghij kl", (1, 6)),
+        ("right", "abcdefghij kl", (1, 9)),
+        # the next char starts an empty line
+        ("center", "ab\n", (1, 4)),
+        ("right", "ab\n", (1, 9)),
+    ])
+def test_input_caret_alignment(align: str, text: str,
+                               cell: tuple[int, int]):
+    """Test that the caret is drawn after the text as it's aligned"""
+    text_input = Input(style=f"rows=2, columns=10, text_align={align}")
+    text_input.add_text(text)
+    assert text_input.get_input() == text
+    assert caret(text_input) == [cell]
+
+
+def test_input_caret_follows_text():
+    """Test that the caret moves with centered text as it's typed and
+    deleted"""
+    text_input = Input(style="rows=1, columns=10, text_align=center")
+    cells = []
+    for char in "abc":
+        text_input.add_text(char)
+        cells.append(caret(text_input))
+    text_input.remove_last_char()
+    cells.append(caret(text_input))
+
+    # "a" is drawn at column 4, "ab" at 4 and "abc" at 3
+    assert cells == [[(0, 5)], [(0, 6)], [(0, 6)], [(0, 6)]]
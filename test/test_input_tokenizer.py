@@ -0,0 +1,110 @@
+"""Test that ./src/events/_input_tokenizer.py is behaving correctly"""
+
+from tui._coordinates import Coordinates
+from tui.events._input_tokenizer import InputTokenizer
+from tui.events.key_event import HotkeyEvent
+from tui.events.keys import Keys
+from tui.events.mouse import MouseEventTypes
+from tui.events.mouse_event import MouseEvent
+from tui.events.paste_event import PasteEvent
+
+STREAM = "ab\x1b[A\x1b[<35;3;4M\x1b[1;5C═\x1bOP\x1b[<0;12;1M\x7f".encode()
+
+
+def describe(events) -> list:
+    """Return comparable descriptions of events"""
+    return [(event.event, event.coordinates) if isinstance(event, MouseEvent)
+            else (event.keys, event.modifiers) for event in events]
+
+
+def test_input_tokenizer():
+    """Test that a read with many key presses and mouse reports is split
+    into an event for each of them"""
+    events = InputTokenizer().feed(STREAM)
+
+    assert describe(events) == describe([
+            HotkeyEvent("a"),
+            HotkeyEvent("b"),
+            HotkeyEvent((Keys.Up,)),
+            MouseEvent(Coordinates(4, 3), MouseEventTypes.MOUSE_MOVE),
+            HotkeyEvent((Keys.ControlRight,)),
+            HotkeyEvent("═"),
+            HotkeyEvent((Keys.F1,)),
+            MouseEvent(Coordinates(1, 12), MouseEventTypes.MOUSE_LEFT_CLICK),
+            HotkeyEvent("\x7f"),
+        ])
+
+
+def test_input_tokenizer_split_reads():
+    """Test that sequences split between reads are carried over"""
+    expected = describe(InputTokenizer().feed(STREAM))
+    for split in range(len(STREAM)):
+        tokenizer = InputTokenizer()
+        events = tokenizer.feed(STREAM[:split]) + tokenizer.feed(
+                STREAM[split:])
+        assert describe(events) == expected
+        assert not tokenizer.pending
+
+
+def test_input_tokenizer_escape():
+    """Test that an escape is held back until it's known not to start a
+    sequence"""
+    tokenizer = InputTokenizer()
+    assert describe(tokenizer.feed(b"x\x1b")) == describe([HotkeyEvent("x")])
+    assert tokenizer.pending
+
+    assert describe(tokenizer.flush()) == describe(
+            [HotkeyEvent((Keys.Escape,))])
+    assert not tokenizer.pending
+
+
+def test_input_tokenizer_unknown_sequence():
+    """Test that an unknown control sequence is a single event"""
+    events = InputTokenizer().feed(b"\x1b[999~a")
+    assert describe(events) == describe([
+            MouseEvent(Coordinates(-1, -1), MouseEventTypes.MOUSE_UNKNOWN),
+            HotkeyEvent("a"),
+        ])
+
+
+def test_input_tokenizer_paste():
+    """Test that a bracketed paste is a single event, however it's split"""
+    stream = b"a\x1b[200~x = 1\ry \x1b[A\x1b[201~b"
+    for split in range(len(stream)):
+        tokenizer = InputTokenizer()
+        events = tokenizer.feed(stream[:split])
+        # an unfinished paste isn't flushed after a timeout
+        if split >= len(b"a\x1b[200~"):
+            assert not tokenizer.pending
+        events += tokenizer.feed(stream[split:])
+
+        assert [type(event) for event in events] == [HotkeyEvent, PasteEvent,
+                                                     HotkeyEvent]
+        assert events[1].text == "x = 1\ny \x1b[A"
+
+
+def test_input_tokenizer_paste_in_chunks():
+    """Test that a paste read in many chunks is a single event, with its end
+    split between any of them"""
+    stream = b"\x1b[200~" + b"pasted\r" * 1000 + b"\x1b[201~\x1b[A"
+    tokenizer = InputTokenizer()
+    events = []
+    for byte in range(len(stream)):
+        events += tokenizer.feed(stream[byte:byte + 1])
+
+    assert isinstance(events[0], PasteEvent)
+    assert events[0].text == "pasted\n" * 1000
+    assert describe(events[1:]) == describe([HotkeyEvent((Keys.Up,))])
+    assert not tokenizer.pending and tokenizer.flush() == []
+
+
+def test_input_tokenizer_paste_flushed():
+    """Test that flushing takes an unfinished paste as it is"""
+    tokenizer = InputTokenizer()
+    assert tokenizer.feed(b"\x1b[200~one\r") == []
+    assert tokenizer.feed(b"two\x1b[20") == []
+
+    events = tokenizer.flush()
+    assert [type(event) for event in events] == [PasteEvent]
+    assert events[0].text == "one\ntwo\x1b[20"
+    assert describe(tokenizer.feed(b"a")) == describe([HotkeyEvent("a")])
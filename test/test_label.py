@@ -139,3 +139,12 @@ also be valid to
 call it label       
 warping?            \
 """
+
+
+def test_label_resize():
+    """Test that resizing a label aligns its text again"""
+    lbl = Label(style="rows=1, columns=10, text_align=center", label_text="hi")
+    lbl.resize(rows=1, columns=6)
+    assert str(lbl.area) == "  hi  "
+    lbl.resize(rows=1, columns=8)
+    assert str(lbl.area) == "   hi   "
@@ -0,0 +1,27 @@
+"""Test that ./src/latency.py is behaving correctly"""
+
+import pytest
+
+from tui.latency import LatencyHistogram
+
+
+def test_latency_histogram():
+    """Test that durations are counted in the buckets they fall in"""
+    histogram = LatencyHistogram(bounds=(0.001, 0.002, 0.004))
+    for latency in (0.0005, 0.001, 0.0015, 0.003, 0.01):
+        histogram.record(latency)
+
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.mean == pytest.approx(0.016 / 5)
+    assert histogram.max == 0.01
+    assert histogram.percentile(50) == 0.002
+    assert histogram.percentile(100) == 0.01
+    assert len(str(histogram).split("\n")) == 4
+
+
+def test_latency_histogram_empty():
+    """Test that an empty histogram reports no latency"""
+    histogram = LatencyHistogram()
+    assert histogram.mean == 0
+    assert histogram.percentile(99) == 0
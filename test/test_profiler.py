@@ -0,0 +1,38 @@
+"""Test that ./src/profiler.py is behaving correctly"""
+
+from tui.profiler import COMPOSE, PHASES, WRITE, FrameProfiler
+
+
+def test_frame_profiler():
+    """Test that frames are summarized by phase"""
+    profiler = FrameProfiler(size=100)
+    for frame in range(1, 101):
+        profiler.add(COMPOSE, frame / 1000)
+        profiler.add(WRITE, 0.001)
+        profiler.end_frame()
+
+    stats = profiler.stats(budget=0.051)
+    assert stats.frames == 100
+    assert set(stats.phases) == set(PHASES)
+    assert stats.phases[COMPOSE].p50 == 0.051
+    assert stats.phases[COMPOSE].p99 == 0.099
+    assert stats.phases[COMPOSE].max == 0.1
+    assert stats.total.max == 0.101
+    # frames 51 to 100 take longer than 51 ms with the write
+    assert stats.over_budget == 51
+
+
+def test_frame_profiler_ring_buffer():
+    """Test that only the latest frames are kept"""
+    profiler = FrameProfiler(size=10)
+    for frame in range(25):
+        with profiler.phase(COMPOSE):
+            pass
+        profiler.add(WRITE, frame)
+        profiler.end_frame()
+
+    stats = profiler.stats(budget=1)
+    assert stats.frames == 10
+    assert stats.phases[WRITE].max == 24
+    assert stats.phases[WRITE].p50 in (19, 20)
+    assert 0 < stats.phases[COMPOSE].max < 0.01
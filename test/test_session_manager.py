@@ -0,0 +1,182 @@
+"""Test that ./src/session_manager.py is behaving correctly"""
+
+import asyncio
+from contextvars import Context
+import socket
+import threading
+import time
+
+import pytest
+
+from tui._session_state import current_state, enter_new_state
+from tui.app import App
+from tui.components.input import Input
+from tui.components.label import Label
+from tui.events.event_broker import EventBroker
+from tui.headless_terminal import HeadlessTerminal
+from tui.session_manager import SessionManager
+from tui.terminal import Terminal
+
+pytest_plugins = ('pytest_asyncio')
+
+
+def create_app(terminal: HeadlessTerminal) -> App:
+    """Build an app with a focused input"""
+    app = App(terminal=terminal, fps=1000)
+    text_input = Input(style="rows=1, columns=10")
+    app.root.append_child(text_input)
+    text_input._focus = True
+    return app
+
+
+@pytest.mark.asyncio
+async def test_session_manager():
+    """Test that sessions have their own components and listeners and that
+    input reaches only the session it was sent to"""
+    listeners = len(current_state().listeners)
+    manager = SessionManager(create_app)
+    terminals = [HeadlessTerminal(rows=2, columns=10) for _ in range(3)]
+    sessions = [manager.add(terminal) for terminal in terminals]
+    serve = asyncio.create_task(manager.serve())
+
+    terminals[0].send_input(b"first")
+    terminals[2].send_input(b"third")
+    while ("first" not in str(terminals[0].screen)
+           or "third" not in str(terminals[2].screen)):
+        await asyncio.sleep(0.001)
+
+    inputs = [session.app.root.children[0] for session in sessions]
+    assert [text_input.get_input() for text_input in inputs] == [
+            "first", "", "third"]
+    # component ids are counted per session
+    assert len({session.app.root.id for session in sessions}) == 1
+    assert len(current_state().listeners) == listeners
+
+    # a session ends when its input is closed
+    sessions[1].terminal.close_input()
+    while len(manager.sessions) == 3:
+        await asyncio.sleep(0.001)
+    assert manager.sessions == [sessions[0], sessions[2]]
+    assert sessions[1].error is None
+
+    manager.stop()
+    await asyncio.wait_for(serve, timeout=5)
+    assert manager.sessions == []
+
+
+def test_event_broker_session_listeners():
+    """Test that the listeners of the event broker are the ones of the
+    session the caller runs in"""
+    def session_listeners() -> tuple[dict, dict]:
+        enter_new_state()
+        return EventBroker.listeners, EventBroker.subscribers
+
+    listeners, subscribers = Context().run(session_listeners)
+    assert listeners == {} and subscribers == {}
+    assert EventBroker.listeners is current_state().listeners
+    assert EventBroker.subscribers is current_state().subscribers
+    assert listeners is not EventBroker.listeners
+
+
+class Python310EventLoop(asyncio.SelectorEventLoop):
+    """An event loop whose create_task doesn't take a context, as on Python
+    3.10"""
+    def create_task(self, coro, *, name=None):
+        return super().create_task(coro, name=name)
+
+
+def test_session_manager_python_310():
+    """Test that sessions start on event loops which can't be given the
+    context of a task"""
+    async def serve() -> None:
+        manager = SessionManager(create_app)
+        terminal = HeadlessTerminal(rows=2, columns=10)
+        session = manager.add(terminal)
+        serve = asyncio.create_task(manager.serve())
+
+        async def shown() -> None:
+            while "typed" not in str(terminal.screen):
+                await asyncio.sleep(0.001)
+
+        terminal.send_input(b"typed")
+        await asyncio.wait_for(shown(), timeout=5)
+        assert session.error is None
+
+        manager.stop()
+        await asyncio.wait_for(serve, timeout=5)
+
+    loop = Python310EventLoop()
+    try:
+        loop.run_until_complete(serve())
+    finally:
+        loop.close()
+
+
+def create_busy_app(terminal: Terminal) -> App:
+    """Build an app with a focused input and a label which changes on every
+    frame. Its first frame is larger than a socket's buffer."""
+    app = create_app(terminal)
+    label = Label(style="rows=90, columns=200")
+    app.root.append_child(label)
+    frames = 0
+
+    def change() -> None:
+        nonlocal frames
+        frames += 1
+        label.text = "\n".join([str(frames % 10) * 200] * 90)
+
+    change()
+    app.set_interval(change, 0.001)
+    return app
+
+
+def test_session_manager_client_not_reading():
+    """Test that a client which never reads doesn't stall the other
+    sessions, and that its frames are dropped meanwhile"""
+    pairs = [socket.socketpair() for _ in range(2)]
+    for served, client in pairs:
+        served.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+
+    manager = SessionManager(create_busy_app)
+    terminals = [Terminal(input_stream=served.fileno(),
+                          output_stream=served.fileno(),
+                          repeat_chars=False, size=(200, 92))
+                 for served, _ in pairs]
+    for terminal in terminals:
+        manager.add(terminal)
+
+    serving = threading.Thread(target=asyncio.run, args=(manager.serve(),),
+                               daemon=True)
+    serving.start()
+    # the first client never reads
+    reading = pairs[1][1]
+    try:
+        # wait until the output of the stuck client backs up
+        deadline = time.monotonic() + 5
+        while (terminals[0].stats.dropped == 0
+               and time.monotonic() < deadline):
+            time.sleep(0.001)
+        assert terminals[0].stats.dropped > 0
+
+        reading.sendall(b"typed")
+        reading.settimeout(5)
+        received = b""
+        while b"typed" not in received:
+            received += reading.recv(65536)
+
+        # the stuck session keeps running, dropping its frames
+        dropped = terminals[0].stats.dropped
+        deadline = time.monotonic() + 5
+        while (terminals[0].stats.dropped == dropped
+               and time.monotonic() < deadline):
+            time.sleep(0.001)
+        assert terminals[0].stats.dropped > dropped
+    finally:
+        manager.stop()
+        serving.join(timeout=5)
+        for served, client in pairs:
+            served.close()
+            client.close()
+
+    assert not serving.is_alive()
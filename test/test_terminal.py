@@ -0,0 +1,118 @@
+"""Test that ./src/terminal.py is behaving correctly"""
+
+import asyncio
+import os
+import pty
+import socket
+import subprocess
+import termios
+
+import pytest
+
+from tui._terminfo import read_entry
+from tui.terminal import (ALTERNATE_SCREEN_DISABLE, ALTERNATE_SCREEN_ENABLE,
+                          BRACKETED_PASTE_DISABLE, BRACKETED_PASTE_ENABLE,
+                          MOUSE_DISABLE, MOUSE_ENABLE, Terminal,
+                          supports_repeat)
+
+
+@pytest.fixture
+def pseudo_terminal():
+    """Return the master fd and the slave file of a pseudo terminal"""
+    master_fd, slave_fd = pty.openpty()
+    with open(slave_fd, "r+b", buffering=0) as slave:
+        yield master_fd, slave
+
+    os.close(master_fd)
+
+
+def test_terminal_modes(pseudo_terminal):
+    """Test that the terminal attributes are changed and restored, and that
+    the modes are set and reset with a single write each"""
+    master_fd, slave = pseudo_terminal
+    local_modes = termios.tcgetattr(slave)[3]
+
+    terminal = Terminal(input_stream=slave, output_stream=slave)
+    assert termios.tcgetattr(slave)[3] & (termios.ICANON | termios.ECHO) == 0
+    assert os.read(master_fd, 1024) == (ALTERNATE_SCREEN_ENABLE + MOUSE_ENABLE
+                                        + BRACKETED_PASTE_ENABLE)
+    assert terminal.input and terminal.mouse_input
+
+    terminal.restore()
+    assert termios.tcgetattr(slave)[3] == local_modes
+    assert os.read(master_fd, 1024) == (MOUSE_DISABLE + BRACKETED_PASTE_DISABLE
+                                        + b"\x1b[0m"
+                                        + ALTERNATE_SCREEN_DISABLE)
+    assert not terminal.input and not terminal.mouse_input
+
+
+def test_terminal_file_descriptors():
+    """Test that a terminal can be served over a socket's file descriptor,
+    which can't report its size"""
+    served, client = socket.socketpair()
+    with served, client:
+        terminal = Terminal(input_stream=served.fileno(),
+                            output_stream=served.fileno(),
+                            repeat_chars=False, size=(40, 10))
+        assert (terminal.columns, terminal.rows) == (40, 10)
+        assert client.recv(1024).startswith(ALTERNATE_SCREEN_ENABLE)
+
+        client.sendall(b"key")
+        assert terminal.read_bytes(16) == b"key"
+        terminal.restore()
+
+
+def test_terminal_write_on_loop():
+    """Test that output a client doesn't read is buffered instead of
+    blocking, and flushed by the loop once the client reads"""
+    served, client = socket.socketpair()
+    served.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+
+    async def write_and_read() -> bytes:
+        terminal = Terminal(input_stream=served.fileno(),
+                            output_stream=served.fileno(),
+                            repeat_chars=False, size=(40, 10))
+        terminal.write_on_loop(asyncio.get_running_loop())
+        data = bytes(range(256)) * 1024
+        terminal.write_bytes(data)
+        assert terminal.output_pending()
+
+        received = bytearray()
+        client.setblocking(False)
+        while len(received) < len(data):
+            try:
+                received += client.recv(65536)
+            except BlockingIOError:
+                await asyncio.sleep(0.001)
+        assert not terminal.output_pending()
+
+        terminal.restore()
+        return bytes(received)
+
+    with served, client:
+        received = asyncio.run(asyncio.wait_for(write_and_read(), timeout=5))
+        assert received.endswith(bytes(range(256)) * 1024)
+        assert served.getblocking()
+
+
+@pytest.mark.skipif(read_entry("xterm-256color") is None,
+                    reason="needs the xterm-256color terminfo entry")
+def test_terminal_type(monkeypatch: pytest.MonkeyPatch):
+    """Test that REP is detected from the terminal type a client reports
+    rather than from the process' $TERM, without spawning a process"""
+    def spawn(*_args, **_kwargs):
+        raise AssertionError("a process was spawned")
+
+    monkeypatch.setattr(subprocess.Popen, "__init__", spawn)
+    monkeypatch.setenv("TERM", "vt100")
+    served, client = socket.socketpair()
+    with served, client:
+        for term, repeat_chars in (("xterm-256color", True),
+                                   ("dumb", False),
+                                   ("no-such-terminal", False)):
+            assert supports_repeat(served.fileno(), term) is repeat_chars
+            terminal = Terminal(input_stream=served.fileno(),
+                                output_stream=served.fileno(), term=term)
+            assert terminal.repeat_chars is repeat_chars
+            terminal.restore()
@@ -0,0 +1,67 @@
+"""Test that ./src/timers.py is behaving correctly"""
+
+from time import perf_counter
+
+import pytest
+
+from tui.timers import Timers
+
+
+def test_timers_order():
+    """Test that timers run when they're due, in order"""
+    timers = Timers()
+    calls = []
+    for delay in (3, 1, 2, 1):
+        timers.add(delay, lambda delay=delay: calls.append(delay))
+
+    now = perf_counter()
+    assert timers.next_deadline() - now < 1
+    timers.run_due(now + 1.5)
+    assert calls == [1, 1]
+    timers.run_due(now + 5)
+    assert calls == [1, 1, 2, 3]
+    assert len(timers) == 0
+    assert timers.next_deadline() is None
+
+
+def test_timers_interval():
+    """Test that interval timers run again and skip missed intervals"""
+    timers = Timers()
+    calls = []
+    timer = timers.add(1, lambda: calls.append(1), interval=1)
+    start = timer.when
+
+    timers.run_due(start)
+    assert timer.when == start + 1
+    timers.run_due(start + 10.5)
+    assert calls == [1, 1]
+    assert timer.when == start + 11.5
+
+    timer.cancel()
+    timers.run_due(start + 20)
+    assert calls == [1, 1]
+    assert len(timers) == 0
+
+
+@pytest.mark.parametrize("interval", [0, -1])
+def test_timers_interval_not_positive(interval: float):
+    """Test that interval timers which would always be due are rejected"""
+    timers = Timers()
+    with pytest.raises(ValueError):
+        timers.add(1, lambda: None, interval=interval)
+    assert len(timers) == 0
+
+
+def test_timers_cancel():
+    """Test that cancelled timers don't run and are compacted away"""
+    timers = Timers()
+    calls = []
+    added = [timers.add(1, lambda index=index: calls.append(index))
+             for index in range(1000)]
+    for timer in added[:900]:
+        timer.cancel()
+
+    assert len(timers) == 100
+    assert len(timers._heap) < 600
+    timers.run_due(perf_counter() + 2)
+    assert calls == list(range(900, 1000))